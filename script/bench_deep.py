@@ -0,0 +1,54 @@
+#! python
+import sys
+import time
+
+from pylox.embed.engine import LoxEngine
+
+# Shallow enough for the recursive engines at Python's default limit
+SHARED_DEPTH = 100
+
+
+def nested(depth: int) -> str:
+    expr = "i"
+    for level in range(depth):
+        if level % 2:
+            expr = f"({expr} {'+-*'[level % 3]} {level % 7 + 1})"
+        else:
+            expr = f"-({expr} + 1)"
+    return expr
+
+
+def generate(depth: int, iterations: int) -> str:
+    return (
+        f"var x = 0;\n"
+        f"for (var i = 0; i < {iterations}; i = i + 1) x = {nested(depth)};\n"
+        f"print x;\n"
+    )
+
+
+def best_time(engine: str, source: str, repeat: int) -> float:
+    program = LoxEngine(engine).compile(source)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = program.run()
+        best = min(best, time.perf_counter() - start)
+        assert result.ok, result.errors
+    return best
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    source = generate(SHARED_DEPTH, iterations)
+    print(f"Depth {SHARED_DEPTH}, {iterations} evaluations, best of {repeat}")
+    for engine in ("tree", "quick", "stack"):
+        seconds = best_time(engine, source, repeat)
+        print(f"{engine:>6}: {seconds * 1e3:8.1f} ms")
+    depth = 50 * SHARED_DEPTH
+    seconds = best_time("stack", generate(depth, 1), 1)
+    print(f"Depth {depth}, stack only: {seconds * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#! python
+import argparse
+import os
+import threading
+import time
+
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.output import (
+    BlockBufferedSink,
+    LineBufferedSink,
+    MemorySink,
+    OutputSink,
+)
+from pylox.parser.stack_parser import StackParser
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.fast_scanner import FastScanner
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "print_heavy.lox")
+
+
+class PrintSink(OutputSink):
+    """The old behaviour, one builtin `print()` per statement, as a baseline."""
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+
+    def print(self, value: object):
+        print(value, file=self._stream)
+
+
+MODES = {
+    "print()": PrintSink,
+    "line": LineBufferedSink,
+    "block": BlockBufferedSink,
+    "memory": lambda stream: MemorySink(),
+}
+
+
+def drained_pipe():
+    """A text stream onto a pipe whose other end a thread keeps emptying."""
+    read_fd, write_fd = os.pipe()
+
+    def drain():
+        with os.fdopen(read_fd, "rb") as f_in:
+            while f_in.read1(1 << 16):
+                pass
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return os.fdopen(write_fd, "w"), thread
+
+
+def measure(stmts: list, resolver: Resolver, engine: str, mode: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        stream, thread = drained_pipe()
+        interpreter = ENGINES[engine](MODES[mode](stream))
+        if isinstance(interpreter, Interpreter):
+            interpreter.resolve(resolver)
+        start = time.perf_counter()
+        interpreter.interpret(stmts)
+        stream.flush()
+        best = min(best, time.perf_counter() - start)
+        stream.close()
+        thread.join()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=list(ENGINES), action="append")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(SOURCE) as f_in:
+        stmts = StackParser(FastScanner(f_in.read()).scan_buffer()).parse()
+    resolver = Resolver()
+    resolver.resolve(stmts)
+    print(f"{'engine':<10}" + "".join(f"{mode:>10}" for mode in MODES) + "  (ms)")
+    for engine in args.engine or list(ENGINES):
+        times = [
+            measure(stmts, resolver, engine, mode, args.repeat) * 1e3 for mode in MODES
+        ]
+        print(f"{engine:<10}" + "".join(f"{t:>10.1f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
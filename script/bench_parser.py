@@ -0,0 +1,44 @@
+#! python
+import sys
+import time
+
+from pylox.parser.buffer_parser import BufferParser
+from pylox.parser.pratt_parser import PrattParser
+from pylox.parser.stack_parser import StackParser
+from pylox.scanner.fast_scanner import FastScanner
+
+CHUNK = """\
+var x{n} = (a + b * {n} - c / 2) * (d - -e) + f * g - (h + {n});
+x{n} = x{n} >= 10 ? a * b + c : d == e != !f;
+print x{n} + a * (b - c) / d < e + f * g;
+"""
+
+
+def generate(statements: int) -> str:
+    header = "var a = 1; var b = 2; var c = 3; var d = 4;"
+    header += " var e = 5; var f = 6; var g = 7; var h = 8;\n"
+    return header + "".join(CHUNK.format(n=n) for n in range(statements))
+
+
+def best_time(parser_cls, source: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        tokens = FastScanner(source).scan_buffer()
+        start = time.perf_counter()
+        parser_cls(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    source = generate(statements)
+    print(f"Parsing {statements * 3} expression statements, best of {repeat}")
+    for parser_cls in (BufferParser, PrattParser, StackParser):
+        seconds = best_time(parser_cls, source, repeat)
+        print(f"{parser_cls.__name__:>13}: {seconds * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
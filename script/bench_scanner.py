@@ -0,0 +1,45 @@
+#! python
+import sys
+import time
+
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.scanner import Scanner
+
+CHUNK = """\
+// running totals for the report
+var total_count = 0;
+var label = "item number";
+/* the loop below is
+   generated */
+for (var i = 0; i < 1000; i = i + 1) {
+  total_count = total_count + i * 2.5 - (i / 3);
+  if (total_count >= 100 and i != 7) print label + " done";
+}
+"""
+
+
+def generate(size: int) -> str:
+    return CHUNK * (size // len(CHUNK) + 1)
+
+
+def throughput(scanner_cls, source: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scanner_cls(source).scan_tokens()
+        best = min(best, time.perf_counter() - start)
+    return len(source.encode()) / best / 1e6
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    source = generate(int(megabytes * 1e6))
+    print(f"Scanning {len(source) / 1e6:.1f} MB, best of {repeat}")
+    for scanner_cls in (Scanner, FastScanner):
+        mbps = throughput(scanner_cls, source, repeat)
+        print(f"{scanner_cls.__name__:>12}: {mbps:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 #! python
-import sys
+import argparse
 import os
 
 EXPR_DEFS = [
     "Assign : name Token, expr Expr",
     "Binary : left Expr, operator Token, right Expr",
+    "Conditional : condition Expr, then_branch Expr, else_branch Expr",
     "Grouping : expression Expr",
     "Literal : value object",
+    "Logical : left Expr, operator Token, right Expr",
     "Unary : operator Token, right Expr",
     "Variable: name Token",
 ]
@@ -18,46 +20,119 @@ STMT_DEFS = [
     "Block: statements list[Stmt]",
     "If: condition Expr, then_branch Stmt, else_branch Stmt",
     "While: condition Expr, stmt Stmt",
+    "For: init Stmt, condition Expr, increment Expr, body Stmt",
 ]
 
+DEFS = {"Expr": EXPR_DEFS, "Stmt": STMT_DEFS}
 
-def declare_imports() -> str:
-    return """\
-# This file is auto generated
-from __future__ import annotations
-from abc import ABCMeta
+# dict: ABCMeta classes with a per-instance __dict__ (the original layout)
+# slots: plain classes with __slots__
+# tuple: immutable tuple subclasses with identity equality and hashing
+LAYOUTS = ("dict", "slots", "tuple")
 
-from pylox.scanner.scanner import Token
-from pylox.parser.expr import Expr"""
+
+def declare_imports(basename: str, layout: str, compact: bool) -> str:
+    lines = ["# This file is auto generated", "from __future__ import annotations"]
+    if layout == "dict":
+        lines.append("from abc import ABCMeta")
+    if layout == "tuple":
+        lines.append("from operator import itemgetter")
+    lines.append("")
+    if compact:
+        lines.append("from pylox.scanner.scanner import Token, TokenType")
+    else:
+        lines.append("from pylox.scanner.scanner import Token")
+    if basename != "Expr":
+        lines.append("from pylox.parser.expr import Expr")
+    return "\n".join(lines)
 
 
 def newlines(num=1):
     return "\n" * num
 
 
-def define_abc_expr(basename: str) -> str:
-    return f"""\
+def tuple_of(items: list[str]) -> str:
+    if len(items) == 1:
+        return f"({items[0]},)"
+    return f"({', '.join(items)})"
+
+
+def define_abc_expr(basename: str, layout: str) -> str:
+    if layout == "dict":
+        return f"""\
 class {basename}(metaclass=ABCMeta):
     def accept(self, visitor: {basename}Visitor):
         pass"""
+    if layout == "tuple":
+        return f"""\
+class {basename}(tuple):
+    __slots__ = ()
+    __hash__ = object.__hash__
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+
+    def accept(self, visitor: {basename}Visitor):
+        pass"""
+    return f"""\
+class {basename}:
+    __slots__ = ()
+
+    def accept(self, visitor: {basename}Visitor):
+        pass"""
+
 
+def parse_fields(defi: str, compact: bool) -> list[tuple[str, str]]:
+    fields = []
+    for field in defi.split(":")[1].split(","):
+        name, type = field.strip().split(" ")
+        if compact and name == "operator" and type == "Token":
+            # Keep only what evaluation and error reporting need
+            fields.append((name, "TokenType"))
+            fields.append(("line", "int"))
+        else:
+            fields.append((name, type))
+    return fields
 
-def define_expr(defi: str, basename: str) -> str:
+
+def define_expr(defi: str, basename: str, layout: str, compact: bool) -> str:
     name = defi.split(":")[0].strip()
-    fields = defi.split(":")[1].strip().split(",")
-    fields = [f.strip().replace(" ", ": ") for f in fields]
-    props = [f.split(":")[0] for f in fields]
+    fields = parse_fields(defi, compact)
+    params = ", ".join(f"{prop}: {type}" for prop, type in fields)
+    props = [prop for prop, _ in fields]
+    accept = f"""\
+    def accept(self, visitor: {basename}Visitor):
+        return visitor.visit_{name.lower()}(self)"""
+
+    if layout == "tuple":
+        getters = "\n".join(
+            f"    {prop} = property(itemgetter({index}))"
+            for index, prop in enumerate(props)
+        )
+        return f"""\
+class {name}({basename}):
+    __slots__ = ()
+
+    def __new__(cls, {params}):
+        return tuple.__new__(cls, {tuple_of(props)})
+
+{getters}
+
+{accept}"""
+
     constructor_implement = "\n".join(f"        self.{prop} = {prop}" for prop in props)
+    slots = ""
+    if layout == "slots":
+        quoted = [f'"{prop}"' for prop in props]
+        slots = f"    __slots__ = {tuple_of(quoted)}\n\n"
     return f"""\
 class {name}({basename}):
-    def __init__(self, {", ".join(fields)}):
+{slots}    def __init__(self, {params}):
 {constructor_implement}
 
-    def accept(self, visitor: {basename}Visitor):
-        return visitor.visit_{name.lower()}(self)"""
+{accept}"""
 
 
-def define_vistor(names: list[str], basename: str):
+def define_vistor(names: list[str], basename: str, layout: str):
     def def_method(name: str):
         return f"""\
     def visit_{name.lower()}(self, {basename.lower()}: {name}):
@@ -65,40 +140,51 @@ def define_vistor(names: list[str], basename: str):
 
     methods = [def_method(name) for name in names]
     methods = newlines(2).join(methods)
+    metaclass = "(metaclass=ABCMeta)" if layout == "dict" else ""
 
     return f"""\
-class {basename}Visitor(metaclass=ABCMeta):
+class {basename}Visitor{metaclass}:
 {methods}"""
 
 
-def main():
-    args = sys.argv
-    if len(args) != 3:
-        print("Usage: generate_ast [path] [basename]")
-        sys.exit(1)
-    path, basename = args[-2], args[-1]
-    if not os.path.isdir(path):
-        print(f"Invalid path {path}")
-        sys.exit(1)
-    file_path = os.path.join(path, f"{basename.lower()}.py")
-    print(f"Start generating ast def at: {file_path}")
+def generate(basename: str, layout: str = "slots", compact: bool = False) -> str:
+    defs = DEFS[basename]
+    names = [def_.split(":")[0].strip() for def_ in defs]
     # fmt: off
-    source = "".join(
+    return "".join(
         [
-            declare_imports(),
+            declare_imports(basename, layout, compact),
+            newlines(3),
+            define_abc_expr(basename, layout),
             newlines(3),
-            define_abc_expr(basename),
+            newlines(3).join(
+                define_expr(defi, basename, layout, compact) for defi in defs
+            ),
             newlines(3),
+            define_vistor(names, basename, layout),
+            newlines(),
         ]
     )
     # fmt: on
-    defs = STMT_DEFS
-    names = [def_.split(":")[0].strip() for def_ in defs]
-    defs = newlines(3).join([define_expr(defi, basename) for defi in defs])
-    vistor_def = define_vistor(names, basename)
-    source += defs
-    source += newlines(3)
-    source += vistor_def
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="generate_ast")
+    parser.add_argument("path")
+    parser.add_argument("basename", choices=list(DEFS))
+    parser.add_argument("--layout", choices=LAYOUTS, default="slots")
+    parser.add_argument(
+        "--compact-tokens",
+        action="store_true",
+        help="store operator kind and line instead of the operator Token",
+    )
+    args = parser.parse_args()
+    if not os.path.isdir(args.path):
+        print(f"Invalid path {args.path}")
+        raise SystemExit(1)
+    file_path = os.path.join(args.path, f"{args.basename.lower()}.py")
+    print(f"Start generating ast def at: {file_path}")
+    source = generate(args.basename, args.layout, args.compact_tokens)
     with open(file_path, "w") as f:
         f.write(source)
 
@@ -0,0 +1,122 @@
+#! python
+import gc
+import sys
+import time
+import tracemalloc
+import types
+
+from generate_ast import generate
+from pylox.parser.buffer_parser import BufferParser
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.scanner.fast_scanner import FastScanner
+
+CHUNK = """\
+{
+  var total = (count + 2) * -step - 1;
+  if (total >= limit) print "over"; else total = total / 2;
+  while (total > 0) total = total - step;
+}
+"""
+
+VARIANTS = [
+    ("dict", False),
+    ("slots", False),
+    ("tuple", False),
+    ("slots", True),
+    ("tuple", True),
+]
+
+NODE = object()
+
+
+def load(layout: str, compact: bool) -> dict[str, type]:
+    classes = {}
+    for basename in ("Expr", "Stmt"):
+        module = types.ModuleType(f"ast_{layout}_{basename.lower()}")
+        exec(generate(basename, layout, compact), module.__dict__)
+        classes.update(vars(module))
+    return classes
+
+
+def plan(node: object, compact: bool, out: list):
+    """Flattens a tree into post-order constructor calls.
+
+    Children are constructed before their parent, so building the plan only
+    needs a value stack and times node construction alone.
+    """
+    args = []
+    children = 0
+    for field in type(node).__slots__:
+        value = getattr(node, field)
+        if isinstance(value, (Expr, Stmt)):
+            plan(value, compact, out)
+            args.append(NODE)
+            children += 1
+        elif isinstance(value, list):
+            for item in value:
+                plan(item, compact, out)
+            args.append((NODE, len(value)))
+            children += len(value)
+        elif compact and field == "operator":
+            args.extend((value.type, value.line))
+        else:
+            args.append(value)
+    out.append((type(node).__name__, args, children))
+
+
+def build(steps: list, classes: dict[str, type]) -> list:
+    stack = []
+    for name, args, children in steps:
+        kids = iter(stack[len(stack) - children :])
+        del stack[len(stack) - children :]
+        values = []
+        for arg in args:
+            if arg is NODE:
+                values.append(next(kids))
+            elif type(arg) is tuple and arg[0] is NODE:
+                values.append([next(kids) for _ in range(arg[1])])
+            else:
+                values.append(arg)
+        stack.append(classes[name](*values))
+    return stack
+
+
+def measure(steps: list, classes: dict[str, type], runs=5) -> tuple[float, float]:
+    elapsed = float("inf")
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        build(steps, classes)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    nodes = build(steps, classes)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return size / len(steps), elapsed / len(steps) * 1e9
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    stmts = BufferParser(FastScanner(CHUNK * repeat).scan_buffer()).parse()
+    steps = {False: [], True: []}
+    for compact, out in steps.items():
+        for stmt in stmts:
+            plan(stmt, compact, out)
+    print(f"{len(steps[False])} nodes")
+    print(f"{'layout':>16} {'bytes/node':>11} {'ns/node':>9}")
+    # Replaying the plan without allocating nodes gives the loop overhead
+    # included in every ns/node figure below
+    harness = {name: lambda *args: None for name, _, _ in steps[False]}
+    print(f"{'(harness)':>16} {'':>11} {measure(steps[False], harness)[1]:9.1f}")
+    for layout, compact in VARIANTS:
+        size, ns = measure(steps[compact], load(layout, compact))
+        name = layout + (" compact" if compact else "")
+        print(f"{name:>16} {size:11.1f} {ns:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
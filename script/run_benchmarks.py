@@ -0,0 +1,196 @@
+#! python
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from pylox import __version__
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import Interpreter
+from pylox.optimizer.optimizer import count_nodes
+from pylox.parser.stack_parser import StackParser
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.fast_scanner import FastScanner
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+PHASES = ("scan", "parse", "resolve", "interpret")
+# Differences below this are timer noise, whatever the ratio
+NOISE_SECONDS = 0.002
+UNITS = {"scan": "tokens", "parse": "nodes", "resolve": "nodes", "interpret": "runs"}
+
+LARGE_CHUNK = """\
+var v{n} = {n};
+{{
+  var w = v{n} * 2 + (v{n} - 1) / 3;
+  if (w > {n}) v{n} = w; else v{n} = -w;
+}}
+"""
+
+
+def generate_large(statements: int = 4000) -> str:
+    return "".join(LARGE_CHUNK.format(n=n) for n in range(statements))
+
+
+# Sources too big to keep in the repository
+GENERATED = {"large_generated": generate_large}
+
+
+def corpus(names: list) -> dict:
+    ret = {}
+    for path in sorted(glob.glob(os.path.join(BENCHMARK_DIR, "*.lox"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as f_in:
+            ret[name] = f_in.read()
+    for name, generate in GENERATED.items():
+        ret[name] = generate()
+    if names:
+        ret = {name: ret[name] for name in names}
+    return ret
+
+
+def phases(source: str, engine: str, state: dict) -> dict:
+    """One closure per phase, passing results on to the next through `state`."""
+
+    def scan():
+        state["tokens"] = FastScanner(source).scan_buffer()
+
+    def parse():
+        state["stmts"] = StackParser(state["tokens"]).parse()
+
+    def resolve():
+        state["resolver"] = Resolver()
+        state["resolver"].resolve(state["stmts"])
+
+    def interpret():
+        interpreter = ENGINES[engine]()
+        if isinstance(interpreter, Interpreter):
+            interpreter.resolve(state["resolver"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreter.interpret(state["stmts"])
+
+    return {"scan": scan, "parse": parse, "resolve": resolve, "interpret": interpret}
+
+
+def measure(source: str, engine: str, repeat: int) -> dict:
+    timings = {phase: [] for phase in PHASES}
+    state = {}
+    for _ in range(repeat):
+        for phase, run in phases(source, engine, state).items():
+            start = time.perf_counter()
+            run()
+            timings[phase].append(time.perf_counter() - start)
+    nodes = count_nodes(state["stmts"])
+    tokens = len(state["tokens"])
+    units = {"scan": tokens, "parse": nodes, "resolve": nodes, "interpret": 1}
+
+    # Tracing slows everything down, so peaks come from a separate pass
+    peaks = {}
+    tracemalloc.start()
+    for phase, run in phases(source, engine, {}).items():
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        run()
+        peaks[phase] = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    ret = {}
+    for phase in PHASES:
+        best = min(timings[phase])
+        ret[phase] = {
+            "best": best,
+            "median": statistics.median(timings[phase]),
+            "unit": UNITS[phase],
+            "ops_per_sec": units[phase] / best if best else float("inf"),
+            "peak_bytes": peaks[phase],
+        }
+    return ret
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """(benchmark, phase, ratio) for every phase slower than the baseline."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        old = baseline["benchmarks"].get(name)
+        if old is None:
+            continue
+        for phase in PHASES:
+            if phase not in old or not old[phase]["best"]:
+                continue
+            best, old_best = result[phase]["best"], old[phase]["best"]
+            ratio = best / old_best
+            result[phase]["baseline_ratio"] = ratio
+            if ratio > 1 + threshold and best - old_best > NOISE_SECONDS:
+                regressions.append((name, phase, ratio))
+    return regressions
+
+
+def format_table(results: dict) -> str:
+    lines = [
+        f"{'benchmark':<18}{'phase':<11}{'best ms':>10}{'ops/s':>20}"
+        f"{'peak KiB':>11}{'vs base':>9}"
+    ]
+    for name, result in results["benchmarks"].items():
+        for phase in PHASES:
+            row = result[phase]
+            ratio = row.get("baseline_ratio")
+            ratio = f"{ratio:8.2f}x" if ratio is not None else ""
+            ops = f"{row['ops_per_sec']:,.0f} {row['unit']}"
+            lines.append(
+                f"{name:<18}{phase:<11}{row['best'] * 1e3:>10.2f}{ops:>20}"
+                f"{row['peak_bytes'] / 1024:>11.0f}{ratio:>9}"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--engine", choices=list(ENGINES), default="tree")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="flag phases slower than the baseline by more than this fraction",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "pylox": __version__,
+            "python": platform.python_version(),
+            "engine": args.engine,
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": {},
+    }
+    for name, source in corpus(args.names).items():
+        results["benchmarks"][name] = measure(source, args.engine, args.repeat)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f_in:
+            baseline = json.load(f_in)
+        regressions = compare(results, baseline, args.threshold)
+
+    print(format_table(results))
+    if args.output:
+        with open(args.output, "w") as f_out:
+            json.dump(results, f_out, indent=2)
+    for name, phase, ratio in regressions:
+        print(f"REGRESSION {name} {phase}: {ratio:.2f}x baseline", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
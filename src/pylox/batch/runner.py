@@ -0,0 +1,157 @@
+from __future__ import annotations
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pylox.cache.cache import CACHE_DIR, ArtifactCache
+from pylox.engines import ENGINES
+from pylox.main import ArgumentParser, Lox
+from pylox.optimizer.optimizer import OPT_LEVELS
+
+# Exercises every stage once so workers start with imports, compiled regexes
+# and the code cache already in place
+WARMUP_SOURCE = """\
+var a = 1;
+{ var b = a + 2; for (var i = 0; i < 2; i = i + 1) b = b * 2; print b > 1; }
+"""
+
+
+class ScriptResult:
+    def __init__(
+        self, path: str, exit_code: int, stdout: str, stderr: str, seconds: float
+    ) -> None:
+        self.path = path
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.seconds = seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "exit_code": self.exit_code,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "seconds": self.seconds,
+        }
+
+
+def _reset():
+    Lox.had_error = False
+    Lox.had_runtime_error = False
+
+
+def warm_up(options: dict):
+    with contextlib.redirect_stdout(io.StringIO()):
+        Lox.run(WARMUP_SOURCE, **dict(options, cache=None))
+    _reset()
+
+
+def run_script(path: str, options: dict) -> ScriptResult:
+    """Runs one script like `pylox script.lox`, capturing what it prints.
+
+    The exit code is what that process would have exited with: 65 for
+    static errors, 70 for runtime errors and 1 for a crash.
+    """
+    _reset()
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            Lox.run_file(path, **options)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+    seconds = time.perf_counter() - start
+    return ScriptResult(path, exit_code, stdout.getvalue(), stderr.getvalue(), seconds)
+
+
+def collect(source: str) -> list[str]:
+    """Scripts under a directory, or listed in a manifest file.
+
+    Manifest paths are relative to the manifest; blank lines and lines
+    starting with '#' are skipped.
+    """
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.lox")
+        return sorted(glob.glob(pattern, recursive=True))
+    base = os.path.dirname(source)
+    with open(source) as f_in:
+        lines = [line.strip() for line in f_in]
+    return [
+        os.path.join(base, line) for line in lines if line and not line.startswith("#")
+    ]
+
+
+class BatchRunner:
+    def __init__(self, workers: int = None, **options) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.options = options
+
+    def run(self, paths: list[str]) -> list[ScriptResult]:
+        with ProcessPoolExecutor(
+            self.workers, initializer=warm_up, initargs=(self.options,)
+        ) as executor:
+            chunksize = max(1, len(paths) // (self.workers * 4))
+            return list(
+                executor.map(
+                    run_script,
+                    paths,
+                    [self.options] * len(paths),
+                    chunksize=chunksize,
+                )
+            )
+
+
+def format_summary(results: list[ScriptResult], wall: float, workers: int) -> str:
+    failed = [result for result in results if result.exit_code != 0]
+    busy = sum(result.seconds for result in results)
+    rate = len(results) / wall if wall else float("inf")
+    return (
+        f"{len(results)} scripts in {wall:.2f}s ({rate:.1f} scripts/s) "
+        f"on {workers} workers, {busy / (wall * workers or 1):.0%} busy; "
+        f"{len(failed)} failed"
+    )
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(prog="pylox batch")
+    parser.add_argument(
+        "source", help="a directory of .lox files, or a manifest listing scripts"
+    )
+    parser.add_argument("--workers", type=int, help="default: one per CPU")
+    parser.add_argument("--engine", choices=list(ENGINES), default="tree")
+    parser.add_argument("--opt-level", type=int, choices=list(OPT_LEVELS), default=0)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--json", metavar="PATH", help="write every result here")
+    args = parser.parse_args(argv)
+
+    paths = collect(args.source)
+    options = dict(engine=args.engine, opt_level=args.opt_level)
+    runner = BatchRunner(args.workers, **options)
+    if not args.no_cache:
+        # One shared cache, so every worker benefits from the others' entries
+        directory = args.source
+        if not os.path.isdir(directory):
+            directory = os.path.dirname(os.path.abspath(directory))
+        runner.options["cache"] = ArtifactCache(os.path.join(directory, CACHE_DIR))
+
+    start = time.perf_counter()
+    results = runner.run(paths)
+    wall = time.perf_counter() - start
+
+    for result in results:
+        print(f"{result.exit_code:>3} {result.seconds * 1e3:9.1f} ms  {result.path}")
+    print(format_summary(results, wall, runner.workers))
+    if args.json is not None:
+        with open(args.json, "w") as f_out:
+            json.dump([result.to_dict() for result in results], f_out, indent=2)
+    sys.exit(max((result.exit_code for result in results), default=0))
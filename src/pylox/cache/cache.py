@@ -0,0 +1,193 @@
+from __future__ import annotations
+import gc
+import hashlib
+import io
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import time
+from pylox import __version__
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.scanner import Token
+
+CACHE_DIR = "__loxcache__"
+CACHE_SIZE = 64 * 1024 * 1024
+SUFFIX = ".loxc"
+MAGIC = b"LOXC"
+# Bumped whenever node classes change shape
+AST_FORMAT = 2
+# Pickled nodes are only valid for the pylox and Python that wrote them
+TAG = f"pylox-{__version__}-ast{AST_FORMAT}-{sys.implementation.cache_tag}"
+# magic, cache key, payload sha256, payload size
+HEADER = struct.Struct("<4s32s32sQ")
+# Temp files left behind by a writer that died mid-write
+STALE_SECONDS = 3600
+
+
+class Artifact:
+    """A scanned, parsed and resolved script, ready for any engine.
+
+    The resolver is pickled together with the statements so its node-keyed
+    `locals` and `scope_sizes` still point at the loaded nodes.
+    """
+
+    def __init__(self, stmts: list[Stmt], resolver: Resolver) -> None:
+        self.stmts = stmts
+        self.resolver = resolver
+
+
+class _Pickler(pickle.Pickler):
+    # Generated nodes take their slots, in order, as constructor arguments,
+    # which pickles far smaller and faster than the generic slots protocol
+    def reducer_override(self, obj):
+        if isinstance(obj, (Expr, Stmt)):
+            return type(obj), tuple([getattr(obj, name) for name in obj.__slots__])
+        if type(obj) is Token:
+            return Token, (obj.type, obj.lexeme, obj.literal, obj.line)
+        return NotImplemented
+
+
+def _without_gc(func, *args):
+    # Building or walking a large AST triggers many pointless collections
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return func(*args)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _dumps(artifact: Artifact) -> bytes:
+    buffer = io.BytesIO()
+    _Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(artifact)
+    return buffer.getvalue()
+
+
+def cache_key(source: str) -> bytes:
+    return hashlib.sha256(f"{TAG}\0{source}".encode("utf-8", "surrogatepass")).digest()
+
+
+class ArtifactCache:
+    """Content-addressed store of `Artifact`s, one `.loxc` file per key.
+
+    Files are written to a temp file and renamed into place, so readers only
+    ever see complete entries. Every load checks the header and payload
+    digest; a bad entry is deleted and reported as a miss. Hits refresh the
+    entry's mtime, and each store evicts the least recently used entries
+    until the directory fits in `max_size` bytes.
+    """
+
+    def __init__(self, directory: str, max_size: int = CACHE_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def _path(self, key: bytes) -> str:
+        return os.path.join(self.directory, key.hex() + SUFFIX)
+
+    def load(self, source: str) -> Artifact | None:
+        key = cache_key(source)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f_in:
+                data = f_in.read()
+        except OSError:
+            return None
+        artifact = self._decode(key, data)
+        if artifact is None:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return artifact
+
+    def _decode(self, key: bytes, data: bytes) -> Artifact | None:
+        if len(data) < HEADER.size:
+            return None
+        magic, stored_key, digest, size = HEADER.unpack_from(data)
+        payload = data[HEADER.size :]
+        if magic != MAGIC or stored_key != key or size != len(payload):
+            return None
+        if hashlib.sha256(payload).digest() != digest:
+            return None
+        try:
+            artifact = _without_gc(pickle.loads, payload)
+        except Exception:
+            return None
+        return artifact if isinstance(artifact, Artifact) else None
+
+    def store(self, source: str, artifact: Artifact) -> bool:
+        key = cache_key(source)
+        try:
+            payload = _without_gc(_dumps, artifact)
+        except RecursionError:
+            return False
+        digest = hashlib.sha256(payload).digest()
+        data = HEADER.pack(MAGIC, key, digest, len(payload)) + payload
+        if len(data) > self.max_size:
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as f_out:
+                    f_out.write(data)
+                # mkstemp creates the file owner-only
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                self._remove(tmp)
+                raise
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of every entry, least recently used first."""
+        ret = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return ret
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith(SUFFIX):
+                ret.append((stat.st_mtime, stat.st_size, path))
+            elif name.endswith(".tmp") and now - stat.st_mtime > STALE_SECONDS:
+                self._remove(path)
+        ret.sort()
+        return ret
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Iterable, TextIO
+from pylox.engines import ENGINES
+from pylox.inference.inference import TypeInference
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.output import MemorySink
+from pylox.optimizer.optimizer import Optimizer
+from pylox.parser.stack_parser import StackParser
+from pylox.parser.stmt import Stmt
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.fast_scanner import FastScanner
+
+PROGRAM_CACHE_SIZE = 128
+
+
+class LoxError:
+    """A scan, parse, resolve or runtime error, as plain data."""
+
+    __slots__ = ("kind", "message", "line")
+
+    def __init__(self, kind: str, message: str, line: int) -> None:
+        self.kind = kind
+        self.message = message
+        self.line = line
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LoxError):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"LoxError({self.kind!r}, {self.message!r}, line={self.line})"
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "message": self.message, "line": self.line}
+
+
+class CompileError(Exception):
+    def __init__(self, errors: list[LoxError]) -> None:
+        super().__init__("\n".join(f"[line {e.line}] {e.message}" for e in errors))
+        self.errors = errors
+
+
+class RunResult:
+    """What one `Program.run` produced.
+
+    `output` is what the program printed, or None when it printed to a
+    caller-supplied stream. `globals` holds the global variables at exit,
+    even when the run stopped on an error.
+    """
+
+    def __init__(
+        self, output: str, globals: dict[str, object], errors: list[LoxError]
+    ) -> None:
+        self.output = output
+        self.globals = globals
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _lox_value(value: object) -> object:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if value is None or isinstance(value, (float, str, bool)):
+        return value
+    raise TypeError(f"cannot pass {type(value).__name__} to Lox")
+
+
+class Program:
+    """A compiled script, safe to run many times from many threads.
+
+    Running never changes the program: each run gets its own engine
+    instance and its own copy of the resolver's bindings.
+    """
+
+    __slots__ = ("_source", "_stmts", "_resolver", "_engine", "_inference")
+
+    def __init__(
+        self,
+        source: str,
+        stmts: list[Stmt],
+        resolver: Resolver,
+        engine: str,
+        inference: TypeInference = None,
+    ) -> None:
+        self._source = source
+        self._stmts = tuple(stmts)
+        self._resolver = resolver
+        self._engine = engine
+        self._inference = inference
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    def run(
+        self, globals: dict[str, object] = None, stdout: TextIO = None
+    ) -> RunResult:
+        buffer = MemorySink() if stdout is None else None
+        interpreter = ENGINES[self._engine](stdout if stdout is not None else buffer)
+        if isinstance(interpreter, Interpreter):
+            interpreter.resolve(self._resolver)
+            if self._inference is not None:
+                interpreter.use_types(self._inference)
+        for name, value in (globals or {}).items():
+            interpreter.define_global(name, _lox_value(value))
+        errors = []
+        try:
+            interpreter.interpret(list(self._stmts))
+        except RuntimeError as e:
+            errors.append(LoxError("runtime", e.msg, e.token.line))
+        output = buffer.getvalue() if buffer is not None else None
+        return RunResult(output, interpreter.global_values(), errors)
+
+
+class LoxEngine:
+    """Instance-based entry point for embedding Lox.
+
+    Unlike `Lox`, it keeps no class-level state, never prints and never
+    exits. Compiled programs are kept in a thread-safe LRU cache keyed by
+    source and declared globals, so hot paths skip scanning, parsing and
+    resolving entirely.
+    """
+
+    def __init__(
+        self,
+        engine: str = "tree",
+        opt_level: int = 0,
+        cache_size: int = PROGRAM_CACHE_SIZE,
+        infer_types: bool = False,
+    ) -> None:
+        self.engine = engine
+        self.opt_level = opt_level
+        self.infer_types = infer_types
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._programs: OrderedDict[tuple, Program] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, source: str, globals: Iterable[str] = ()) -> Program:
+        """Compiles `source`, raising `CompileError` with every error found.
+
+        `globals` names variables the caller will supply to `Program.run`,
+        so reading them does not count as using an undeclared variable.
+        """
+        key = (source, frozenset(globals))
+        with self._lock:
+            program = self._programs.get(key)
+            if program is not None:
+                self._programs.move_to_end(key)
+                self.hits += 1
+                return program
+            self.misses += 1
+
+        program = self._compile(source, key[1])
+        with self._lock:
+            self._programs[key] = program
+            self._programs.move_to_end(key)
+            while len(self._programs) > self.cache_size:
+                self._programs.popitem(last=False)
+        return program
+
+    def _compile(self, source: str, globals: frozenset[str]) -> Program:
+        scanner = FastScanner(source)
+        tokens = scanner.scan_buffer()
+        errors = [LoxError("scan", e.msg, e.line) for e in scanner.errors]
+        parser = StackParser(tokens)
+        stmts = parser.parse()
+        errors.extend(LoxError("parse", e.msg, e.token.line) for e in parser.errors)
+        if errors:
+            raise CompileError(errors)
+
+        resolver = Resolver(set(globals))
+        resolver.resolve(stmts)
+        if resolver.errors:
+            raise CompileError(
+                [LoxError("resolve", e.msg, e.token.line) for e in resolver.errors]
+            )
+        if self.opt_level:
+            stmts = Optimizer.for_level(self.opt_level).optimize(stmts, resolver)
+        inference = None
+        if self.infer_types:
+            inference = TypeInference()
+            inference.infer(stmts)
+        return Program(source, stmts, resolver, self.engine, inference)
+
+    def run(
+        self, source: str, globals: dict[str, object] = None, stdout: TextIO = None
+    ) -> RunResult:
+        """Compiles (or reuses) and runs `source`, returning compile errors."""
+        globals = globals or {}
+        try:
+            program = self.compile(source, globals)
+        except CompileError as e:
+            return RunResult(None, {}, e.errors)
+        return program.run(globals, stdout)
@@ -0,0 +1,15 @@
+from pylox.interpreter.closure import ClosureInterpreter
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.quickening import QuickeningInterpreter
+from pylox.interpreter.stack import StackInterpreter
+from pylox.transpiler.transpiler import TranspiledInterpreter
+from pylox.vm.vm import VM
+
+ENGINES = {
+    "tree": Interpreter,
+    "vm": VM,
+    "closure": ClosureInterpreter,
+    "python": TranspiledInterpreter,
+    "quick": QuickeningInterpreter,
+    "stack": StackInterpreter,
+}
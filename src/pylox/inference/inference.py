@@ -0,0 +1,257 @@
+from __future__ import annotations
+import enum
+import operator
+from typing import Callable
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from pylox.scanner.scanner import Token, TokenType
+
+
+class LoxType(enum.IntFlag):
+    """The set of runtime classes an expression may evaluate to."""
+
+    NIL = enum.auto()
+    BOOL = enum.auto()
+    NUMBER = enum.auto()
+    STRING = enum.auto()
+    ANY = NIL | BOOL | NUMBER | STRING
+
+
+NOTHING = LoxType(0)
+
+LITERAL_TYPES = {
+    type(None): LoxType.NIL,
+    bool: LoxType.BOOL,
+    float: LoxType.NUMBER,
+    str: LoxType.STRING,
+}
+
+# Operators that raise unless both operands are numbers
+NUMERIC_OPERATORS = {
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+# Equality never checks its operands, so it always runs unchecked
+EQUALITY_OPERATORS = {
+    TokenType.EQUAL_EQUAL: operator.eq,
+    TokenType.BANG_EQUAL: operator.ne,
+}
+
+
+def _is_zero(value: float) -> bool:
+    return value == 0
+
+
+UNARY_OPERATORS = {TokenType.MINUS: operator.neg, TokenType.BANG: _is_zero}
+
+
+class StaticTypeError(Exception):
+    def __init__(self, token: Token, msg: str) -> None:
+        super().__init__(msg)
+        self.token = token
+        self.msg = msg
+
+
+class TypeInference(ExprVisitor, StmtVisitor):
+    """Infers which types every expression of a resolved program can have.
+
+    A variable's type is the union of everything declared or assigned to
+    it anywhere in the program, so the analysis ignores control flow and
+    is repeated until those unions stop growing. Globals are only typed
+    for reads after their top-level declaration: before it they may hold
+    a value set by the host or by an earlier REPL input.
+
+    `unchecked` maps the operator nodes whose operands are proven numbers
+    to the plain Python operation an engine may run instead of checking.
+    `errors` lists operators whose operands can never be numbers; they
+    only fail if they are reached, so reporting them is up to the caller.
+    """
+
+    def __init__(self) -> None:
+        self._scopes: list[tuple[Stmt, set[str]]] = []
+        self._declared: set[str] = set()
+        self._variables: dict[object, LoxType] = {}
+        self._changed = False
+        self.types: dict[Expr, LoxType] = {}
+        self.unchecked: dict[Expr, Callable] = {}
+        self.errors: list[StaticTypeError] = []
+
+    def infer(self, stmts: list[Stmt]):
+        self._changed = True
+        while self._changed:
+            self._changed = False
+            self._declared = set()
+            for stmt in stmts:
+                stmt.accept(self)
+        self._check()
+
+    def _check(self):
+        types = self.types
+        for expr in types:
+            if isinstance(expr, Unary):
+                self._check_unary(expr, types[expr.right])
+            elif isinstance(expr, Binary):
+                self._check_binary(expr, types[expr.left], types[expr.right])
+
+    def _check_unary(self, expr: Unary, right: LoxType):
+        if right & ~LoxType.NUMBER == NOTHING:
+            self.unchecked[expr] = UNARY_OPERATORS[expr.operator.type]
+        elif right & LoxType.NUMBER == NOTHING:
+            self._error(expr.operator, "Operand must be a number.")
+
+    def _check_binary(self, expr: Binary, left: LoxType, right: LoxType):
+        type = expr.operator.type
+        if type in EQUALITY_OPERATORS:
+            self.unchecked[expr] = EQUALITY_OPERATORS[type]
+            return
+        numbers = (left | right) & ~LoxType.NUMBER == NOTHING
+        if type == TokenType.PLUS:
+            # Strings still need `add` to build ropes
+            if numbers:
+                self.unchecked[expr] = operator.add
+            return
+        if numbers:
+            self.unchecked[expr] = NUMERIC_OPERATORS[type]
+        elif left & LoxType.NUMBER == NOTHING or right & LoxType.NUMBER == NOTHING:
+            self._error(expr.operator, "Operands must be numbers.")
+
+    def _error(self, token: Token, msg: str):
+        self.errors.append(StaticTypeError(token, msg))
+
+    def _key(self, name: str) -> object:
+        for owner, names in reversed(self._scopes):
+            if name in names:
+                return owner, name
+        return name
+
+    def _read(self, name: str) -> LoxType:
+        key = self._key(name)
+        if key == name and name not in self._declared:
+            return LoxType.ANY
+        return self._variables.get(key, NOTHING)
+
+    def _store(self, key: object, type: LoxType):
+        old = self._variables.get(key, NOTHING)
+        if type & ~old:
+            self._variables[key] = old | type
+            self._changed = True
+
+    def _type(self, expr: Expr) -> LoxType:
+        type = self.types[expr] = expr.accept(self)
+        return type
+
+    def _scope(self, owner: Stmt, stmts: list[Stmt]):
+        self._scopes.append((owner, set()))
+        for stmt in stmts:
+            stmt.accept(self)
+        self._scopes.pop()
+
+    def visit_block(self, stmt: Block):
+        self._scope(stmt, stmt.statements)
+
+    def visit_var(self, stmt: Var):
+        type = LoxType.NIL
+        if stmt.init is not None:
+            type = self._type(stmt.init)
+        name = stmt.name.lexeme
+        if not self._scopes:
+            self._store(name, type)
+            self._declared.add(name)
+            return
+        owner, names = self._scopes[-1]
+        names.add(name)
+        self._store((owner, name), type)
+
+    def visit_expression(self, stmt: Expression):
+        self._type(stmt.expression)
+
+    def visit_print(self, stmt: Print):
+        self._type(stmt.expression)
+
+    def visit_if(self, stmt: If):
+        self._type(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while(self, stmt: While):
+        self._type(stmt.condition)
+        stmt.stmt.accept(self)
+
+    def visit_for(self, stmt: For):
+        self._scopes.append((stmt, set()))
+        if stmt.init is not None:
+            stmt.init.accept(self)
+        self._type(stmt.condition)
+        stmt.body.accept(self)
+        if stmt.increment is not None:
+            self._type(stmt.increment)
+        self._scopes.pop()
+
+    def visit_assign(self, expr: Assign):
+        type = self._type(expr.expr)
+        self._store(self._key(expr.name.lexeme), type)
+        return type
+
+    def visit_variable(self, expr: Variable):
+        return self._read(expr.name.lexeme)
+
+    def visit_literal(self, expr: Literal):
+        return LITERAL_TYPES[type(expr.value)]
+
+    def visit_grouping(self, expr: Grouping):
+        return self._type(expr.expression)
+
+    def visit_unary(self, expr: Unary):
+        self._type(expr.right)
+        if expr.operator.type == TokenType.MINUS:
+            return LoxType.NUMBER
+        return LoxType.BOOL
+
+    def visit_binary(self, expr: Binary):
+        left = self._type(expr.left)
+        right = self._type(expr.right)
+        type = expr.operator.type
+        if type != TokenType.PLUS:
+            if type in (TokenType.MINUS, TokenType.STAR, TokenType.SLASH):
+                return LoxType.NUMBER
+            return LoxType.BOOL
+        if (left | right) & ~LoxType.NUMBER == NOTHING:
+            return LoxType.NUMBER
+        if (left | right) & ~LoxType.STRING == NOTHING:
+            return LoxType.STRING
+        # Python's `+` also accepts booleans, and its result is not a Lox type
+        return LoxType.ANY
+
+    def visit_logical(self, expr: Logical):
+        return self._type(expr.left) | self._type(expr.right)
+
+    def visit_conditional(self, expr: Conditional):
+        self._type(expr.condition)
+        return self._type(expr.then_branch) | self._type(expr.else_branch)
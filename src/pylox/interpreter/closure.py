@@ -0,0 +1,340 @@
+from __future__ import annotations
+import operator as op
+from typing import Callable
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from pylox.scanner.scanner import Token, TokenType
+from .interpreter import Interpreter, RuntimeError, is_truthy
+from .environment import Environment, SlotEnvironment
+from .loop import UNSET, Hoisted, LoopPlan
+from .output import OutputSink, as_sink
+from .rope import STRING_TYPES, add, never_strings
+
+Thunk = Callable[[object], object]
+
+# Operators whose result is always a bool, so conditions can skip is_truthy
+BOOLEAN_OPERATORS = (
+    TokenType.GREATER,
+    TokenType.GREATER_EQUAL,
+    TokenType.LESS,
+    TokenType.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL,
+    TokenType.BANG_EQUAL,
+)
+
+NUMERIC_OPERATORS = {
+    TokenType.MINUS: op.sub,
+    TokenType.STAR: op.mul,
+    TokenType.SLASH: op.truediv,
+    TokenType.GREATER: op.gt,
+    TokenType.GREATER_EQUAL: op.ge,
+    TokenType.LESS: op.lt,
+    TokenType.LESS_EQUAL: op.le,
+}
+
+
+class ClosureCompiler(ExprVisitor, StmtVisitor):
+    """Turns each node into a Python closure taking the current environment.
+
+    Operand closures are bound once at compile time, so running the program
+    skips `accept()` dispatch and the operator `if` chain of the tree-walker.
+    """
+
+    def __init__(
+        self,
+        globals: Environment,
+        locals: dict[object, tuple[int, int]],
+        scope_sizes: dict[Stmt, int],
+        out: OutputSink = None,
+        unchecked: dict[Expr, Callable] = None,
+    ) -> None:
+        self._globals = globals
+        self._locals = locals
+        self._scope_sizes = scope_sizes
+        self._out = out or as_sink()
+        self._unchecked = unchecked if unchecked is not None else {}
+
+    def compile(self, stmts: list[Stmt]) -> list[Thunk]:
+        return [stmt.accept(self) for stmt in stmts]
+
+    def _condition(self, expr) -> Thunk:
+        cond = expr.accept(self)
+        if isinstance(expr, Binary) and expr.operator.type in BOOLEAN_OPERATORS:
+            return cond
+        return lambda env: is_truthy(cond(env))
+
+    def visit_expression(self, stmt: Expression):
+        return stmt.expression.accept(self)
+
+    def visit_print(self, stmt: Print):
+        expr = stmt.expression.accept(self)
+        emit = self._out.print
+
+        def run(env):
+            emit(expr(env))
+
+        return run
+
+    def visit_var(self, stmt: Var):
+        init = stmt.init.accept(self) if stmt.init is not None else None
+        loc = self._locals.get(stmt)
+        if loc is None:
+            values = self._globals._values
+            name = stmt.name.lexeme
+
+            def define_global(env):
+                values[name] = init(env) if init is not None else None
+
+            return define_global
+
+        slot = loc[1]
+
+        def define_local(env):
+            env._values[slot] = init(env) if init is not None else None
+
+        return define_local
+
+    def visit_block(self, stmt: Block):
+        body = tuple(self.compile(stmt.statements))
+        size = self._scope_sizes[stmt]
+
+        def run(env):
+            inner = SlotEnvironment(size, env)
+            for run_stmt in body:
+                run_stmt(inner)
+
+        return run
+
+    def visit_if(self, stmt: If):
+        cond = self._condition(stmt.condition)
+        then_branch = stmt.then_branch.accept(self)
+        if stmt.else_branch is None:
+
+            def run_if(env):
+                if cond(env):
+                    then_branch(env)
+
+            return run_if
+
+        else_branch = stmt.else_branch.accept(self)
+
+        def run_if_else(env):
+            if cond(env):
+                then_branch(env)
+            else:
+                else_branch(env)
+
+        return run_if_else
+
+    def visit_while(self, stmt: While):
+        cond = self._condition(stmt.condition)
+        body = stmt.stmt.accept(self)
+
+        def run(env):
+            while cond(env):
+                body(env)
+
+        return run
+
+    def visit_for(self, stmt: For):
+        plan = LoopPlan(stmt, self._locals, self._scope_sizes, self._unchecked)
+        init = plan.init.accept(self) if plan.init is not None else None
+        cond = self._condition(plan.condition)
+        increment = None
+        if plan.increment is not None:
+            increment = plan.increment.accept(self)
+        body = tuple(self.compile(plan.statements))
+        size, body_size = self._scope_sizes[stmt], plan.body_size
+
+        def run(env):
+            plan.reset()
+            loop_env = SlotEnvironment(size, env)
+            body_env = loop_env
+            if body_size is not None:
+                body_env = SlotEnvironment(body_size, loop_env)
+            if init is not None:
+                init(loop_env)
+            while cond(loop_env):
+                for run_stmt in body:
+                    run_stmt(body_env)
+                if increment is not None:
+                    increment(loop_env)
+
+        return run
+
+    def visit_hoisted(self, expr: Hoisted):
+        value = expr.expression.accept(self)
+
+        def run(env):
+            cached = expr.value
+            if cached is UNSET:
+                cached = expr.value = value(env)
+            return cached
+
+        return run
+
+    def _undefined(self, name: Token) -> RuntimeError:
+        return RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+
+    def visit_variable(self, expr: Variable):
+        loc = self._locals.get(expr)
+        if loc is None:
+            values = self._globals._values
+            name = expr.name.lexeme
+            undefined = self._undefined
+
+            def get_global(env):
+                try:
+                    return values[name]
+                except KeyError:
+                    raise undefined(expr.name) from None
+
+            return get_global
+
+        depth, slot = loc
+        if depth == 0:
+            return lambda env: env._values[slot]
+        if depth == 1:
+            return lambda env: env._enclosing._values[slot]
+        return lambda env: env.get_at(depth, slot)
+
+    def visit_assign(self, expr: Assign):
+        value = expr.expr.accept(self)
+        loc = self._locals.get(expr)
+        if loc is None:
+            values = self._globals._values
+            name = expr.name.lexeme
+            undefined = self._undefined
+
+            def set_global(env):
+                val = value(env)
+                if name not in values:
+                    raise undefined(expr.name)
+                values[name] = val
+                return val
+
+            return set_global
+
+        depth, slot = loc
+
+        def set_local(env):
+            val = value(env)
+            env.assign_at(depth, slot, val)
+            return val
+
+        return set_local
+
+    def visit_grouping(self, expr: Grouping):
+        return expr.expression.accept(self)
+
+    def visit_literal(self, expr: Literal):
+        value = expr.value
+        return lambda env: value
+
+    def visit_unary(self, expr: Unary):
+        right = expr.right.accept(self)
+        unchecked = self._unchecked.get(expr)
+        if unchecked is not None:
+            return lambda env: unchecked(right(env))
+        operator = expr.operator
+        negate = operator.type == TokenType.MINUS
+
+        def run(env):
+            val = right(env)
+            if not isinstance(val, float):
+                raise RuntimeError(operator, "Operand must be a number.")
+            return -val if negate else val == 0
+
+        return run
+
+    def visit_conditional(self, expr: Conditional):
+        cond = self._condition(expr.condition)
+        first = expr.then_branch.accept(self)
+        second = expr.else_branch.accept(self)
+        return lambda env: first(env) if cond(env) else second(env)
+
+    def visit_logical(self, expr: Logical):
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        if expr.operator.type == TokenType.OR:
+
+            def run(env):
+                value = left(env)
+                return value if is_truthy(value) else right(env)
+
+            return run
+
+        def run(env):
+            value = left(env)
+            return right(env) if is_truthy(value) else value
+
+        return run
+
+    def visit_binary(self, expr: Binary):
+        operator = expr.operator
+        type = operator.type
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        unchecked = self._unchecked.get(expr)
+        if unchecked is not None:
+            return lambda env: unchecked(left(env), right(env))
+        if type == TokenType.PLUS and never_strings(expr):
+            return lambda env: left(env) + right(env)
+        if type == TokenType.PLUS:
+
+            def run(env):
+                a = left(env)
+                b = right(env)
+                if a.__class__ in STRING_TYPES or b.__class__ in STRING_TYPES:
+                    return add(a, b)
+                return a + b
+
+            return run
+        if type == TokenType.EQUAL_EQUAL:
+            return lambda env: left(env) == right(env)
+        if type == TokenType.BANG_EQUAL:
+            return lambda env: left(env) != right(env)
+        apply = NUMERIC_OPERATORS[type]
+
+        def run(env):
+            a = left(env)
+            b = right(env)
+            if isinstance(a, float) and isinstance(b, float):
+                return apply(a, b)
+            raise RuntimeError(operator, "Operands must be numbers.")
+
+        return run
+
+
+class ClosureInterpreter(Interpreter):
+    def interpret(self, stmts: list[Stmt]):
+        compiler = ClosureCompiler(
+            self._globals, self._locals, self._scope_sizes, self._out, self._unchecked
+        )
+        env = self._env
+        try:
+            for run in compiler.compile(stmts):
+                run(env)
+        finally:
+            self._out.flush()
@@ -28,3 +28,27 @@ class Environment:
             return self._enclosing.get(name)
 
         raise i.RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+
+
+class SlotEnvironment:
+    """Block scope whose variables were bound to slots by the `Resolver`."""
+
+    def __init__(self, size: int, enclosing: object = None) -> None:
+        self._values = [None] * size
+        self._enclosing = enclosing
+
+    def define(self, slot: int, val: object):
+        self._values[slot] = val
+
+    def _ancestor(self, depth: int) -> SlotEnvironment:
+        env = self
+        while depth:
+            env = env._enclosing
+            depth -= 1
+        return env
+
+    def get_at(self, depth: int, slot: int) -> object:
+        return self._ancestor(depth)._values[slot]
+
+    def assign_at(self, depth: int, slot: int, val: object):
+        self._ancestor(depth)._values[slot] = val
@@ -1,5 +1,7 @@
+from typing import Callable, TextIO
 from pylox.parser.stmt import (
     Expression,
+    For,
     If,
     Print,
     Stmt,
@@ -11,15 +13,22 @@ from pylox.parser.stmt import (
 from pylox.parser.expr import (
     Assign,
     Binary,
+    Conditional,
     Expr,
     ExprVisitor,
     Grouping,
     Literal,
+    Logical,
     Unary,
     Variable,
 )
 from pylox.scanner.scanner import TokenType, Token
-from .environment import Environment
+from pylox.inference.inference import TypeInference
+from pylox.resolver.resolver import Resolver
+from .environment import Environment, SlotEnvironment
+from .loop import UNSET, Hoisted, LoopPlan
+from .output import OutputSink, as_sink
+from .rope import add, flatten
 
 
 class RuntimeError(Exception):
@@ -29,14 +38,74 @@ class RuntimeError(Exception):
         self.msg = msg
 
 
+def is_truthy(obj: object) -> bool:
+    if isinstance(obj, float):
+        return obj != 0
+    if isinstance(obj, str):
+        return obj != ""
+    if isinstance(obj, bool):
+        return obj
+    if obj is None:
+        return False
+    return True
+
+
+class ScopeSizes(dict):
+    """`Resolver.scope_sizes` as the engines read it.
+
+    Every block and `for` loop needs its slot count, so a missing one means
+    the program was never passed to `Interpreter.resolve`.
+    """
+
+    def __missing__(self, stmt: Stmt):
+        raise ValueError("program must be resolved before interpretation")
+
+
 class Interpreter(ExprVisitor, StmtVisitor):
-    def __init__(self) -> None:
-        self._env = Environment()
+    """Tree-walking engine.
+
+    Local variables live in slots, so a program must be resolved and handed
+    to `resolve` before `interpret` runs it; a block or loop that was not
+    resolved raises `ValueError`.
+    """
+
+    def __init__(self, stdout: TextIO | OutputSink = None) -> None:
+        self._out = as_sink(stdout)
+        self._globals = Environment()
+        self._env = self._globals
+        self._locals: dict[object, tuple[int, int]] = {}
+        self._scope_sizes: dict[Stmt, int] = ScopeSizes()
+        self._loops: dict[For, LoopPlan] = {}
+        self._unchecked: dict[Expr, Callable] = {}
+
+    def resolve(self, resolver: Resolver):
+        self._locals.update(resolver.locals)
+        self._scope_sizes.update(resolver.scope_sizes)
+
+    def use_types(self, inference: TypeInference):
+        """Runs operators whose operand types are proven without checks."""
+        self._unchecked.update(inference.unchecked)
+
+    def release(self):
+        """Forgets everything recorded about statements that have run.
+
+        Only valid once no environment or statement still refers to them.
+        """
+        self._locals.clear()
+        self._scope_sizes.clear()
+        self._loops.clear()
+        self._unchecked.clear()
+
+    def define_global(self, name: str, value: object):
+        self._globals.define(name, value)
+
+    def global_values(self) -> dict[str, object]:
+        return {name: flatten(value) for name, value in self._globals._values.items()}
 
     def _eval(self, expr: Expr) -> object:
         return expr.accept(self)
 
-    def _execute_blocks(self, statements: list[Stmt], env: Environment):
+    def _execute_blocks(self, statements: list[Stmt], env: SlotEnvironment):
         previous = self._env
         try:
             self._env = env
@@ -46,64 +115,102 @@ class Interpreter(ExprVisitor, StmtVisitor):
             self._env = previous
 
     def visit_block(self, stmt: Block):
-        self._execute_blocks(stmt.statements, Environment(self._env))
+        env = SlotEnvironment(self._scope_sizes[stmt], self._env)
+        self._execute_blocks(stmt.statements, env)
         return
 
     def visit_assign(self, expr: Assign):
         val = self._eval(expr.expr)
-        self._env.assign(expr.name, val)
+        loc = self._locals.get(expr)
+        if loc is None:
+            self._globals.assign(expr.name, val)
+        else:
+            self._env.assign_at(*loc, val)
         return val
 
     def visit_if(self, stmt: If):
         if self._is_truthy(self._eval(stmt.condition)):
             self.execute(stmt.then_branch)
-        elif stmt.then_branch is not None:
+        elif stmt.else_branch is not None:
             self.execute(stmt.else_branch)
 
     def visit_while(self, stmt: While):
         while self._is_truthy(self._eval(stmt.condition)):
             self.execute(stmt.stmt)
 
+    def visit_for(self, stmt: For):
+        plan = self._loops.get(stmt)
+        if plan is None:
+            plan = LoopPlan(stmt, self._locals, self._scope_sizes, self._unchecked)
+            self._loops[stmt] = plan
+        plan.reset()
+        previous = self._env
+        loop_env = SlotEnvironment(self._scope_sizes[stmt], previous)
+        body_env = loop_env
+        if plan.body_size is not None:
+            body_env = SlotEnvironment(plan.body_size, loop_env)
+        condition, increment = plan.condition, plan.increment
+        try:
+            self._env = loop_env
+            if plan.init is not None:
+                self.execute(plan.init)
+            while self._is_truthy(condition.accept(self)):
+                self._env = body_env
+                for inner in plan.statements:
+                    inner.accept(self)
+                self._env = loop_env
+                if increment is not None:
+                    increment.accept(self)
+        finally:
+            self._env = previous
+
+    def visit_hoisted(self, expr: Hoisted):
+        value = expr.value
+        if value is UNSET:
+            value = expr.value = self._eval(expr.expression)
+        return value
+
     def visit_var(self, stmt: Var):
         init_val = None
         if stmt.init is not None:
             init_val = self._eval(stmt.init)
 
-        self._env.define(stmt.name.lexeme, init_val)
+        loc = self._locals.get(stmt)
+        if loc is None:
+            self._globals.define(stmt.name.lexeme, init_val)
+        else:
+            self._env.define(loc[1], init_val)
 
     def visit_variable(self, expr: Variable):
-        return self._env.get(expr.name)
+        loc = self._locals.get(expr)
+        if loc is None:
+            return self._globals.get(expr.name)
+        return self._env.get_at(*loc)
 
     def visit_expression(self, stmt: Expression):
         self._eval(stmt.expression)
         return
 
     def visit_print(self, stmt: Print):
-        print(self._eval(stmt.expression))
+        self._out.print(self._eval(stmt.expression))
 
     def interpret(self, stmts: list[Stmt]):
         try:
             for stmt in stmts:
                 self.execute(stmt)
-        except RuntimeError as e:
-            raise
+        finally:
+            self._out.flush()
 
     def execute(self, stmt: Stmt):
         return stmt.accept(self)
 
-    def _is_truthy(self, obj: object) -> bool:
-        if isinstance(obj, float):
-            return obj != 0
-        if isinstance(obj, str):
-            return obj != ""
-        if isinstance(obj, bool):
-            return obj
-        if obj is None:
-            return False
-        return True
+    _is_truthy = staticmethod(is_truthy)
 
     def visit_unary(self, expr: Unary) -> object:
         right_val = self._eval(expr.right)
+        unchecked = self._unchecked.get(expr)
+        if unchecked is not None:
+            return unchecked(right_val)
         self._check_number_operand(expr.operator, right_val)
         if expr.operator.type == TokenType.MINUS:
             return -float(right_val)
@@ -131,38 +238,53 @@ class Interpreter(ExprVisitor, StmtVisitor):
             return
         raise RuntimeError(operator, "Operands must be numbers.")
 
+    def visit_conditional(self, expr: Conditional):
+        if self._is_truthy(self._eval(expr.condition)):
+            return self._eval(expr.then_branch)
+        return self._eval(expr.else_branch)
+
+    def visit_logical(self, expr: Logical):
+        left = self._eval(expr.left)
+        if expr.operator.type == TokenType.OR:
+            if self._is_truthy(left):
+                return left
+        elif not self._is_truthy(left):
+            return left
+        return self._eval(expr.right)
+
     def visit_binary(self, expr: Binary):
         left = self._eval(expr.left)
         right = self._eval(expr.right)
-        if self._types_equal(expr.operator.type, TokenType.MINUS):
-            self._check_number_operands(expr.operator, left, right)
+        unchecked = self._unchecked.get(expr)
+        if unchecked is not None:
+            return unchecked(left, right)
+        return self._binary(expr.operator, left, right)
+
+    def _binary(self, operator: Token, left: object, right: object):
+        if self._types_equal(operator.type, TokenType.MINUS):
+            self._check_number_operands(operator, left, right)
             return float(left) - float(right)
-        if self._types_equal(expr.operator.type, TokenType.STAR):
-            self._check_number_operands(expr.operator, left, right)
+        if self._types_equal(operator.type, TokenType.STAR):
+            self._check_number_operands(operator, left, right)
             return float(left) * float(right)
-        if self._types_equal(expr.operator.type, TokenType.SLASH):
-            self._check_number_operands(expr.operator, left, right)
+        if self._types_equal(operator.type, TokenType.SLASH):
+            self._check_number_operands(operator, left, right)
             return float(left) / float(right)
-        if self._types_equal(expr.operator.type, TokenType.PLUS):
-            return left + right
-        if self._types_equal(expr.operator.type, TokenType.GREATER):
-            self._check_number_operands(expr.operator, left, right)
+        if self._types_equal(operator.type, TokenType.PLUS):
+            return add(left, right)
+        if self._types_equal(operator.type, TokenType.GREATER):
+            self._check_number_operands(operator, left, right)
             return float(left) > float(right)
-        if self._types_equal(expr.operator.type, TokenType.GREATER_EQUAL):
-            self._check_number_operands(expr.operator, left, right)
+        if self._types_equal(operator.type, TokenType.GREATER_EQUAL):
+            self._check_number_operands(operator, left, right)
             return float(left) >= float(right)
-        if self._types_equal(expr.operator.type, TokenType.LESS):
-            self._check_number_operands(expr.operator, left, right)
+        if self._types_equal(operator.type, TokenType.LESS):
+            self._check_number_operands(operator, left, right)
             return float(left) < float(right)
-        if self._types_equal(expr.operator.type, TokenType.LESS_EQUAL):
-            self._check_number_operands(expr.operator, left, right)
+        if self._types_equal(operator.type, TokenType.LESS_EQUAL):
+            self._check_number_operands(operator, left, right)
             return float(left) <= float(right)
-        if self._types_equal(expr.operator.type, TokenType.EQUAL_EQUAL):
+        if self._types_equal(operator.type, TokenType.EQUAL_EQUAL):
             return left == right
-        if self._types_equal(expr.operator.type, TokenType.BANG_EQUAL):
+        if self._types_equal(operator.type, TokenType.BANG_EQUAL):
             return left != right
-        if self._types_equal(expr.operator.type, TokenType.QUESTION_MARK):
-            if self._is_truthy(left):
-                return self._eval(expr.right.left)
-            else:
-                return self._eval(expr.right.right)
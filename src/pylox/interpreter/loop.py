@@ -0,0 +1,199 @@
+from __future__ import annotations
+from typing import Callable
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    Var,
+    While,
+)
+from pylox.resolver.resolver import copy_bound
+from pylox.scanner.scanner import TokenType
+
+UNSET = object()
+
+
+class Hoisted(Expr):
+    """A loop-invariant expression, evaluated at most once per loop entry.
+
+    The value is filled in lazily so a hoisted expression that raises still
+    raises at the point, and on the iteration, where the loop first reaches it.
+    """
+
+    __slots__ = ("expression", "value")
+
+    def __init__(self, expression: Expr):
+        self.expression = expression
+        self.value = UNSET
+
+    def accept(self, visitor: ExprVisitor):
+        return visitor.visit_hoisted(self)
+
+
+def assigned_names(node: object, names: set[str] = None) -> set[str]:
+    if names is None:
+        names = set()
+    if isinstance(node, list):
+        for item in node:
+            assigned_names(item, names)
+        return names
+    if not isinstance(node, (Expr, Stmt)):
+        return names
+    if isinstance(node, (Assign, Var)):
+        names.add(node.name.lexeme)
+    for field in node.__slots__:
+        assigned_names(getattr(node, field), names)
+    return names
+
+
+def _computes(expr: Expr) -> bool:
+    while isinstance(expr, Grouping):
+        expr = expr.expression
+    return isinstance(expr, (Binary, Unary))
+
+
+class LoopPlan:
+    """The parts of a `For` loop as executed, with invariants hoisted.
+
+    Any operator subtree that only reads variables the loop never assigns or
+    declares is wrapped in a `Hoisted` node. Nodes on the path to a hoisted
+    one are copied rather than mutated, and copies inherit the slot bindings,
+    scope sizes and unchecked operations of the node they replace.
+    """
+
+    def __init__(
+        self,
+        stmt: For,
+        locals: dict[object, tuple[int, int]],
+        scope_sizes: dict[Stmt, int],
+        unchecked: dict[Expr, Callable] = None,
+    ) -> None:
+        self._locals = locals
+        self._scope_sizes = scope_sizes
+        self._unchecked = unchecked if unchecked is not None else {}
+        self._assigned = assigned_names([stmt.condition, stmt.increment, stmt.body])
+        self.hoisted: list[Hoisted] = []
+        self.init = stmt.init
+        self.condition = self._hoist(stmt.condition)
+        self.increment = None
+        if stmt.increment is not None:
+            self.increment = self._hoist(stmt.increment)
+        body = self._stmt(stmt.body)
+        # A block body gets one scope for the whole loop: its declarations
+        # are re-run before any read on each iteration.
+        self.body_size: int = None
+        self.statements: list[Stmt] = [body]
+        if isinstance(body, Block):
+            self.body_size = scope_sizes[body]
+            self.statements = body.statements
+
+    def reset(self):
+        for hoisted in self.hoisted:
+            hoisted.value = UNSET
+
+    def _copy(self, node, **fields):
+        tables = (self._locals, self._scope_sizes, self._unchecked)
+        return copy_bound(node, tables, **fields)
+
+    def _wrap(self, expr: Expr, invariant: bool) -> Expr:
+        if not invariant or not _computes(expr):
+            return expr
+        hoisted = Hoisted(expr)
+        self.hoisted.append(hoisted)
+        return hoisted
+
+    def _hoist(self, expr: Expr) -> Expr:
+        return self._wrap(*self._expr(expr))
+
+    def _expr(self, expr: Expr) -> tuple[Expr, bool]:
+        if isinstance(expr, (Literal, Hoisted)):
+            return expr, True
+        if isinstance(expr, Variable):
+            return expr, expr.name.lexeme not in self._assigned
+        if isinstance(expr, Grouping):
+            inner, invariant = self._expr(expr.expression)
+            if invariant:
+                return expr, True
+            return self._copy(expr, expression=inner), False
+        if isinstance(expr, Unary):
+            right, invariant = self._expr(expr.right)
+            if invariant:
+                return expr, True
+            return self._copy(expr, right=right), False
+        if isinstance(expr, Assign):
+            return self._copy(expr, expr=self._hoist(expr.expr)), False
+        if isinstance(expr, Conditional):
+            return self._conditional(expr)
+        left, left_invariant = self._expr(expr.left)
+        right, right_invariant = self._expr(expr.right)
+        if left_invariant and right_invariant:
+            return expr, True
+        left = self._wrap(left, left_invariant)
+        right = self._wrap(right, right_invariant)
+        return self._copy(expr, left=left, right=right), False
+
+    def _conditional(self, expr: Conditional) -> tuple[Expr, bool]:
+        branches = (expr.condition, expr.then_branch, expr.else_branch)
+        parts = [self._expr(e) for e in branches]
+        if all(invariant for _, invariant in parts):
+            return expr, True
+        cond, then_branch, else_branch = (self._wrap(*part) for part in parts)
+        return (
+            self._copy(
+                expr,
+                condition=cond,
+                then_branch=then_branch,
+                else_branch=else_branch,
+            ),
+            False,
+        )
+
+    def _stmt(self, stmt: Stmt) -> Stmt:
+        if isinstance(stmt, (Expression, Print)):
+            return self._copy(stmt, expression=self._hoist(stmt.expression))
+        if isinstance(stmt, Var):
+            if stmt.init is None:
+                return stmt
+            return self._copy(stmt, init=self._hoist(stmt.init))
+        if isinstance(stmt, Block):
+            statements = [self._stmt(inner) for inner in stmt.statements]
+            if all(a is b for a, b in zip(statements, stmt.statements)):
+                return stmt
+            return self._copy(stmt, statements=statements)
+        if isinstance(stmt, If):
+            else_branch = stmt.else_branch
+            if else_branch is not None:
+                else_branch = self._stmt(else_branch)
+            return self._copy(
+                stmt,
+                condition=self._hoist(stmt.condition),
+                then_branch=self._stmt(stmt.then_branch),
+                else_branch=else_branch,
+            )
+        if isinstance(stmt, While):
+            return self._copy(
+                stmt, condition=self._hoist(stmt.condition), stmt=self._stmt(stmt.stmt)
+            )
+        init, increment = stmt.init, stmt.increment
+        return self._copy(
+            stmt,
+            init=self._stmt(init) if init is not None else None,
+            condition=self._hoist(stmt.condition),
+            increment=self._hoist(increment) if increment is not None else None,
+            body=self._stmt(stmt.body),
+        )
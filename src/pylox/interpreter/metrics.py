@@ -0,0 +1,107 @@
+from __future__ import annotations
+import json
+from typing import TextIO
+from pylox.parser.expr import Assign, Variable
+from pylox.parser.stmt import Block, For, Stmt
+from .interpreter import Interpreter, RuntimeError
+from .output import OutputSink
+
+
+def _depth_key(item: tuple[str, int]):
+    depth = item[0]
+    return (depth == "global", int(depth) if depth != "global" else 0)
+
+
+class Metrics:
+    """Counters describing what a run spent its time on.
+
+    `lookup_depths` maps how many scopes a variable get or assign walked up
+    (or "global" for the globals table) to how often that happened.
+    """
+
+    def __init__(self) -> None:
+        self.environments = 0
+        self.variable_gets = 0
+        self.variable_assigns = 0
+        self.lookup_depths: dict[str, int] = {}
+        self.evaluations: dict[str, int] = {}
+        self.runtime_errors = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "environments": self.environments,
+            "variable_gets": self.variable_gets,
+            "variable_assigns": self.variable_assigns,
+            "lookup_depths": dict(sorted(self.lookup_depths.items(), key=_depth_key)),
+            "evaluations": dict(sorted(self.evaluations.items())),
+            "runtime_errors": self.runtime_errors,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def _counted(visit):
+    def counted_visit(self, node):
+        evaluations = self.metrics.evaluations
+        name = type(node).__name__
+        evaluations[name] = evaluations.get(name, 0) + 1
+        return visit(self, node)
+
+    return counted_visit
+
+
+class MeteredInterpreter(Interpreter):
+    """Tree-walker that keeps `Metrics` as it runs.
+
+    Like `ProfilingInterpreter`, the counting lives in this subclass only,
+    so the plain `Interpreter` carries no metrics overhead.
+    """
+
+    def __init__(self, stdout: TextIO | OutputSink = None) -> None:
+        super().__init__(stdout)
+        self.metrics = Metrics()
+        # The globals environment
+        self.metrics.environments = 1
+
+    def _lookup(self, expr: object):
+        loc = self._locals.get(expr)
+        depth = "global" if loc is None else str(loc[0])
+        depths = self.metrics.lookup_depths
+        depths[depth] = depths.get(depth, 0) + 1
+
+    def visit_variable(self, expr: Variable):
+        self.metrics.variable_gets += 1
+        self._lookup(expr)
+        return super().visit_variable(expr)
+
+    def visit_assign(self, expr: Assign):
+        value = super().visit_assign(expr)
+        self.metrics.variable_assigns += 1
+        self._lookup(expr)
+        return value
+
+    def visit_block(self, stmt: Block):
+        self.metrics.environments += 1
+        return super().visit_block(stmt)
+
+    def visit_for(self, stmt: For):
+        try:
+            return super().visit_for(stmt)
+        finally:
+            # The loop scope, plus the body block's scope reused by every pass
+            self.metrics.environments += 1
+            if self._loops[stmt].body_size is not None:
+                self.metrics.environments += 1
+
+    def interpret(self, stmts: list[Stmt]):
+        try:
+            super().interpret(stmts)
+        except RuntimeError:
+            self.metrics.runtime_errors += 1
+            raise
+
+
+for _name in dir(Interpreter):
+    if _name.startswith("visit_"):
+        setattr(MeteredInterpreter, _name, _counted(getattr(MeteredInterpreter, _name)))
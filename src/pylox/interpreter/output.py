@@ -0,0 +1,100 @@
+from __future__ import annotations
+import sys
+from typing import TextIO
+
+# Lines a block-buffered sink collects before writing them out
+FLUSH_LINES = 512
+
+
+class OutputSink:
+    """Where Lox `print` statements write.
+
+    Engines call `print` once per statement and `flush` when `interpret`
+    returns or raises, so buffered output is never lost on a runtime error
+    and always precedes the error message. A `None` stream means whatever
+    `sys.stdout` is at the time of writing.
+    """
+
+    def print(self, value: object):
+        pass
+
+    def flush(self):
+        pass
+
+
+class LineBufferedSink(OutputSink):
+    """Writes and flushes every line, for interactive use."""
+
+    def __init__(self, stream: TextIO = None) -> None:
+        self._stream = stream
+
+    def print(self, value: object):
+        stream = self._stream or sys.stdout
+        stream.write(f"{value}\n")
+        stream.flush()
+
+
+class BlockBufferedSink(OutputSink):
+    """Collects lines and writes them `lines` at a time in a single call."""
+
+    def __init__(self, stream: TextIO = None, lines: int = FLUSH_LINES) -> None:
+        self._stream = stream
+        self.lines = lines
+        self._pending: list[str] = []
+
+    def print(self, value: object):
+        pending = self._pending
+        pending.append(f"{value}\n")
+        if len(pending) >= self.lines:
+            self.flush()
+
+    def flush(self):
+        stream = self._stream or sys.stdout
+        if self._pending:
+            stream.write("".join(self._pending))
+            self._pending.clear()
+        stream.flush()
+
+
+class MemorySink(OutputSink):
+    """Keeps everything printed in memory, for embedding."""
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    def print(self, value: object):
+        self._lines.append(f"{value}\n")
+
+    def getvalue(self) -> str:
+        return "".join(self._lines)
+
+
+class HeldSink(OutputSink):
+    """Passes lines on to `sink` but leaves flushing it to its holder.
+
+    For callers that run a program as many `interpret` calls and would
+    otherwise flush after each one.
+    """
+
+    def __init__(self, sink: OutputSink) -> None:
+        self.sink = sink
+
+    def print(self, value: object):
+        self.sink.print(value)
+
+
+SINKS = {"line": LineBufferedSink, "block": BlockBufferedSink}
+
+
+def as_sink(stdout: TextIO | OutputSink = None) -> OutputSink:
+    """`stdout` itself if it is a sink, else a sink writing to that stream.
+
+    Like C stdio, streams attached to a terminal are line-buffered and
+    everything else is block-buffered.
+    """
+    if isinstance(stdout, OutputSink):
+        return stdout
+    stream = stdout if stdout is not None else sys.stdout
+    if stream.isatty():
+        return LineBufferedSink(stdout)
+    return BlockBufferedSink(stdout)
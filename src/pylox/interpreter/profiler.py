@@ -0,0 +1,143 @@
+from __future__ import annotations
+import time
+from typing import TextIO
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.scanner.scanner import Token
+from .interpreter import Interpreter
+from .output import OutputSink
+
+
+class NodeStats:
+    __slots__ = ("label", "line", "hits", "total", "self_time")
+
+    def __init__(self, label: str, line: int) -> None:
+        self.label = label
+        self.line = line
+        self.hits = 0
+        self.total = 0
+        self.self_time = 0
+
+
+def _first_line(node: object) -> int:
+    """Line of the first token in `node`'s subtree, 0 if it has none."""
+    if isinstance(node, Token):
+        return node.line
+    if isinstance(node, list):
+        for item in node:
+            line = _first_line(item)
+            if line:
+                return line
+        return 0
+    if not isinstance(node, (Expr, Stmt)):
+        return 0
+    for field in node.__slots__:
+        line = _first_line(getattr(node, field))
+        if line:
+            return line
+    return 0
+
+
+class Profile:
+    """Hit counts and times, in nanoseconds, per node, line and node stack.
+
+    `total` includes the time spent in child nodes, `self_time` does not.
+    Nodes without a token of their own take the line of the first token
+    below them, or of their parent when the subtree has none.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[object, NodeStats] = {}
+        self.stacks: dict[tuple[str, ...], int] = {}
+        # [stats, path, start, time spent in children]
+        self._frames: list[list] = []
+
+    def _stats(self, node: object) -> NodeStats:
+        stats = self.nodes.get(node)
+        if stats is None:
+            line = _first_line(node)
+            if not line and self._frames:
+                line = self._frames[-1][0].line
+            label = type(node).__name__
+            token = getattr(node, "operator", None)
+            if isinstance(token, Token):
+                label = f"{label} {token.lexeme}"
+            stats = self.nodes[node] = NodeStats(f"{label}:{line}", line)
+        return stats
+
+    def enter(self, node: object):
+        stats = self._stats(node)
+        path = (stats.label,)
+        if self._frames:
+            path = self._frames[-1][1] + path
+        self._frames.append([stats, path, time.perf_counter_ns(), 0])
+
+    def exit(self):
+        stats, path, start, children = self._frames.pop()
+        elapsed = time.perf_counter_ns() - start
+        stats.hits += 1
+        stats.total += elapsed
+        stats.self_time += elapsed - children
+        self.stacks[path] = self.stacks.get(path, 0) + elapsed - children
+        if self._frames:
+            self._frames[-1][3] += elapsed
+
+    def lines(self) -> dict[int, list[int]]:
+        """Line -> [node hits, self time] summed over the line's nodes."""
+        ret: dict[int, list[int]] = {}
+        for stats in self.nodes.values():
+            row = ret.setdefault(stats.line, [0, 0])
+            row[0] += stats.hits
+            row[1] += stats.self_time
+        return ret
+
+    def format_report(self, limit: int = 20) -> str:
+        nodes = sorted(self.nodes.values(), key=lambda s: s.self_time, reverse=True)
+        lines = [f"{'self ms':>10}{'total ms':>10}{'hits':>10}  node"]
+        for stats in nodes[:limit]:
+            lines.append(
+                f"{stats.self_time / 1e6:>10.2f}{stats.total / 1e6:>10.2f}"
+                f"{stats.hits:>10}  {stats.label}"
+            )
+        by_line = sorted(self.lines().items(), key=lambda kv: kv[1][1], reverse=True)
+        lines.append("")
+        lines.append(f"{'self ms':>10}{'hits':>10}  line")
+        for line, (hits, self_time) in by_line[:limit]:
+            lines.append(f"{self_time / 1e6:>10.2f}{hits:>10}  {line}")
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> str:
+        """Self time per node stack in microseconds, one `a;b;c N` per line."""
+        return "".join(
+            f"{';'.join(path)} {self_time // 1000}\n"
+            for path, self_time in sorted(self.stacks.items())
+            if self_time >= 1000
+        )
+
+
+def _profiled(visit):
+    def profiled_visit(self, node):
+        self.profile.enter(node)
+        try:
+            return visit(self, node)
+        finally:
+            self.profile.exit()
+
+    return profiled_visit
+
+
+class ProfilingInterpreter(Interpreter):
+    """Tree-walker that records a `Profile` of every node it visits.
+
+    Each `visit_*` method is wrapped once at class creation, so the plain
+    `Interpreter` pays nothing for profiling support.
+    """
+
+    def __init__(self, stdout: TextIO | OutputSink = None) -> None:
+        super().__init__(stdout)
+        self.profile = Profile()
+
+
+for _name in dir(Interpreter):
+    if _name.startswith("visit_"):
+        setattr(ProfilingInterpreter, _name, _profiled(getattr(Interpreter, _name)))
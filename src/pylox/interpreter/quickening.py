@@ -0,0 +1,120 @@
+from __future__ import annotations
+import operator
+from typing import Callable, TextIO
+from pylox.parser.expr import Binary
+from pylox.scanner.scanner import TokenType
+from .interpreter import Interpreter
+from .output import OutputSink
+from .rope import Rope, add
+
+# Evaluations with unchanged operand types before a node specializes
+QUICKEN_AFTER = 16
+# Failed guards after which a node stays generic for good
+MAX_DEOPTS = 4
+
+NUMERIC_FORMS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+# Equality never checks its operands, so any types can take these
+EQUALITY_FORMS = {
+    TokenType.EQUAL_EQUAL: operator.eq,
+    TokenType.BANG_EQUAL: operator.ne,
+}
+STRINGS = (str, Rope)
+
+
+def fast_form(type: TokenType, left: type, right: type) -> Callable | None:
+    """The operation `type` reduces to for operands of these exact classes.
+
+    None when the generic path has to check, convert or raise.
+    """
+    if type in EQUALITY_FORMS:
+        return EQUALITY_FORMS[type]
+    if left is float and right is float:
+        return NUMERIC_FORMS[type]
+    if type == TokenType.PLUS and left in STRINGS and right in STRINGS:
+        return add
+    return None
+
+
+class Site:
+    """Type feedback for one `Binary` node, and its fast form once quickened.
+
+    The fast form is only valid while both operands have the classes it
+    was specialized for; `left` and `right` are the guard.
+    """
+
+    __slots__ = ("left", "right", "hits", "fast", "deopts")
+
+    def __init__(self) -> None:
+        self.left: type = None
+        self.right: type = None
+        self.hits = 0
+        self.fast: Callable = None
+        self.deopts = 0
+
+
+class QuickeningInterpreter(Interpreter):
+    """Tree-walker whose `Binary` nodes specialize on the types they see.
+
+    Each node starts generic and counts evaluations with the same operand
+    classes. After `threshold` of them it quickens into a single guarded
+    call, e.g. `operator.add` for two floats. A failed guard sends that
+    evaluation down the generic path, which raises the usual errors, and
+    starts the count again. The sites live in the interpreter rather than
+    on the nodes, so cached and shared trees are never modified.
+    """
+
+    def __init__(
+        self, stdout: TextIO | OutputSink = None, threshold: int = QUICKEN_AFTER
+    ) -> None:
+        super().__init__(stdout)
+        self._threshold = threshold
+        self._sites: dict[Binary, Site] = {}
+
+    def visit_binary(self, expr: Binary):
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        site = self._sites.get(expr)
+        if site is None:
+            site = self._sites[expr] = Site()
+        elif site.fast is not None:
+            if left.__class__ is site.left and right.__class__ is site.right:
+                return site.fast(left, right)
+            site.fast = None
+            site.deopts += 1
+        if site.deopts < MAX_DEOPTS:
+            self._observe(site, expr, left, right)
+        return self._binary(expr.operator, left, right)
+
+    def _observe(self, site: Site, expr: Binary, left: object, right: object):
+        left, right = left.__class__, right.__class__
+        if left is not site.left or right is not site.right:
+            site.left, site.right, site.hits = left, right, 1
+            return
+        site.hits += 1
+        if site.hits < self._threshold:
+            return
+        site.fast = fast_form(expr.operator.type, left, right)
+        if site.fast is None:
+            # These operands always take the generic path
+            site.deopts = MAX_DEOPTS
+
+    def release(self):
+        super().release()
+        self._sites.clear()
+
+    def quickened(self) -> dict[Binary, Callable]:
+        """The fast form of every node that currently has one."""
+        return {
+            expr: site.fast
+            for expr, site in self._sites.items()
+            if site.fast is not None
+        }
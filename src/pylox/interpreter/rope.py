@@ -0,0 +1,112 @@
+from __future__ import annotations
+from pylox.parser.expr import Binary, Literal
+
+# Shorter concatenations are cheaper to copy than to defer
+MIN_ROPE = 64
+
+
+class Rope:
+    """A string built by concatenation, joined only when it is needed.
+
+    The pieces live in a list shared by every rope grown from it: appending
+    to the newest rope extends the list in place, so `s = s + "x"` in a loop
+    is linear rather than quadratic. A rope that is no longer the newest
+    copies its own prefix before appending. Printing, comparing, hashing
+    or taking `str()` of a rope joins it once and keeps the result.
+    Ropes are never empty, so they are truthy just like non-empty strings.
+    """
+
+    __slots__ = ("_parts", "_count", "_length", "_flat")
+
+    def __init__(self, parts: list[str], length: int) -> None:
+        self._parts = parts
+        self._count = len(parts)
+        self._length = length
+        self._flat: str = None
+
+    def _extend(self, pieces: list[str], length: int) -> Rope:
+        parts = self._parts
+        if len(parts) != self._count:
+            parts = parts[: self._count]
+        parts.extend(pieces)
+        return Rope(parts, self._length + length)
+
+    def _pieces(self) -> list[str]:
+        if self._flat is not None:
+            return [self._flat]
+        return self._parts[: self._count]
+
+    def __str__(self) -> str:
+        if self._flat is None:
+            self._flat = "".join(self._parts[: self._count])
+        return self._flat
+
+    def __add__(self, other: object):
+        if isinstance(other, str):
+            return self._extend([other], len(other))
+        if isinstance(other, Rope):
+            return self._extend(other._pieces(), other._length)
+        # Fails exactly as it would for a plain string
+        return str(self) + other
+
+    def __radd__(self, other: object):
+        if isinstance(other, str):
+            return Rope([other, *self._pieces()], len(other) + self._length)
+        return other + str(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, Rope)):
+            return str(self) == str(other)
+        return False
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+    def __repr__(self) -> str:
+        return f"Rope({str(self)!r})"
+
+
+# Classes a Lox string value can have
+STRING_TYPES = (str, Rope)
+
+
+def add(left: object, right: object) -> object:
+    """Lox `+`: Python's `+`, except that long string results are ropes."""
+    if left.__class__ is str and right.__class__ is str:
+        length = len(left) + len(right)
+        if length >= MIN_ROPE:
+            return Rope([left, right], length)
+    return left + right
+
+
+def seal(value: str) -> object:
+    """`value` as a rope if it is long enough, so appending to it is cheap."""
+    if len(value) >= MIN_ROPE:
+        return Rope([value], len(value))
+    return value
+
+
+def flatten(value: object) -> object:
+    """`value`, with a rope turned into the string it stands for."""
+    return str(value) if value.__class__ is Rope else value
+
+
+def never_strings(expr: Binary) -> bool:
+    """Whether `expr`'s `+` can be compiled to Python's `+` as it is.
+
+    With a literal number, boolean or nil on either side, the operation
+    either adds numbers or fails, whichever `+` is used.
+    """
+    return any(
+        isinstance(side, Literal) and not isinstance(side.value, str)
+        for side in (expr.left, expr.right)
+    )
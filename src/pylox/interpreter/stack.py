@@ -0,0 +1,231 @@
+from __future__ import annotations
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    Var,
+    While,
+)
+from pylox.scanner.scanner import TokenType
+from .environment import SlotEnvironment
+from .interpreter import Interpreter, is_truthy
+from .quickening import EQUALITY_FORMS, NUMERIC_FORMS
+
+# Every binary operator, applied to two floats
+FLOAT_OPERATORS = {**NUMERIC_FORMS, **EQUALITY_FORMS}
+
+# Work items that finish a node once its operands are on the value stack.
+# Each is pushed right above the node it finishes.
+(
+    FINISH_BINARY,
+    FINISH_UNARY,
+    FINISH_ASSIGN,
+    FINISH_LOGICAL,
+    FINISH_CONDITIONAL,
+    FINISH_VAR,
+    FINISH_PRINT,
+    FINISH_IF,
+    FINISH_WHILE,
+    FINISH_FOR,
+    DISCARD,
+    RESTORE,
+) = range(12)
+
+
+class StackInterpreter(Interpreter):
+    """Tree-walker that keeps its own work stack instead of recursing.
+
+    Nodes are pushed on a work list; a node that needs its operands first
+    pushes itself and a `FINISH_*` tag, then the operands, and the tag
+    pops their values off the value stack once they are done. Nesting
+    depth is bounded by memory rather than Python's recursion limit, and
+    no Python frame is set up per node.
+
+    `For` loops run as written, without the `LoopPlan` hoisting of the
+    recursive engines, whose planning walks the loop recursively.
+    """
+
+    def execute(self, stmt: Stmt):
+        env = self._env
+        try:
+            self._run(stmt)
+        finally:
+            self._env = env
+
+    def _eval(self, expr: Expr) -> object:
+        return self._run(expr)
+
+    def _run(self, node: object) -> object:
+        work = [node]
+        values = []
+        push, pop = work.append, work.pop
+        push_value, pop_value = values.append, values.pop
+        local_slots = self._locals
+        unchecked = self._unchecked
+        float_operators = FLOAT_OPERATORS
+        globals = self._globals
+        env = self._env
+        while work:
+            item = pop()
+            cls = item.__class__
+            if cls is Variable:
+                loc = local_slots.get(item)
+                if loc is None:
+                    push_value(globals.get(item.name))
+                else:
+                    push_value(env.get_at(*loc))
+            elif cls is Literal:
+                push_value(item.value)
+            elif cls is Binary:
+                push(item)
+                push(FINISH_BINARY)
+                push(item.right)
+                push(item.left)
+            elif cls is int:
+                node = pop()
+                if item == FINISH_BINARY:
+                    right = pop_value()
+                    left = values[-1]
+                    operation = unchecked.get(node)
+                    if operation is None:
+                        if left.__class__ is not float or right.__class__ is not float:
+                            values[-1] = self._binary(node.operator, left, right)
+                            continue
+                        operation = float_operators[node.operator.type]
+                    values[-1] = operation(left, right)
+                elif item == FINISH_ASSIGN:
+                    loc = local_slots.get(node)
+                    if loc is None:
+                        globals.assign(node.name, values[-1])
+                    else:
+                        env.assign_at(*loc, values[-1])
+                elif item == DISCARD:
+                    pop_value()
+                elif item == RESTORE:
+                    env = self._env = node
+                elif item == FINISH_WHILE:
+                    if is_truthy(pop_value()):
+                        push(node)
+                        push(FINISH_WHILE)
+                        push(node.condition)
+                        push(node.stmt)
+                elif item == FINISH_FOR:
+                    if is_truthy(pop_value()):
+                        push(node)
+                        push(FINISH_FOR)
+                        push(node.condition)
+                        if node.increment is not None:
+                            push(None)
+                            push(DISCARD)
+                            push(node.increment)
+                        push(node.body)
+                elif item == FINISH_IF:
+                    if is_truthy(pop_value()):
+                        push(node.then_branch)
+                    elif node.else_branch is not None:
+                        push(node.else_branch)
+                elif item == FINISH_UNARY:
+                    operation = unchecked.get(node)
+                    if operation is not None:
+                        values[-1] = operation(values[-1])
+                    else:
+                        right = values[-1]
+                        self._check_number_operand(node.operator, right)
+                        if node.operator.type == TokenType.MINUS:
+                            values[-1] = -right
+                        else:
+                            values[-1] = not is_truthy(right)
+                elif item == FINISH_LOGICAL:
+                    left = values[-1]
+                    if is_truthy(left) != (node.operator.type == TokenType.OR):
+                        pop_value()
+                        push(node.right)
+                elif item == FINISH_CONDITIONAL:
+                    if is_truthy(pop_value()):
+                        push(node.then_branch)
+                    else:
+                        push(node.else_branch)
+                elif item == FINISH_PRINT:
+                    self._out.print(pop_value())
+                else:
+                    self._define(node, pop_value(), env)
+            elif cls is Assign:
+                push(item)
+                push(FINISH_ASSIGN)
+                push(item.expr)
+            elif cls is Grouping:
+                push(item.expression)
+            elif cls is Expression:
+                push(None)
+                push(DISCARD)
+                push(item.expression)
+            elif cls is Unary:
+                push(item)
+                push(FINISH_UNARY)
+                push(item.right)
+            elif cls is Logical:
+                push(item)
+                push(FINISH_LOGICAL)
+                push(item.left)
+            elif cls is Conditional:
+                push(item)
+                push(FINISH_CONDITIONAL)
+                push(item.condition)
+            elif cls is Block:
+                push(env)
+                push(RESTORE)
+                work.extend(reversed(item.statements))
+                env = self._env = SlotEnvironment(self._scope_sizes[item], env)
+            elif cls is Print:
+                push(None)
+                push(FINISH_PRINT)
+                push(item.expression)
+            elif cls is Var:
+                if item.init is None:
+                    self._define(item, None, env)
+                else:
+                    push(item)
+                    push(FINISH_VAR)
+                    push(item.init)
+            elif cls is If:
+                push(item)
+                push(FINISH_IF)
+                push(item.condition)
+            elif cls is While:
+                push(item)
+                push(FINISH_WHILE)
+                push(item.condition)
+            elif cls is For:
+                push(env)
+                push(RESTORE)
+                env = self._env = SlotEnvironment(self._scope_sizes[item], env)
+                push(item)
+                push(FINISH_FOR)
+                push(item.condition)
+                if item.init is not None:
+                    push(item.init)
+            else:
+                # Nodes added by later passes fall back to their visitor
+                push_value(item.accept(self))
+        return values[-1] if values else None
+
+    def _define(self, stmt: Var, value: object, env: SlotEnvironment):
+        loc = self._locals.get(stmt)
+        if loc is None:
+            self._globals.define(stmt.name.lexeme, value)
+        else:
+            env.define(loc[1], value)
@@ -1,8 +1,30 @@
+import argparse
+import functools
+import os
 import sys
-from interpreter.interpreter import Interpreter, RuntimeError
+from pylox.cache.cache import CACHE_DIR, CACHE_SIZE, Artifact, ArtifactCache
+from pylox.engines import ENGINES
+from pylox.inference.inference import TypeInference
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.metrics import MeteredInterpreter, Metrics
+from pylox.interpreter.output import FLUSH_LINES, SINKS, OutputSink
+from pylox.interpreter.profiler import Profile, ProfilingInterpreter
+from pylox.optimizer.optimizer import OPT_LEVELS, Optimizer
+from pylox.repl.session import Session
+from pylox.stream.runner import StreamRunner
 
 import pylox.scanner.scanner as s
-from pylox.parser.parser import Parser
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.stream_scanner import CHUNK_SIZE
+from pylox.parser.stack_parser import StackParser
+from pylox.resolver.resolver import Resolver
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str):
+        self.print_usage(sys.stderr)
+        print(f"{self.prog}: error: {message}", file=sys.stderr)
+        sys.exit(64)
 
 
 class Lox:
@@ -10,24 +32,99 @@ class Lox:
     had_runtime_error = False
 
     @classmethod
-    def run(cls, source: str):
-        scanner = s.Scanner(source)
+    def analyze(cls, source: str) -> Artifact:
+        scanner = FastScanner(source)
 
-        tokens = scanner.scan_tokens()
+        tokens = scanner.scan_buffer()
         for err in scanner.errors:
             Lox.error(err.line, err.msg)
-        parser = Parser(tokens)
+        parser = StackParser(tokens)
         stmts = parser.parse()
         for err in parser.errors:
             Lox.parse_error(err.token, err.msg)
 
         if cls.had_error:
             return None
+        resolver = Resolver()
+        resolver.resolve(stmts)
+        for err in resolver.errors:
+            Lox.parse_error(err.token, err.msg)
+
+        if cls.had_error:
+            return None
+        return Artifact(stmts, resolver)
+
+    @classmethod
+    def run(
+        cls,
+        source: str,
+        engine: str = "tree",
+        opt_level: int = 0,
+        opt_report: bool = False,
+        cache: ArtifactCache = None,
+        profile: bool = False,
+        profile_stacks: str = None,
+        metrics: str = None,
+        output: OutputSink = None,
+        infer_types: bool = False,
+        type_check: bool = False,
+    ):
+        artifact = cache.load(source) if cache is not None else None
+        if artifact is None:
+            artifact = cls.analyze(source)
+            if artifact is None:
+                return None
+            if cache is not None:
+                cache.store(source, artifact)
+        stmts, resolver = artifact.stmts, artifact.resolver
+        if opt_level:
+            optimizer = Optimizer.for_level(opt_level)
+            stmts = optimizer.optimize(stmts, resolver)
+            if opt_report:
+                print(optimizer.format_report(), file=sys.stderr)
+        inference = None
+        if infer_types or type_check:
+            inference = TypeInference()
+            inference.infer(stmts)
+            if type_check and inference.errors:
+                for err in inference.errors:
+                    Lox.parse_error(err.token, err.msg)
+                return None
+        if profile:
+            interpreter = ProfilingInterpreter(output)
+        elif metrics is not None:
+            interpreter = MeteredInterpreter(output)
+        else:
+            interpreter = ENGINES[engine](output)
+        if isinstance(interpreter, Interpreter):
+            interpreter.resolve(resolver)
+            if inference is not None:
+                interpreter.use_types(inference)
         try:
-            Interpreter().interpret(stmts)
+            interpreter.interpret(stmts)
         except RuntimeError as e:
             Lox.runtime_error(e)
             sys.exit(70)
+        finally:
+            if profile:
+                Lox.report_profile(interpreter.profile, profile_stacks)
+            elif metrics is not None:
+                Lox.report_metrics(interpreter.metrics, metrics)
+
+    @classmethod
+    def report_profile(cls, profile: Profile, stacks_path: str = None):
+        print(profile.format_report(), file=sys.stderr)
+        if stacks_path is not None:
+            with open(stacks_path, "w") as f_out:
+                f_out.write(profile.collapsed_stacks())
+
+    @classmethod
+    def report_metrics(cls, metrics: Metrics, path: str):
+        if path == "-":
+            print(metrics.to_json(), file=sys.stderr)
+            return
+        with open(path, "w") as f_out:
+            f_out.write(metrics.to_json())
 
     @classmethod
     def runtime_error(cls, e: RuntimeError):
@@ -35,33 +132,216 @@ class Lox:
         print(f"{e.msg}\n[line {e.token.line}]", file=sys.stderr)
 
     @classmethod
-    def run_file(cls, path: str):
+    def nesting_error(cls):
+        # Parsing and resolving never recurse, but the other passes and
+        # engines do
+        print(
+            "Program nested too deeply; run it with --engine=stack and "
+            "--opt-level=0.",
+            file=sys.stderr,
+        )
+        sys.exit(70)
+
+    @classmethod
+    def run_file(cls, path: str, **options):
+        print(f"Running in path {path}")
+        with open(path, "r") as f_in:
+            try:
+                Lox.run(f_in.read(), **options)
+            except RecursionError:
+                Lox.nesting_error()
+        if cls.had_error:
+            print("ERR!")
+            sys.exit(65)
+
+    @classmethod
+    def run_stream(
+        cls,
+        path: str,
+        engine: str = "tree",
+        opt_level: int = 0,
+        output: OutputSink = None,
+    ):
         print(f"Running in path {path}")
+        runner = StreamRunner(engine, opt_level, output)
         with open(path, "r") as f_in:
-            Lox.run(f_in.read())
+            try:
+                runner.run(iter(functools.partial(f_in.read, CHUNK_SIZE), ""))
+            except RecursionError:
+                Lox.nesting_error()
+        Lox.report_errors(runner.errors)
+        if cls.had_runtime_error:
+            sys.exit(70)
         if cls.had_error:
             print("ERR!")
             sys.exit(65)
 
     @classmethod
-    def run_prompt(cls):
+    def run_prompt(
+        cls, engine: str = "tree", opt_level: int = 0, output: OutputSink = None
+    ):
+        session = Session(engine, opt_level, output)
+        prompt = "> "
         while True:
-            print("> ", end="")
-            line = input()
-            if not line:
+            print(prompt, end="")
+            try:
+                line = input()
+            except EOFError:
                 break
-            Lox.run(line)
+            if not line and not session.pending:
+                break
+            more = session.feed(line)
+            Lox.report_errors(session.errors)
             cls.had_error = False
+            prompt = ".. " if more else "> "
+
+    @classmethod
+    def report_errors(cls, errors: list[Exception]):
+        for err in errors:
+            if isinstance(err, RuntimeError):
+                Lox.runtime_error(err)
+            elif isinstance(err, s.ScanningError):
+                Lox.error(err.line, err.msg)
+            else:
+                Lox.parse_error(err.token, err.msg)
 
     @classmethod
     def main(cls):
-        if len(sys.argv) > 2:
-            print("Usage: pylox [script]")
-            sys.exit(64)
-        elif len(sys.argv) == 2:
-            Lox.run_file(sys.argv[-1])
+        if sys.argv[1:2] == ["batch"]:
+            # Imported here: the batch runner itself drives Lox
+            from pylox.batch.runner import main
+
+            main(sys.argv[2:])
+            return
+        if sys.argv[1:2] == ["serve"]:
+            from pylox.server.server import main
+
+            main(sys.argv[2:])
+            return
+        parser = ArgumentParser(prog="pylox")
+        parser.add_argument("script", nargs="?")
+        parser.add_argument("--engine", choices=list(ENGINES), default="tree")
+        parser.add_argument(
+            "--opt-level", type=int, choices=list(OPT_LEVELS), default=0
+        )
+        parser.add_argument(
+            "--opt-report",
+            action="store_true",
+            help="print how many AST nodes each optimizer pass removed",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            help=f"where compiled scripts are cached (default: {CACHE_DIR} "
+            "next to the script)",
+        )
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=CACHE_SIZE,
+            help="evict least recently used entries above this many bytes",
+        )
+        parser.add_argument("--no-cache", action="store_true")
+        parser.add_argument(
+            "--infer-types",
+            action="store_true",
+            help="skip the operand checks that type inference proves redundant "
+            "(tree and closure engines)",
+        )
+        parser.add_argument(
+            "--type-check",
+            action="store_true",
+            help="report operators whose operands can never be numbers as "
+            "errors before running",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="run each top-level declaration as soon as it is read, in "
+            "constant memory; errors stop the script where they occur",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="print the hottest nodes and lines to stderr (tree engine only)",
+        )
+        parser.add_argument(
+            "--profile-stacks",
+            metavar="PATH",
+            help="also write collapsed node stacks for flamegraph tools",
+        )
+        parser.add_argument(
+            "--metrics",
+            metavar="PATH",
+            help="write interpreter counters as JSON at exit, '-' for stderr "
+            "(tree engine only)",
+        )
+        parser.add_argument(
+            "--output-buffering",
+            choices=["auto", *SINKS],
+            default="auto",
+            help="how printed lines are buffered (default: line-buffered on a "
+            "terminal, block-buffered otherwise)",
+        )
+        parser.add_argument(
+            "--flush-lines",
+            type=int,
+            default=FLUSH_LINES,
+            help="lines per write when block-buffered",
+        )
+        args = parser.parse_args()
+        profile = args.profile or args.profile_stacks is not None
+        if profile and args.engine != "tree":
+            parser.error("--profile requires --engine=tree")
+        if args.metrics is not None and args.engine != "tree":
+            parser.error("--metrics requires --engine=tree")
+        if profile and args.metrics is not None:
+            parser.error("--profile and --metrics cannot be combined")
+        if args.stream and args.script is None:
+            parser.error("--stream requires a script")
+        if args.stream and (
+            profile or args.metrics is not None or args.infer_types or args.type_check
+        ):
+            parser.error(
+                "--stream cannot be combined with --profile, --metrics, "
+                "--infer-types or --type-check"
+            )
+        if args.script is None and (
+            args.opt_report
+            or profile
+            or args.metrics is not None
+            or args.infer_types
+            or args.type_check
+        ):
+            parser.error(
+                "--opt-report, --profile, --metrics, --infer-types and "
+                "--type-check require a script"
+            )
+        options = dict(
+            engine=args.engine, opt_level=args.opt_level, opt_report=args.opt_report
+        )
+        if args.infer_types or args.type_check:
+            options.update(infer_types=args.infer_types, type_check=args.type_check)
+        if profile:
+            options.update(profile=True, profile_stacks=args.profile_stacks)
+        if args.metrics is not None:
+            options["metrics"] = args.metrics
+        if args.output_buffering == "block":
+            options["output"] = SINKS["block"](lines=args.flush_lines)
+        elif args.output_buffering == "line":
+            options["output"] = SINKS["line"]()
+        if args.stream:
+            Lox.run_stream(
+                args.script, args.engine, args.opt_level, options.get("output")
+            )
+        elif args.script is not None:
+            if not args.no_cache:
+                directory = args.cache_dir or os.path.join(
+                    os.path.dirname(os.path.abspath(args.script)), CACHE_DIR
+                )
+                options["cache"] = ArtifactCache(directory, args.cache_size)
+            Lox.run_file(args.script, **options)
         else:
-            Lox.run_prompt()
+            Lox.run_prompt(args.engine, args.opt_level, options.get("output"))
 
     @classmethod
     def error(cls, line: int, message: str):
@@ -0,0 +1,349 @@
+from __future__ import annotations
+import operator
+from pylox.interpreter.interpreter import is_truthy
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from pylox.resolver.resolver import Resolver, copy_bound
+from pylox.scanner.scanner import TokenType
+
+
+class AstPass(ExprVisitor, StmtVisitor):
+    """Base for passes that rewrite the statement list after resolution.
+
+    Visits return the node that replaces the visited one; a statement visit
+    may return None to remove the statement. Nodes are never modified,
+    since cached trees are shared: a node whose children change is copied,
+    and the copy takes over the slot or scope size the `Resolver` bound to
+    the original.
+    """
+
+    name = ""
+
+    def run(self, stmts: list[Stmt], resolver: Resolver = None) -> list[Stmt]:
+        self._locals = resolver.locals if resolver is not None else {}
+        self._scope_sizes = resolver.scope_sizes if resolver is not None else {}
+        return self._statements(stmts)
+
+    def _copy(self, node, **fields):
+        return copy_bound(node, (self._locals, self._scope_sizes), **fields)
+
+    def _statements(self, stmts: list[Stmt]) -> list[Stmt]:
+        ret = []
+        for stmt in stmts:
+            stmt = stmt.accept(self)
+            if stmt is not None:
+                ret.append(stmt)
+        if len(ret) == len(stmts) and all(map(operator.is_, ret, stmts)):
+            return stmts
+        return ret
+
+    def _branch(self, stmt: Stmt) -> Stmt:
+        stmt = stmt.accept(self)
+        # A removed loop body or then-branch still needs a statement
+        return stmt if stmt is not None else Expression(Literal(None))
+
+    def visit_expression(self, stmt: Expression):
+        return self._copy(stmt, expression=stmt.expression.accept(self))
+
+    def visit_print(self, stmt: Print):
+        return self._copy(stmt, expression=stmt.expression.accept(self))
+
+    def visit_var(self, stmt: Var):
+        if stmt.init is None:
+            return stmt
+        return self._copy(stmt, init=stmt.init.accept(self))
+
+    def visit_block(self, stmt: Block):
+        return self._copy(stmt, statements=self._statements(stmt.statements))
+
+    def visit_if(self, stmt: If):
+        else_branch = stmt.else_branch
+        if else_branch is not None:
+            else_branch = else_branch.accept(self)
+        return self._copy(
+            stmt,
+            condition=stmt.condition.accept(self),
+            then_branch=self._branch(stmt.then_branch),
+            else_branch=else_branch,
+        )
+
+    def visit_while(self, stmt: While):
+        return self._copy(
+            stmt,
+            condition=stmt.condition.accept(self),
+            stmt=self._branch(stmt.stmt),
+        )
+
+    def visit_for(self, stmt: For):
+        init, increment = stmt.init, stmt.increment
+        if init is not None:
+            init = init.accept(self)
+        condition = stmt.condition.accept(self)
+        if increment is not None:
+            increment = increment.accept(self)
+        return self._copy(
+            stmt,
+            init=init,
+            condition=condition,
+            increment=increment,
+            body=self._branch(stmt.body),
+        )
+
+    def visit_assign(self, expr: Assign):
+        return self._copy(expr, expr=expr.expr.accept(self))
+
+    def visit_binary(self, expr: Binary):
+        return self._copy(
+            expr, left=expr.left.accept(self), right=expr.right.accept(self)
+        )
+
+    def visit_conditional(self, expr: Conditional):
+        return self._copy(
+            expr,
+            condition=expr.condition.accept(self),
+            then_branch=expr.then_branch.accept(self),
+            else_branch=expr.else_branch.accept(self),
+        )
+
+    def visit_logical(self, expr: Logical):
+        return self._copy(
+            expr, left=expr.left.accept(self), right=expr.right.accept(self)
+        )
+
+    def visit_unary(self, expr: Unary):
+        return self._copy(expr, right=expr.right.accept(self))
+
+    def visit_grouping(self, expr: Grouping):
+        return self._copy(expr, expression=expr.expression.accept(self))
+
+    def visit_literal(self, expr: Literal):
+        return expr
+
+    def visit_variable(self, expr: Variable):
+        return expr
+
+
+def _literal(expr: Expr):
+    while isinstance(expr, Grouping):
+        expr = expr.expression
+    return expr if isinstance(expr, Literal) else None
+
+
+class FoldConstants(AstPass):
+    """Evaluates operators over literals, leaving anything that would raise."""
+
+    name = "fold-constants"
+
+    def visit_grouping(self, expr: Grouping):
+        expr = super().visit_grouping(expr)
+        literal = _literal(expr)
+        return literal if literal is not None else expr
+
+    def visit_unary(self, expr: Unary):
+        expr = super().visit_unary(expr)
+        right = _literal(expr.right)
+        if right is None or not isinstance(right.value, float):
+            return expr
+        if expr.operator.type == TokenType.MINUS:
+            return Literal(-right.value)
+        return Literal(right.value == 0)
+
+    def visit_binary(self, expr: Binary):
+        type = expr.operator.type
+        expr = super().visit_binary(expr)
+        left, right = _literal(expr.left), _literal(expr.right)
+        if left is None or right is None:
+            return expr
+        a, b = left.value, right.value
+        if type == TokenType.EQUAL_EQUAL:
+            return Literal(a == b)
+        if type == TokenType.BANG_EQUAL:
+            return Literal(a != b)
+        if type == TokenType.PLUS and isinstance(a, str) and isinstance(b, str):
+            return Literal(a + b)
+        if not (isinstance(a, float) and isinstance(b, float)):
+            return expr
+        if type == TokenType.PLUS:
+            return Literal(a + b)
+        if type == TokenType.MINUS:
+            return Literal(a - b)
+        if type == TokenType.STAR:
+            return Literal(a * b)
+        if type == TokenType.SLASH and b != 0:
+            return Literal(a / b)
+        if type == TokenType.GREATER:
+            return Literal(a > b)
+        if type == TokenType.GREATER_EQUAL:
+            return Literal(a >= b)
+        if type == TokenType.LESS:
+            return Literal(a < b)
+        if type == TokenType.LESS_EQUAL:
+            return Literal(a <= b)
+        return expr
+
+    def visit_conditional(self, expr: Conditional):
+        expr = super().visit_conditional(expr)
+        cond = _literal(expr.condition)
+        if cond is None:
+            return expr
+        return expr.then_branch if is_truthy(cond.value) else expr.else_branch
+
+    def visit_logical(self, expr: Logical):
+        expr = super().visit_logical(expr)
+        left = _literal(expr.left)
+        if left is None:
+            return expr
+        # `or` stops at a truthy left operand, `and` at a falsy one
+        if is_truthy(left.value) == (expr.operator.type == TokenType.OR):
+            return left
+        return expr.right
+
+
+class UnwrapGroupings(AstPass):
+    name = "unwrap-groupings"
+
+    def visit_grouping(self, expr: Grouping):
+        return expr.expression.accept(self)
+
+
+class DeadBranches(AstPass):
+    name = "dead-branches"
+
+    def visit_if(self, stmt: If):
+        stmt = super().visit_if(stmt)
+        cond = _literal(stmt.condition)
+        if cond is None:
+            return stmt
+        return stmt.then_branch if is_truthy(cond.value) else stmt.else_branch
+
+
+class DeadLoops(AstPass):
+    name = "dead-loops"
+
+    def visit_while(self, stmt: While):
+        stmt = super().visit_while(stmt)
+        cond = _literal(stmt.condition)
+        if cond is not None and not is_truthy(cond.value):
+            return None
+        return stmt
+
+    def visit_for(self, stmt: For):
+        stmt = super().visit_for(stmt)
+        cond = _literal(stmt.condition)
+        if cond is None or is_truthy(cond.value):
+            return stmt
+        if stmt.init is None:
+            return None
+        # The initializer still runs, in the scope the Resolver gave it
+        return self._copy(stmt, increment=None, body=Expression(Literal(None)))
+
+
+def _is_pure(expr: Expr, locals: dict[object, tuple[int, int]]) -> bool:
+    """Whether evaluating `expr` can neither raise nor change state.
+
+    Only reads of locals count as pure: a global the `Resolver` accepted
+    may still be undefined, e.g. when the REPL input declaring it failed.
+    """
+    if isinstance(expr, Literal):
+        return True
+    if isinstance(expr, Variable):
+        return expr in locals
+    if isinstance(expr, Grouping):
+        return _is_pure(expr.expression, locals)
+    if isinstance(expr, Conditional):
+        parts = (expr.condition, expr.then_branch, expr.else_branch)
+        return all(_is_pure(part, locals) for part in parts)
+    if isinstance(expr, Logical):
+        return _is_pure(expr.left, locals) and _is_pure(expr.right, locals)
+    if isinstance(expr, Binary):
+        type = expr.operator.type
+        if type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            return _is_pure(expr.left, locals) and _is_pure(expr.right, locals)
+    return False
+
+
+class PureStatements(AstPass):
+    name = "pure-statements"
+
+    def visit_expression(self, stmt: Expression):
+        stmt = super().visit_expression(stmt)
+        return None if _is_pure(stmt.expression, self._locals) else stmt
+
+
+PASSES = {
+    pass_.name: pass_
+    for pass_ in (
+        FoldConstants,
+        UnwrapGroupings,
+        DeadBranches,
+        DeadLoops,
+        PureStatements,
+    )
+}
+
+OPT_LEVELS = {
+    0: (),
+    1: ("fold-constants", "unwrap-groupings"),
+    2: tuple(PASSES),
+}
+
+
+def count_nodes(node: object) -> int:
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if not isinstance(node, (Expr, Stmt)):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, field)) for field in node.__slots__)
+
+
+class Optimizer:
+    def __init__(self, passes: tuple[str, ...]) -> None:
+        self._passes = [PASSES[name]() for name in passes]
+        self.report: list[tuple[str, int]] = []
+
+    @classmethod
+    def for_level(cls, level: int) -> Optimizer:
+        return cls(OPT_LEVELS[level])
+
+    def optimize(self, stmts: list[Stmt], resolver: Resolver = None) -> list[Stmt]:
+        """Runs every pass over `stmts`, which are left as they are.
+
+        The copies the passes make are bound in `resolver`, which resolved
+        `stmts`. Without it, reads of variables are never removed.
+        """
+        before = count_nodes(stmts)
+        for pass_ in self._passes:
+            stmts = pass_.run(stmts, resolver)
+            after = count_nodes(stmts)
+            self.report.append((pass_.name, before - after))
+            before = after
+        return stmts
+
+    def format_report(self) -> str:
+        lines = [
+            f"{name:>18}: {removed} nodes removed" for name, removed in self.report
+        ]
+        total = sum(removed for _, removed in self.report)
+        lines.append(f"{'total':>18}: {total} nodes removed")
+        return "\n".join(lines)
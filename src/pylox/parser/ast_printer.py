@@ -1,24 +1,49 @@
 from cmath import exp
-from pylox.parser.expr import Expr, Binary, ExprVisitor, Grouping, Literal, Unary
+from pylox.parser.expr import (
+    Expr,
+    Binary,
+    Conditional,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+)
 
 
 class AstPrinter(ExprVisitor):
-    def print(self, expr: Expr) -> str:
-        return expr.accept(self)
+    """Prints expressions in prefix form, e.g. `(* (- 123) (group 45.67))`.
+
+    Each visit returns either the text of a leaf or a (name, operands)
+    pair; `print` lays those out with its own stack, so nesting depth is
+    not limited by recursion.
+    """
 
-    def paranthesis(self, name: str, *exprs: Expr) -> str:
-        ret = [f"({name}"]
-        for expr in exprs:
-            ret.append(" ")
-            ret.append(expr.accept(self))
-        ret.append(")")
-        return "".join(ret)
+    def print(self, expr: Expr) -> str:
+        out = []
+        work: list[object] = [expr]
+        while work:
+            item = work.pop()
+            if item.__class__ is str:
+                out.append(item)
+                continue
+            shape = item.accept(self)
+            if shape.__class__ is str:
+                out.append(shape)
+                continue
+            name, operands = shape
+            out.append(f"({name}")
+            work.append(")")
+            for operand in reversed(operands):
+                work.append(operand)
+                work.append(" ")
+        return "".join(out)
 
     def visit_unary(self, expr: Unary):
-        return self.paranthesis(expr.operator.lexeme, expr.right)
+        return expr.operator.lexeme, (expr.right,)
 
     def visit_grouping(self, expr: Grouping):
-        return self.paranthesis("group", expr.expression)
+        return "group", (expr.expression,)
 
     def visit_literal(self, expr: Literal):
         if expr.value == None:
@@ -26,4 +51,10 @@ class AstPrinter(ExprVisitor):
         return str(expr.value)
 
     def visit_binary(self, expr: Binary):
-        return self.paranthesis(expr.operator.lexeme, expr.left, expr.right)
+        return expr.operator.lexeme, (expr.left, expr.right)
+
+    def visit_logical(self, expr: Logical):
+        return expr.operator.lexeme, (expr.left, expr.right)
+
+    def visit_conditional(self, expr: Conditional):
+        return "?:", (expr.condition, expr.then_branch, expr.else_branch)
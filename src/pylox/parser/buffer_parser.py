@@ -0,0 +1,40 @@
+from __future__ import annotations
+from pylox.parser.parser import Parser
+from pylox.scanner.scanner import Token, TokenType
+from pylox.scanner.token_buffer import EOF, KINDS, TokenBuffer
+
+
+class BufferParser(Parser):
+    """`Parser` that reads token kinds straight from a `TokenBuffer`.
+
+    Lookahead compares kind codes only; a `Token` is built just for the
+    tokens the AST keeps (names, operators, literals) and for errors.
+    """
+
+    def __init__(self, buffer: TokenBuffer) -> None:
+        super().__init__(buffer)
+        self._kinds = buffer.kinds
+
+    def _advance(self) -> None:
+        if self._kinds[self.current] != EOF:
+            self.current += 1
+
+    def _match(self, *token_types: TokenType) -> bool:
+        kind = self._kinds[self.current]
+        if kind != EOF and KINDS[kind] in token_types:
+            self.current += 1
+            return True
+        return False
+
+    def _consume(self, type: TokenType, msg: str) -> Token:
+        if self._check(type):
+            self._advance()
+            return self._previous()
+        raise self._error(self._peek(), msg)
+
+    def _check(self, type: TokenType) -> bool:
+        kind = self._kinds[self.current]
+        return KINDS[kind] is type and kind != EOF
+
+    def _is_at_end(self) -> bool:
+        return self._kinds[self.current] == EOF
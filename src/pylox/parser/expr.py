@@ -1,16 +1,19 @@
 # This file is auto generated
 from __future__ import annotations
-from abc import ABCMeta
 
 from pylox.scanner.scanner import Token
 
 
-class Expr(metaclass=ABCMeta):
+class Expr:
+    __slots__ = ()
+
     def accept(self, visitor: ExprVisitor):
         pass
 
 
 class Assign(Expr):
+    __slots__ = ("name", "expr")
+
     def __init__(self, name: Token, expr: Expr):
         self.name = name
         self.expr = expr
@@ -20,6 +23,8 @@ class Assign(Expr):
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -29,7 +34,21 @@ class Binary(Expr):
         return visitor.visit_binary(self)
 
 
+class Conditional(Expr):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
+    def __init__(self, condition: Expr, then_branch: Expr, else_branch: Expr):
+        self.condition = condition
+        self.then_branch = then_branch
+        self.else_branch = else_branch
+
+    def accept(self, visitor: ExprVisitor):
+        return visitor.visit_conditional(self)
+
+
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -38,6 +57,8 @@ class Grouping(Expr):
 
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: object):
         self.value = value
 
@@ -45,7 +66,21 @@ class Literal(Expr):
         return visitor.visit_literal(self)
 
 
+class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
+    def __init__(self, left: Expr, operator: Token, right: Expr):
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def accept(self, visitor: ExprVisitor):
+        return visitor.visit_logical(self)
+
+
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
@@ -55,6 +90,8 @@ class Unary(Expr):
 
 
 class Variable(Expr):
+    __slots__ = ("name",)
+
     def __init__(self, name: Token):
         self.name = name
 
@@ -62,19 +99,25 @@ class Variable(Expr):
         return visitor.visit_variable(self)
 
 
-class ExprVisitor(metaclass=ABCMeta):
+class ExprVisitor:
     def visit_assign(self, expr: Assign):
         pass
 
     def visit_binary(self, expr: Binary):
         pass
 
+    def visit_conditional(self, expr: Conditional):
+        pass
+
     def visit_grouping(self, expr: Grouping):
         pass
 
     def visit_literal(self, expr: Literal):
         pass
 
+    def visit_logical(self, expr: Logical):
+        pass
+
     def visit_unary(self, expr: Unary):
         pass
 
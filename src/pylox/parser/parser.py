@@ -1,6 +1,16 @@
 from __future__ import annotations
-from parser.stmt import Block, If, Stmt, Print, Expression, Var, While
-from pylox.parser.expr import Assign, Binary, Expr, Grouping, Literal, Unary, Variable
+from pylox.parser.stmt import Block, For, If, Stmt, Print, Expression, Var, While
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
 from pylox.scanner.scanner import Token, TokenType
 
 
@@ -135,15 +145,30 @@ class Parser:
             expr = Binary(expr, opr, right)
         return expr
 
-    def _ternary(self) -> Expr:
-        """tenary -> equality ? equality : ternary | equality"""
+    def _and(self) -> Expr:
         expr = self._equality()
-        if self._match(TokenType.QUESTION_MARK):
+        while self._match(TokenType.AND):
+            opr = self._previous()
+            right = self._equality()
+            expr = Logical(expr, opr, right)
+        return expr
+
+    def _or(self) -> Expr:
+        expr = self._and()
+        while self._match(TokenType.OR):
             opr = self._previous()
-            first = self._equality()
-            colon = self._consume(TokenType.COLON, "Expected colon!")
+            right = self._and()
+            expr = Logical(expr, opr, right)
+        return expr
+
+    def _ternary(self) -> Expr:
+        """tenary -> or ? or : ternary | or"""
+        expr = self._or()
+        if self._match(TokenType.QUESTION_MARK):
+            first = self._or()
+            self._consume(TokenType.COLON, "Expected colon!")
             second = self._ternary()
-            return Binary(expr, opr, Binary(first, colon, second))
+            return Conditional(expr, first, second)
         return expr
 
     def _assignment(self) -> Expr:
@@ -191,10 +216,12 @@ class Parser:
             return self._for_statement()
         return self._expression_statement()
 
-    def _for_statement(self):
+    def _for_clauses(self) -> tuple[Stmt, Expr, Expr]:
         self._consume(TokenType.LEFT_PAREN, "Expect '(' after for")
         init: Stmt = None
-        if self._match(TokenType.VAR):
+        if self._match(TokenType.SEMICOLON):
+            pass
+        elif self._match(TokenType.VAR):
             init = self._var_declaration()
         else:
             init = self._expression_statement()
@@ -203,30 +230,37 @@ class Parser:
             condition = self._expression()
         self._consume(TokenType.SEMICOLON, "Expect ';' after loop condition.")
         increment: Expr = None
-        if not self._check(TokenType.SEMICOLON):
+        if not self._check(TokenType.RIGHT_PAREN):
             increment = self._expression()
         self._consume(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
-        body = self._statement()
-        if increment is not None:
-            body = Block(statements=[body, increment])
         if condition is None:
-            condition == Literal(True)
-        body = While(condition, body)
-        if init is not None:
-            body = Block(statements=[init, body])
-        return body
+            condition = Literal(True)
+        return init, condition, increment
 
-    def _while_statement(self):
+    def _for_statement(self):
+        init, condition, increment = self._for_clauses()
+        body = self._statement()
+        return For(init, condition, increment, body)
+
+    def _while_condition(self) -> Expr:
         self._consume(TokenType.LEFT_PAREN, "Expect '(' after while")
         expr = self._expression()
         self._consume(TokenType.RIGHT_PAREN, "Expect ')' after while condition.")
+        return expr
+
+    def _while_statement(self):
+        expr = self._while_condition()
         body = self._statement()
         return While(expr, body)
 
-    def _if_statement(self):
+    def _if_condition(self) -> Expr:
         self._consume(TokenType.LEFT_PAREN, "Expect '(' after if.")
         condition = self._expression()
         self._consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
+        return condition
+
+    def _if_statement(self):
+        condition = self._if_condition()
         then_stmt = self._statement()
         else_stmt = None
         if self._match(TokenType.ELSE):
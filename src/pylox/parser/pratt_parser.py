@@ -0,0 +1,163 @@
+from __future__ import annotations
+from enum import IntEnum
+from pylox.parser.buffer_parser import BufferParser
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.scanner.scanner import TokenType
+from pylox.scanner.token_buffer import KINDS, TokenBuffer
+
+
+class Precedence(IntEnum):
+    ASSIGNMENT = 1
+    TERNARY = 2
+    OR = 3
+    AND = 4
+    EQUALITY = 5
+    COMPARISON = 6
+    TERM = 7
+    FACTOR = 8
+    UNARY = 9
+
+
+# Token type -> name of the method parsing an expression that starts with it
+PREFIX_RULES = {
+    TokenType.FALSE: "_constant",
+    TokenType.TRUE: "_constant",
+    TokenType.NIL: "_constant",
+    TokenType.NUMBER: "_literal",
+    TokenType.STRING: "_literal",
+    TokenType.LEFT_PAREN: "_grouping",
+    TokenType.IDENTIFIER: "_variable",
+    TokenType.MINUS: "_unary",
+    TokenType.BANG: "_unary",
+}
+
+# Token type -> (precedence, name of the method parsing the rest of the
+# expression once the left operand is known)
+INFIX_RULES = {
+    TokenType.EQUAL: (Precedence.ASSIGNMENT, "_assign"),
+    TokenType.QUESTION_MARK: (Precedence.TERNARY, "_ternary"),
+    TokenType.OR: (Precedence.OR, "_logical"),
+    TokenType.AND: (Precedence.AND, "_logical"),
+    TokenType.BANG_EQUAL: (Precedence.EQUALITY, "_binary"),
+    TokenType.EQUAL_EQUAL: (Precedence.EQUALITY, "_binary"),
+    TokenType.GREATER: (Precedence.COMPARISON, "_binary"),
+    TokenType.GREATER_EQUAL: (Precedence.COMPARISON, "_binary"),
+    TokenType.LESS: (Precedence.COMPARISON, "_binary"),
+    TokenType.LESS_EQUAL: (Precedence.COMPARISON, "_binary"),
+    TokenType.PLUS: (Precedence.TERM, "_binary"),
+    TokenType.MINUS: (Precedence.TERM, "_binary"),
+    TokenType.STAR: (Precedence.FACTOR, "_binary"),
+    TokenType.SLASH: (Precedence.FACTOR, "_binary"),
+}
+
+CONSTANTS = {TokenType.FALSE: False, TokenType.TRUE: True, TokenType.NIL: None}
+
+
+class PrattParser(BufferParser):
+    """`BufferParser` whose expressions are parsed by precedence climbing.
+
+    Each operand costs one lookup in the rule tables, indexed by token kind
+    code, instead of a descent through one method per precedence level.
+    Produces the same trees and errors as `Parser`.
+    """
+
+    def __init__(self, buffer: TokenBuffer) -> None:
+        super().__init__(buffer)
+        self._prefix = PREFIX
+        self._infix = INFIX
+
+    def _expression(self) -> Expr:
+        return self._parse_precedence(Precedence.ASSIGNMENT)
+
+    def _parse_precedence(self, precedence: int) -> Expr:
+        kinds = self._kinds
+        prefix = self._prefix[kinds[self.current]]
+        if prefix is None:
+            raise self._error(self._peek(), "Expected expression!")
+        left = prefix(self)
+        infix = self._infix
+        while True:
+            rule = infix[kinds[self.current]]
+            if rule is None or rule[0] < precedence:
+                return left
+            left = rule[1](self, left)
+
+    def _constant(self) -> Expr:
+        self.current += 1
+        return Literal(CONSTANTS[KINDS[self._kinds[self.current - 1]]])
+
+    def _literal(self) -> Expr:
+        self.current += 1
+        return Literal(self.tokens.literal(self.current - 1))
+
+    def _grouping(self) -> Expr:
+        self.current += 1
+        expr = self._expression()
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after an expression")
+        return Grouping(expr)
+
+    def _variable(self) -> Expr:
+        self.current += 1
+        return Variable(self.tokens[self.current - 1])
+
+    def _unary(self) -> Expr:
+        operator = self.current
+        self.current += 1
+        right = self._parse_precedence(Precedence.UNARY)
+        return Unary(self.tokens[operator], right)
+
+    def _binary(self, left: Expr) -> Expr:
+        operator = self.current
+        self.current += 1
+        # Left-associative: the right operand binds one level tighter
+        precedence = self._infix[self._kinds[operator]][0]
+        right = self._parse_precedence(precedence + 1)
+        return Binary(left, self.tokens[operator], right)
+
+    def _logical(self, left: Expr) -> Expr:
+        operator = self.current
+        self.current += 1
+        precedence = self._infix[self._kinds[operator]][0]
+        right = self._parse_precedence(precedence + 1)
+        return Logical(left, self.tokens[operator], right)
+
+    def _ternary(self, left: Expr) -> Expr:
+        self.current += 1
+        first = self._parse_precedence(Precedence.OR)
+        self._consume(TokenType.COLON, "Expected colon!")
+        second = self._parse_precedence(Precedence.TERNARY)
+        return Conditional(left, first, second)
+
+    def _assign(self, left: Expr) -> Expr:
+        equals = self.current
+        self.current += 1
+        value = self._parse_precedence(Precedence.ASSIGNMENT)
+        if isinstance(left, Variable):
+            return Assign(left.name, value)
+        self._error(self.tokens[equals], "Invalid assignment target.")
+        return left
+
+
+# The rule tables as lists indexed by token kind code
+PREFIX = [
+    getattr(PrattParser, PREFIX_RULES[type]) if type in PREFIX_RULES else None
+    for type in KINDS
+]
+INFIX = [
+    (
+        (INFIX_RULES[type][0], getattr(PrattParser, INFIX_RULES[type][1]))
+        if type in INFIX_RULES
+        else None
+    )
+    for type in KINDS
+]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    Grouping,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.parser import ParsingError
+from pylox.parser.pratt_parser import INFIX_RULES, PREFIX, Precedence, PrattParser
+from pylox.parser.stmt import Block, For, If, Stmt, While
+from pylox.scanner.scanner import TokenType
+from pylox.scanner.token_buffer import KIND_CODES, KINDS
+
+# What is pending on the work stack while an operand is being parsed
+GROUP, UNARY, BINARY, LOGICAL, THEN, ELSE, ASSIGN = range(7)
+
+# Statements waiting for a nested statement, or a block for its next
+# declaration
+BLOCK, IF_THEN, IF_ELSE, WHILE_BODY, FOR_BODY = range(5)
+
+LEFT_PAREN = KIND_CODES[TokenType.LEFT_PAREN]
+UNARY_KINDS = frozenset((KIND_CODES[TokenType.MINUS], KIND_CODES[TokenType.BANG]))
+INFIX_FRAMES = {
+    "_binary": BINARY,
+    "_logical": LOGICAL,
+    "_ternary": THEN,
+    "_assign": ASSIGN,
+}
+
+# Token kind code -> (precedence, pending work once the operator is read)
+INFIX = [
+    (
+        (INFIX_RULES[type][0], INFIX_FRAMES[INFIX_RULES[type][1]])
+        if type in INFIX_RULES
+        else None
+    )
+    for type in KINDS
+]
+
+
+class StackParser(PrattParser):
+    """`PrattParser` whose expressions are parsed without recursion.
+
+    Each operator that still needs an operand pushes a frame and parsing
+    carries on with that operand, at the precedence the recursive parser
+    would have passed down. When an operand is complete, frames are popped
+    until one needs another operand. Nesting depth is bounded by memory,
+    not by Python's recursion limit. Statements nest the same way: blocks,
+    branches and loop bodies push a frame while their statements are
+    parsed. Produces the same trees and errors as `PrattParser`.
+    """
+
+    def _declaration(self) -> Stmt:
+        frames: list[list] = []
+        # Whether the next statement is a declaration: one at the top or
+        # directly in a block, where `var` is allowed and errors recover
+        declaration = True
+        while True:
+            closing = False
+            try:
+                if frames and frames[-1][0] == BLOCK:
+                    if self._check(TokenType.RIGHT_BRACE) or self._is_at_end():
+                        closing = True
+                        self._consume(TokenType.RIGHT_BRACE, "Expect '}' after a block")
+                        stmt = Block(frames.pop()[1])
+                    else:
+                        stmt = self._simple_statement(frames, True)
+                else:
+                    stmt = self._simple_statement(frames, declaration)
+            except ParsingError:
+                # The error ends the innermost declaration, which may span
+                # several frames; the block it is in carries on after it
+                if closing:
+                    frames.pop()
+                while frames and frames[-1][0] != BLOCK:
+                    frames.pop()
+                self._synchronize()
+                if not frames:
+                    return None
+                frames[-1][1].append(None)
+                continue
+
+            # Complete every statement this one finishes
+            declaration = False
+            while stmt is not None:
+                if not frames:
+                    return stmt
+                frame = frames[-1]
+                work = frame[0]
+                if work == BLOCK:
+                    frame[1].append(stmt)
+                    break
+                if work == IF_THEN and self._match(TokenType.ELSE):
+                    frames[-1] = [IF_ELSE, frame[1], stmt]
+                    break
+                frames.pop()
+                if work == IF_THEN:
+                    stmt = If(frame[1], stmt, None)
+                elif work == IF_ELSE:
+                    stmt = If(frame[1], frame[2], stmt)
+                elif work == WHILE_BODY:
+                    stmt = While(frame[1], stmt)
+                else:
+                    stmt = For(*frame[1], stmt)
+
+    def _simple_statement(self, frames: list[list], declaration: bool) -> Stmt:
+        """Parses a statement without nested statements, or else pushes a
+        frame for it and returns None."""
+        if declaration and self._match(TokenType.VAR):
+            return self._var_declaration()
+        if self._match(TokenType.PRINT):
+            return self._print_statement()
+        if self._match(TokenType.LEFT_BRACE):
+            frames.append([BLOCK, []])
+        elif self._match(TokenType.IF):
+            frames.append([IF_THEN, self._if_condition()])
+        elif self._match(TokenType.WHILE):
+            frames.append([WHILE_BODY, self._while_condition()])
+        elif self._match(TokenType.FOR):
+            frames.append([FOR_BODY, self._for_clauses()])
+        else:
+            return self._expression_statement()
+        return None
+
+    def _expression(self) -> Expr:
+        kinds = self._kinds
+        tokens = self.tokens
+        prefix_rules = PREFIX
+        infix_rules = INFIX
+        stack: list[tuple] = []
+        precedence = Precedence.ASSIGNMENT
+        while True:
+            kind = kinds[self.current]
+            if kind == LEFT_PAREN:
+                self.current += 1
+                stack.append((GROUP, precedence))
+                precedence = Precedence.ASSIGNMENT
+                continue
+            if kind in UNARY_KINDS:
+                stack.append((UNARY, precedence, self.current))
+                self.current += 1
+                precedence = Precedence.UNARY
+                continue
+            prefix = prefix_rules[kind]
+            if prefix is None:
+                raise self._error(self._peek(), "Expected expression!")
+            left = prefix(self)
+
+            # Extend `left` with operators binding at least as tightly as
+            # `precedence`, and close finished frames, until an operator
+            # needs a fresh operand
+            while True:
+                rule = infix_rules[kinds[self.current]]
+                if rule is not None and rule[0] >= precedence:
+                    operator = self.current
+                    self.current += 1
+                    rule_precedence, work = rule
+                    stack.append((work, precedence, operator, left))
+                    if work == THEN:
+                        precedence = Precedence.OR
+                    elif work == ASSIGN:
+                        precedence = Precedence.ASSIGNMENT
+                    else:
+                        # Left-associative: the right operand binds tighter
+                        precedence = rule_precedence + 1
+                    break
+                if not stack:
+                    return left
+                frame = stack.pop()
+                work = frame[0]
+                precedence = frame[1]
+                if work == BINARY:
+                    left = Binary(frame[3], tokens[frame[2]], left)
+                elif work == LOGICAL:
+                    left = Logical(frame[3], tokens[frame[2]], left)
+                elif work == UNARY:
+                    left = Unary(tokens[frame[2]], left)
+                elif work == GROUP:
+                    self._consume(
+                        TokenType.RIGHT_PAREN, "Expect ')' after an expression"
+                    )
+                    left = Grouping(left)
+                elif work == THEN:
+                    self._consume(TokenType.COLON, "Expected colon!")
+                    stack.append((ELSE, precedence, frame[3], left))
+                    precedence = Precedence.TERNARY
+                    break
+                elif work == ELSE:
+                    left = Conditional(frame[2], frame[3], left)
+                elif isinstance(frame[3], Variable):
+                    left = Assign(frame[3].name, left)
+                else:
+                    self._error(tokens[frame[2]], "Invalid assignment target.")
+                    left = frame[3]
@@ -1,17 +1,20 @@
 # This file is auto generated
 from __future__ import annotations
-from abc import ABCMeta
 
 from pylox.scanner.scanner import Token
 from pylox.parser.expr import Expr
 
 
-class Stmt(metaclass=ABCMeta):
+class Stmt:
+    __slots__ = ()
+
     def accept(self, visitor: StmtVisitor):
         pass
 
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -20,6 +23,8 @@ class Expression(Stmt):
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -28,6 +33,8 @@ class Print(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "init")
+
     def __init__(self, name: Token, init: Expr):
         self.name = name
         self.init = init
@@ -37,6 +44,8 @@ class Var(Stmt):
 
 
 class Block(Stmt):
+    __slots__ = ("statements",)
+
     def __init__(self, statements: list[Stmt]):
         self.statements = statements
 
@@ -45,6 +54,8 @@ class Block(Stmt):
 
 
 class If(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Stmt):
         self.condition = condition
         self.then_branch = then_branch
@@ -55,6 +66,8 @@ class If(Stmt):
 
 
 class While(Stmt):
+    __slots__ = ("condition", "stmt")
+
     def __init__(self, condition: Expr, stmt: Stmt):
         self.condition = condition
         self.stmt = stmt
@@ -63,7 +76,20 @@ class While(Stmt):
         return visitor.visit_while(self)
 
 
-class StmtVisitor(metaclass=ABCMeta):
+class For(Stmt):
+    __slots__ = ("init", "condition", "increment", "body")
+
+    def __init__(self, init: Stmt, condition: Expr, increment: Expr, body: Stmt):
+        self.init = init
+        self.condition = condition
+        self.increment = increment
+        self.body = body
+
+    def accept(self, visitor: StmtVisitor):
+        return visitor.visit_for(self)
+
+
+class StmtVisitor:
     def visit_expression(self, stmt: Expression):
         pass
 
@@ -80,4 +106,7 @@ class StmtVisitor(metaclass=ABCMeta):
         pass
 
     def visit_while(self, stmt: While):
-        pass
\ No newline at end of file
+        pass
+
+    def visit_for(self, stmt: For):
+        pass
@@ -0,0 +1,84 @@
+from __future__ import annotations
+from itertools import islice
+from typing import Iterator
+
+from pylox.parser.stack_parser import StackParser
+from pylox.parser.stmt import Stmt
+from pylox.scanner.scanner import Token
+from pylox.scanner.token_buffer import KIND_CODES
+
+# Tokens read from the stream at a time, once fewer than half are left
+WINDOW_SIZE = 4096
+
+
+class TokenWindow:
+    """The tokens of a stream that are read but not yet released.
+
+    Indexed like a `TokenBuffer`, from the first token still held.
+    """
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        self._stream = tokens
+        self._tokens: list[Token] = []
+        self.kinds: list[int] = []
+        self.exhausted = False
+
+    def fill(self, count: int):
+        """Reads up to `count` more tokens from the stream."""
+        tokens = list(islice(self._stream, count))
+        if len(tokens) < count:
+            self.exhausted = True
+        self._tokens.extend(tokens)
+        self.kinds.extend([KIND_CODES[token.type] for token in tokens])
+
+    def release(self, count: int):
+        """Drops the first `count` tokens, shifting the rest down."""
+        del self._tokens[:count]
+        del self.kinds[:count]
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def literal(self, index: int) -> object:
+        return self._tokens[index].literal
+
+    def __getitem__(self, index: int) -> Token:
+        return self._tokens[index]
+
+
+class StreamParser(StackParser):
+    """`StackParser` that reads tokens from a stream as it goes.
+
+    `declarations` yields each top-level declaration as soon as it is
+    parsed, so a caller can run it before the rest of the script is even
+    scanned. A declaration that runs past the tokens read so far is parsed
+    again once twice as many are read: lookahead stays a plain list index
+    into the window. `line` is the line the last declaration ended on.
+    """
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        super().__init__(TokenWindow(tokens))
+        self.line = 1
+
+    def declarations(self) -> Iterator[Stmt]:
+        window = self.tokens
+        while True:
+            if len(window) - self.current < WINDOW_SIZE // 2 and not window.exhausted:
+                window.release(self.current)
+                self.current = 0
+                window.fill(WINDOW_SIZE)
+            if self._is_at_end():
+                return
+            start, errors = self.current, len(self.errors)
+            try:
+                stmt = self._declaration()
+            except IndexError:
+                # Only the window's end is out of range: the stream ends
+                # with EOF, which the parser never reads past
+                window.release(start)
+                self.current = 0
+                del self.errors[errors:]
+                window.fill(max(len(window), WINDOW_SIZE))
+                continue
+            self.line = self._previous().line
+            yield stmt
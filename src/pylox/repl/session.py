@@ -0,0 +1,119 @@
+from __future__ import annotations
+from typing import TextIO
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.output import OutputSink
+from pylox.optimizer.optimizer import Optimizer
+from pylox.parser.stack_parser import StackParser
+from pylox.parser.stmt import Stmt
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.scanner import TokenType
+from pylox.scanner.token_buffer import KIND_CODES, TokenBuffer
+
+OPENERS = (KIND_CODES[TokenType.LEFT_BRACE], KIND_CODES[TokenType.LEFT_PAREN])
+CLOSERS = (KIND_CODES[TokenType.RIGHT_BRACE], KIND_CODES[TokenType.RIGHT_PAREN])
+
+
+class Session:
+    """Runs a stream of snippets against one engine instance.
+
+    Globals declared by one snippet stay visible to the next, and each
+    snippet is scanned, parsed and resolved on its own, so the cost of a
+    snippet does not grow with the session. A snippet with scan, parse or
+    resolve errors is not run and declares nothing. Once a snippet has
+    run, the engine's side tables for it are released.
+    """
+
+    def __init__(
+        self,
+        engine: str = "tree",
+        opt_level: int = 0,
+        stdout: TextIO | OutputSink = None,
+    ) -> None:
+        self.interpreter = ENGINES[engine](stdout)
+        self._opt_level = opt_level
+        self._globals: set[str] = set()
+        self.line = 1
+        self.pending = ""
+        self.errors: list[Exception] = []
+
+    def feed(self, line: str) -> bool:
+        """Adds one line of input, returning whether more lines are needed.
+
+        Input is held back while it ends inside a string, block comment or
+        unclosed bracket, and then run as one snippet.
+        """
+        self.pending += line + "\n"
+        scanner = self._scanner(self.pending)
+        tokens = scanner.scan_buffer()
+        if any(err.msg.startswith("Unterminated") for err in scanner.errors):
+            return True
+        if self._depth(tokens) > 0:
+            return True
+        source, self.pending = self.pending, ""
+        self._run(source, scanner, tokens)
+        return False
+
+    def run(self, source: str) -> bool:
+        """Runs one complete snippet, returning whether it ran without errors."""
+        scanner = self._scanner(source)
+        return self._run(source, scanner, scanner.scan_buffer())
+
+    def run_all(self, snippets: list[str]) -> list[list[Exception]]:
+        """Runs each snippet in turn, returning the errors of each."""
+        ret = []
+        for source in snippets:
+            self.run(source)
+            ret.append(self.errors)
+        return ret
+
+    def _scanner(self, source: str) -> FastScanner:
+        scanner = FastScanner(source)
+        scanner.line = self.line
+        return scanner
+
+    def _depth(self, tokens: TokenBuffer) -> int:
+        depth = 0
+        for kind in tokens.kinds:
+            if kind in OPENERS:
+                depth += 1
+            elif kind in CLOSERS:
+                depth -= 1
+        return depth
+
+    def _run(self, source: str, scanner: FastScanner, tokens: TokenBuffer) -> bool:
+        self.line += source.count("\n") + (not source.endswith("\n"))
+        self.errors = list(scanner.errors)
+        parser = StackParser(tokens)
+        stmts = parser.parse()
+        self.errors.extend(parser.errors)
+        if self.errors:
+            return False
+
+        globals = set(self._globals)
+        resolver = Resolver(globals)
+        resolver.resolve(stmts)
+        if resolver.errors:
+            self.errors.extend(resolver.errors)
+            return False
+        self._globals = globals
+
+        if self._opt_level:
+            stmts = Optimizer.for_level(self._opt_level).optimize(stmts, resolver)
+        interpreter = self.interpreter
+        if not isinstance(interpreter, Interpreter):
+            return self._interpret(stmts)
+        interpreter.resolve(resolver)
+        try:
+            return self._interpret(stmts)
+        finally:
+            interpreter.release()
+
+    def _interpret(self, stmts: list[Stmt]) -> bool:
+        try:
+            self.interpreter.interpret(stmts)
+        except RuntimeError as e:
+            self.errors.append(e)
+            return False
+        return True
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import copy
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from pylox.scanner.scanner import Token
+
+
+class ResolvingError(Exception):
+    def __init__(self, token: Token, msg: str) -> None:
+        super().__init__(msg)
+        self.token = token
+        self.msg = msg
+
+
+def copy_bound(node: Expr | Stmt, tables: tuple[dict, ...], **fields) -> Expr | Stmt:
+    """`node` with `fields` replaced, sharing its entries in `tables`.
+
+    Side tables such as `Resolver.locals` are keyed by node identity, so
+    a changed copy is only valid once it is bound like the original.
+    `node` itself is returned when every field is already the same object.
+    """
+    if all(getattr(node, name) is value for name, value in fields.items()):
+        return node
+    new = copy.copy(node)
+    for name, value in fields.items():
+        setattr(new, name, value)
+    for table in tables:
+        if node in table:
+            table[new] = table[node]
+    return new
+
+
+class Resolver(StmtVisitor):
+    """Binds every local variable access to a (depth, slot) pair.
+
+    `depth` counts the block scopes between the access and the declaration,
+    `slot` is the declaration's index inside its block. Names that are not
+    found in any block scope are globals and stay looked up by name. Since
+    declarations only appear as straight-line statements, a global read
+    before any top-level declaration of that name is always an error.
+    """
+
+    def __init__(self, globals: set[str] = None) -> None:
+        self._scopes: list[dict[str, int]] = []
+        # Callers resolving a program piecewise pass the names declared by
+        # the earlier pieces; the set is updated in place
+        self._globals: set[str] = globals if globals is not None else set()
+        self.locals: dict[object, tuple[int, int]] = {}
+        self.scope_sizes: dict[Stmt, int] = {}
+        self.errors: list[ResolvingError] = []
+
+    def resolve(self, stmts: list[Stmt]):
+        # Statements are walked with an explicit stack as well. A scope is
+        # closed by a `(stmt,)` marker pushed when it is opened.
+        work: list[object] = list(reversed(stmts))
+        while work:
+            item = work.pop()
+            cls = item.__class__
+            if cls is Block:
+                self._scopes.append({})
+                work.append((item,))
+                work.extend(reversed(item.statements))
+            elif cls is If:
+                if item.else_branch is not None:
+                    work.append(item.else_branch)
+                work.append(item.then_branch)
+                work.append(item.condition)
+            elif cls is While:
+                work.append(item.stmt)
+                work.append(item.condition)
+            elif cls is For:
+                # The initializer gets its own scope, entered once for the
+                # whole loop
+                self._scopes.append({})
+                work.append((item,))
+                if item.increment is not None:
+                    work.append(item.increment)
+                work.append(item.body)
+                work.append(item.condition)
+                if item.init is not None:
+                    work.append(item.init)
+            elif cls is tuple:
+                self.scope_sizes[item[0]] = len(self._scopes.pop())
+            elif isinstance(item, Expr):
+                self._resolve_expr(item)
+            else:
+                item.accept(self)
+
+    def _error(self, token: Token, msg: str):
+        self.errors.append(ResolvingError(token, msg))
+
+    def _resolve_local(self, expr: Expr, name: Token):
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if name.lexeme in scope:
+                self.locals[expr] = (depth, scope[name.lexeme])
+                return
+        if name.lexeme not in self._globals:
+            self._error(name, f"Undefined variable '{name.lexeme}'.")
+
+    def visit_block(self, stmt: Block):
+        self.resolve([stmt])
+
+    def visit_var(self, stmt: Var):
+        if stmt.init is not None:
+            self._resolve_expr(stmt.init)
+        name = stmt.name.lexeme
+        if not self._scopes:
+            self._globals.add(name)
+            return
+        scope = self._scopes[-1]
+        # Redeclaring in the same block rebinds the existing slot
+        slot = scope.setdefault(name, len(scope))
+        self.locals[stmt] = (0, slot)
+
+    def visit_expression(self, stmt: Expression):
+        self._resolve_expr(stmt.expression)
+
+    def visit_print(self, stmt: Print):
+        self._resolve_expr(stmt.expression)
+
+    def visit_if(self, stmt: If):
+        self.resolve([stmt])
+
+    def visit_while(self, stmt: While):
+        self.resolve([stmt])
+
+    def visit_for(self, stmt: For):
+        self.resolve([stmt])
+
+    def _resolve_expr(self, expr: Expr):
+        # Walks the expression with its own stack, so nesting depth is not
+        # limited by recursion. Assignment targets are resolved after their
+        # value, as a recursive walk would, to keep errors in order.
+        work: list[object] = [expr]
+        while work:
+            expr = work.pop()
+            cls = expr.__class__
+            if cls is Variable:
+                self._resolve_local(expr, expr.name)
+            elif cls is Assign:
+                work.append((expr,))
+                work.append(expr.expr)
+            elif cls is tuple:
+                self._resolve_local(expr[0], expr[0].name)
+            elif cls is Binary or cls is Logical:
+                work.append(expr.right)
+                work.append(expr.left)
+            elif cls is Conditional:
+                work.append(expr.else_branch)
+                work.append(expr.then_branch)
+                work.append(expr.condition)
+            elif cls is Unary:
+                work.append(expr.right)
+            elif cls is Grouping:
+                work.append(expr.expression)
@@ -0,0 +1,179 @@
+import re
+
+from pylox.scanner.scanner import RESERVED_WORDS, Scanner, Token, TokenType
+from pylox.scanner.token_buffer import KIND_CODES, TokenBuffer
+
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    "*": TokenType.STAR,
+    ";": TokenType.SEMICOLON,
+    ":": TokenType.COLON,
+    "?": TokenType.QUESTION_MARK,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+}
+
+# Blanks before a lexeme are consumed by the same match, and every other
+# character is covered by some alternative, so consecutive matches tile the
+# whole input. Order matters where prefixes overlap: terminated strings and
+# comments come before their lone openers.
+TOKEN_PATTERN = re.compile(
+    r"""
+    [ \t\r]*
+    (?:
+        (?P<newline>\n[ \t\r\n]*)
+        |(?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+        |(?P<operator>[!=<>]=?|[(){},.\-+*;:?]|/(?![/*]))
+        |(?P<number>[0-9]+(?:\.[0-9]+)?)
+        |(?P<string>"[^"]*")
+        |(?P<comment>//[^\n]*)
+        |(?P<block_comment>/\*[\s\S]*?\*/)
+        |(?P<unterminated_comment>/\*)
+        |(?P<unterminated_string>")
+        |(?P<end>\Z)
+        |(?P<unexpected>.)
+    )
+    """,
+    re.VERBOSE,
+)
+GROUPS = TOKEN_PATTERN.groupindex
+NEWLINE = GROUPS["newline"]
+IDENTIFIER = GROUPS["identifier"]
+OPERATOR = GROUPS["operator"]
+NUMBER = GROUPS["number"]
+STRING = GROUPS["string"]
+COMMENT = GROUPS["comment"]
+BLOCK_COMMENT = GROUPS["block_comment"]
+UNTERMINATED_COMMENT = GROUPS["unterminated_comment"]
+UNTERMINATED_STRING = GROUPS["unterminated_string"]
+END = GROUPS["end"]
+
+OPERATOR_CODES = {text: KIND_CODES[type] for text, type in OPERATORS.items()}
+RESERVED_CODES = {text: KIND_CODES[type] for text, type in RESERVED_WORDS.items()}
+IDENTIFIER_CODE = KIND_CODES[TokenType.IDENTIFIER]
+NUMBER_CODE = KIND_CODES[TokenType.NUMBER]
+STRING_CODE = KIND_CODES[TokenType.STRING]
+EOF_CODE = KIND_CODES[TokenType.EOF]
+
+
+class FastScanner(Scanner):
+    """Drop-in `Scanner` that consumes whole lexemes with one regex match.
+
+    It yields the same tokens and `ScanningError`s as `Scanner`, including
+    its recovery after an unterminated block comment.
+    """
+
+    def scan_tokens(self) -> list[Token]:
+        source = self._source
+        pos = 0
+        while pos is not None:
+            pos = self._scan_from(source, pos)
+
+        self.tokens.append(Token(TokenType.EOF, "", None, self.line))
+        return self.tokens
+
+    def _scan_from(self, source: str, pos: int):
+        append = self.tokens.append
+        line = self.line
+        for match in TOKEN_PATTERN.finditer(source, pos):
+            kind = match.lastindex
+            text = match.group(kind)
+            if kind == IDENTIFIER:
+                type = RESERVED_WORDS.get(text, TokenType.IDENTIFIER)
+                append(Token(type, text, None, line))
+            elif kind == OPERATOR:
+                append(Token(OPERATORS[text], text, None, line))
+            elif kind == NEWLINE:
+                line += text.count("\n")
+            elif kind == NUMBER:
+                append(Token(TokenType.NUMBER, text, float(text), line))
+            elif kind == STRING:
+                line += text.count("\n")
+                append(Token(TokenType.STRING, text, text[1:-1], line))
+            elif kind == COMMENT or kind == BLOCK_COMMENT:
+                line += text.count("\n")
+            elif kind == END:
+                break
+            else:
+                resume = self._scan_error(source, match, line)
+                if resume != -1:
+                    return resume
+        self.line = line
+        return None
+
+    def _scan_error(self, source: str, match: re.Match, line: int):
+        """Reports an erroneous match, returning where scanning resumes.
+
+        -1 means scanning continues with the next match.
+        """
+        kind = match.lastindex
+        if kind == UNTERMINATED_STRING:
+            self.line = line + source.count("\n", match.end())
+            self._error("Unterminated string.")
+            return None
+        if kind == UNTERMINATED_COMMENT:
+            # Like Scanner._block_comment: stop before the last character
+            # and keep scanning from there
+            start = match.end()
+            stop = max(start, len(source) - 1)
+            self.line = line + source.count("\n", start, stop)
+            self._error("Unterminated block comment")
+            return stop
+        self.line = line
+        self._error(f"Unexpected character {match.group(kind)}")
+        return -1
+
+    def scan_buffer(self) -> TokenBuffer:
+        buffer = TokenBuffer(self._source)
+        pos = 0
+        while pos is not None:
+            pos = self._scan_buffer_from(buffer, pos)
+
+        end = len(self._source)
+        buffer.append(EOF_CODE, end, end, self.line)
+        return buffer
+
+    def _scan_buffer_from(self, buffer: TokenBuffer, pos: int):
+        source = self._source
+        append = buffer.append
+        line = self.line
+        for match in TOKEN_PATTERN.finditer(source, pos):
+            kind = match.lastindex
+            if kind == IDENTIFIER:
+                text = match.group(kind)
+                code = RESERVED_CODES.get(text, IDENTIFIER_CODE)
+                append(code, match.start(kind), match.end(), line)
+            elif kind == OPERATOR:
+                code = OPERATOR_CODES[match.group(kind)]
+                append(code, match.start(kind), match.end(), line)
+            elif kind == NEWLINE:
+                line += match.group(kind).count("\n")
+            elif kind == NUMBER:
+                append(NUMBER_CODE, match.start(kind), match.end(), line)
+            elif kind == STRING:
+                line += match.group(kind).count("\n")
+                append(STRING_CODE, match.start(kind), match.end(), line)
+            elif kind == COMMENT or kind == BLOCK_COMMENT:
+                line += match.group(kind).count("\n")
+            elif kind == END:
+                break
+            else:
+                resume = self._scan_error(source, match, line)
+                if resume != -1:
+                    return resume
+        self.line = line
+        return None
@@ -77,7 +77,8 @@ class Token:
     def __init__(
         self, type: Union[TokenType, str], lexeme: str, literal: object, line: int
     ) -> None:
-        type = TokenType(type)
+        if not isinstance(type, TokenType):
+            type = TokenType(type)
         self.type = type
         self.lexeme = lexeme
         self.literal = literal
@@ -0,0 +1,63 @@
+from __future__ import annotations
+import re
+from typing import Iterable, Iterator
+
+from pylox.scanner.fast_scanner import (
+    UNTERMINATED_COMMENT,
+    UNTERMINATED_STRING,
+    FastScanner,
+)
+from pylox.scanner.scanner import Token, TokenType
+
+# Characters read from a file at a time
+CHUNK_SIZE = 1 << 20
+
+
+class StreamScanner(FastScanner):
+    """`FastScanner` over source text that arrives in chunks.
+
+    `scan_stream` yields the same tokens and reports the same errors as
+    `scan_tokens` over the whole text, but only holds on to the text that
+    is not scanned yet. Each round scans up to the last newline read: a
+    newline ends every lexeme except strings and block comments, and an
+    opener whose closer has not been read yet waits for the next chunk.
+    Memory is bounded by the chunk size plus the longest line, string or
+    block comment.
+    """
+
+    def __init__(self, chunks: Iterable[str], tolerant=True) -> None:
+        super().__init__("", tolerant)
+        self._chunks = chunks
+        self._final = False
+        self._rest = None
+
+    def scan_stream(self) -> Iterator[Token]:
+        rest = ""
+        for chunk in self._chunks:
+            text = rest + chunk
+            cut = text.rfind("\n") + 1
+            self._rest = None
+            yield from self._scan_part(text[:cut])
+            rest = text[cut:] if self._rest is None else text[self._rest :]
+
+        self._final = True
+        yield from self._scan_part(rest)
+        yield Token(TokenType.EOF, "", None, self.line)
+
+    def _scan_part(self, source: str) -> list[Token]:
+        pos = 0
+        while pos is not None:
+            pos = self._scan_from(source, pos)
+        tokens, self.tokens = self.tokens, []
+        return tokens
+
+    def _scan_error(self, source: str, match: re.Match, line: int):
+        if not self._final and match.lastindex in (
+            UNTERMINATED_STRING,
+            UNTERMINATED_COMMENT,
+        ):
+            # The closer may be in a later chunk: scan again from here then
+            self.line = line
+            self._rest = match.start()
+            return None
+        return super()._scan_error(source, match, line)
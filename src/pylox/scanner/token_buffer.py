@@ -0,0 +1,74 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+
+from pylox.scanner.scanner import Token, TokenType
+
+KINDS = list(TokenType)
+KIND_CODES = {type: code for code, type in enumerate(KINDS)}
+NUMBER = KIND_CODES[TokenType.NUMBER]
+STRING = KIND_CODES[TokenType.STRING]
+EOF = KIND_CODES[TokenType.EOF]
+
+
+class TokenBuffer:
+    """Struct-of-arrays token stream over a source string.
+
+    Each token is a kind code and a [start, end) offset pair. Lines are
+    run-length encoded by token index. Lexemes, literals and `Token` objects
+    are only built when a token is indexed.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.kinds = array("H")
+        self.starts = array("I")
+        self.ends = array("I")
+        self._line_starts = array("I")
+        self._line_numbers = array("I")
+
+    def append(self, kind: int, start: int, end: int, line: int):
+        if not self._line_numbers or self._line_numbers[-1] != line:
+            self._line_starts.append(len(self.kinds))
+            self._line_numbers.append(line)
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def type(self, index: int) -> TokenType:
+        return KINDS[self.kinds[index]]
+
+    def lexeme(self, index: int) -> str:
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def line(self, index: int) -> int:
+        return self._line_numbers[bisect_right(self._line_starts, index) - 1]
+
+    def literal(self, index: int) -> object:
+        kind = self.kinds[index]
+        if kind == NUMBER:
+            return float(self.lexeme(index))
+        if kind == STRING:
+            return self.source[self.starts[index] + 1 : self.ends[index] - 1]
+        return None
+
+    def __getitem__(self, index: int) -> Token:
+        if index < 0:
+            index += len(self.kinds)
+        # `lexeme`, `literal` and `line` inlined: parsers build many tokens
+        kind = self.kinds[index]
+        lexeme = self.source[self.starts[index] : self.ends[index]]
+        literal = None
+        if kind == NUMBER:
+            literal = float(lexeme)
+        elif kind == STRING:
+            literal = lexeme[1:-1]
+        line = self._line_numbers[bisect_right(self._line_starts, index) - 1]
+        return Token(KINDS[kind], lexeme, literal, line)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
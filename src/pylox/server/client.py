@@ -0,0 +1,109 @@
+from __future__ import annotations
+import asyncio
+import itertools
+import json
+import sys
+from pylox.main import ArgumentParser
+
+
+class LoxClient:
+    """Talks to a `LoxServer`; concurrent calls share one connection."""
+
+    def __init__(self) -> None:
+        self._reader: asyncio.StreamReader = None
+        self._writer: asyncio.StreamWriter = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._task: asyncio.Task = None
+
+    async def connect(self, path: str = None, host: str = "127.0.0.1", port: int = 0):
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._task = asyncio.create_task(self._dispatch())
+        return self
+
+    async def _dispatch(self):
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("server closed connection"))
+            self._pending.clear()
+
+    async def request(self, request: dict) -> dict:
+        request["id"] = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request["id"]] = future
+        self._writer.write(json.dumps(request).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def run(
+        self,
+        source: str = None,
+        hash: str = None,
+        globals: dict = None,
+        timeout: float = None,
+    ) -> dict:
+        request = {"source": source} if source is not None else {"hash": hash}
+        if globals:
+            request["globals"] = globals
+        if timeout is not None:
+            request["timeout"] = timeout
+        return await self.request(request)
+
+    async def stats(self) -> dict:
+        return await self.request({"op": "stats"})
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._task
+
+
+async def _main(args) -> int:
+    client = await LoxClient().connect(args.unix, args.host, args.port)
+    try:
+        if args.stats:
+            print(json.dumps(await client.stats(), indent=2))
+            return 0
+        with open(args.script) as f_in:
+            source = f_in.read()
+        runs = [client.run(source, timeout=args.timeout) for _ in range(args.repeat)]
+        responses = await asyncio.gather(*runs)
+    finally:
+        await client.close()
+    for response in responses:
+        if "error" in response:
+            print(response["error"], file=sys.stderr)
+            continue
+        sys.stdout.write(response["output"] or "")
+        for error in response["errors"]:
+            print(f"[line {error['line']}] {error['message']}", file=sys.stderr)
+    return 0 if all(response.get("ok") for response in responses) else 1
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(prog="python -m pylox.server.client")
+    parser.add_argument("script", nargs="?")
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--timeout", type=float)
+    parser.add_argument("--repeat", type=int, default=1, help="send it this many times")
+    parser.add_argument("--stats", action="store_true", help="print server stats")
+    args = parser.parse_args(argv)
+    if not args.stats and args.script is None:
+        parser.error("a script is required unless --stats is given")
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import statistics
+import time
+from collections import OrderedDict, deque
+from multiprocessing.connection import Connection
+from pylox.batch.runner import WARMUP_SOURCE
+from pylox.embed.engine import LoxEngine
+from pylox.engines import ENGINES
+from pylox.main import ArgumentParser
+from pylox.optimizer.optimizer import OPT_LEVELS
+
+TIMEOUT = 10.0
+SCRIPT_CACHE_SIZE = 1024
+# Longest request line accepted, which bounds the size of a script
+REQUEST_LIMIT = 64 * 1024 * 1024
+# Latency percentiles are taken over this many most recent requests
+LATENCY_WINDOW = 1000
+
+
+def script_hash(source: str) -> str:
+    """The hash a server files `source` under, for requests by hash."""
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def worker_main(conn: Connection, engine: str, opt_level: int):
+    lox = LoxEngine(engine, opt_level)
+    lox.run(WARMUP_SOURCE, stdout=io.StringIO())
+    conn.send(None)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = lox.run(request["source"], request.get("globals"))
+            response = {
+                "ok": result.ok,
+                "output": result.output,
+                "errors": [error.to_dict() for error in result.errors],
+                "globals": result.globals,
+            }
+        except Exception as e:
+            response = {
+                "ok": False,
+                "output": "",
+                "errors": [{"kind": "crash", "message": repr(e), "line": None}],
+                "globals": {},
+            }
+        conn.send(response)
+
+
+def _failed(error: dict) -> dict:
+    return {"ok": False, "output": "", "errors": [error], "globals": {}}
+
+
+class Worker:
+    """One worker process, fed one request at a time over a pipe."""
+
+    def __init__(self, context, engine: str, opt_level: int) -> None:
+        self._conn, child = context.Pipe()
+        self.process = context.Process(
+            target=worker_main, args=(child, engine, opt_level), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    async def ready(self):
+        """Waits for the worker to finish starting up."""
+        await self._receive(None)
+
+    async def run(self, request: dict, timeout: float) -> dict:
+        self._conn.send(request)
+        return await self._receive(timeout)
+
+    async def _receive(self, timeout: float) -> object:
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+
+        def on_readable():
+            if not readable.done():
+                readable.set_result(None)
+
+        fd = self._conn.fileno()
+        loop.add_reader(fd, on_readable)
+        try:
+            await asyncio.wait_for(readable, timeout)
+        finally:
+            loop.remove_reader(fd)
+        return self._conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self._conn.close()
+
+
+class LoxServer:
+    """Runs Lox scripts sent as newline-delimited JSON, on worker processes.
+
+    A request is `{"id": ..., "source": ...}` or, for a script the server
+    has seen before, `{"id": ..., "hash": ...}`, with optional "globals"
+    and "timeout". `{"op": "stats"}` reports queue depth and latency
+    percentiles. Requests on one connection may be pipelined; responses
+    carry the request's id. A worker that exceeds its timeout is killed
+    and replaced.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        engine: str = "tree",
+        opt_level: int = 0,
+        timeout: float = TIMEOUT,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.opt_level = opt_level
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: asyncio.Queue[Worker] = None
+        self._pool: list[Worker] = []
+        self._starting: set[asyncio.Task] = set()
+        self._scripts: OrderedDict[str, str] = OrderedDict()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.timeouts = 0
+
+    def _spawn(self) -> Worker:
+        worker = Worker(self._context, self.engine, self.opt_level)
+        self._pool.append(worker)
+        return worker
+
+    async def start(
+        self, path: str = None, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        """Listens on a Unix socket at `path`, or else on localhost TCP."""
+        self._idle = asyncio.Queue()
+        workers = [self._spawn() for _ in range(self.workers)]
+        await asyncio.gather(*(worker.ready() for worker in workers))
+        for worker in workers:
+            self._idle.put_nowait(worker)
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self._serve, path, limit=REQUEST_LIMIT
+            )
+        return await asyncio.start_server(self._serve, host, port, limit=REQUEST_LIMIT)
+
+    def close(self):
+        for task in self._starting:
+            task.cancel()
+        for worker in self._pool:
+            worker.kill()
+        self._pool = []
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than REQUEST_LIMIT: the rest of the line cannot
+                    # be told apart from the next request, so stop reading
+                    message = f"bad request: longer than {REQUEST_LIMIT} bytes"
+                    await self._write(writer, {"ok": False, "error": message})
+                    break
+                if not line:
+                    break
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+            response = await self.handle(request)
+        except ValueError as e:
+            # Also covers lines that are not UTF-8
+            response = {"ok": False, "error": f"bad request: {e}"}
+        if isinstance(request, dict):
+            response["id"] = request.get("id")
+        await self._write(writer, response)
+
+    async def _write(self, writer: asyncio.StreamWriter, response: dict):
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    def _parse(self, request: dict) -> tuple[str, str, dict, float]:
+        """A run request's source, hash, globals and timeout, checked."""
+        source = request.get("source")
+        digest = request.get("hash")
+        if source is not None and not isinstance(source, str):
+            raise ValueError("'source' must be a string")
+        if source is None and not isinstance(digest, str):
+            raise ValueError("expected 'source' or 'hash' as a string")
+        globals = request.get("globals")
+        if globals is not None and not isinstance(globals, dict):
+            raise ValueError("'globals' must be an object")
+        timeout = request.get("timeout", self.timeout)
+        if (
+            not isinstance(timeout, (int, float))
+            or isinstance(timeout, bool)
+            or not 0 < timeout < float("inf")
+        ):
+            raise ValueError("'timeout' must be a positive number of seconds")
+        return source, digest, globals, float(timeout)
+
+    async def handle(self, request: dict) -> dict:
+        op = request.get("op", "run")
+        if op == "stats":
+            return self.stats()
+        if op != "run":
+            raise ValueError(f"unknown op {op!r}")
+        source, digest, globals, timeout = self._parse(request)
+        if source is None:
+            source = self._scripts.get(digest)
+            if source is None:
+                return {"ok": False, "error": f"unknown script hash {digest}"}
+            self._scripts.move_to_end(digest)
+        else:
+            digest = script_hash(source)
+            self._scripts[digest] = source
+            self._scripts.move_to_end(digest)
+            while len(self._scripts) > SCRIPT_CACHE_SIZE:
+                self._scripts.popitem(last=False)
+
+        start = time.perf_counter()
+        self.queued += 1
+        worker = await self._idle.get()
+        self.queued -= 1
+        self.active += 1
+        healthy = False
+        try:
+            job = {"source": source, "globals": globals}
+            response = await worker.run(job, timeout)
+            healthy = True
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            message = f"timed out after {timeout}s"
+            response = _failed({"kind": "timeout", "message": message, "line": None})
+        except EOFError:
+            response = _failed(
+                {"kind": "crash", "message": "worker died", "line": None}
+            )
+        except Exception as e:
+            response = _failed({"kind": "crash", "message": repr(e), "line": None})
+        finally:
+            self.active -= 1
+            if healthy:
+                self._idle.put_nowait(worker)
+            else:
+                # Its reply may still be in the pipe, where the next request
+                # would read it: replace the worker instead
+                self._replace(worker)
+        seconds = time.perf_counter() - start
+        self._latencies.append(seconds)
+        self.completed += 1
+        response.update(hash=digest, seconds=seconds)
+        return response
+
+    def _replace(self, worker: Worker):
+        self._pool.remove(worker)
+        worker.kill()
+        task = asyncio.create_task(self._start(self._spawn()))
+        self._starting.add(task)
+        task.add_done_callback(self._starting.discard)
+
+    async def _start(self, worker: Worker):
+        await worker.ready()
+        self._idle.put_nowait(worker)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        ret = {
+            "workers": self.workers,
+            "queue_depth": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "latency_ms": None,
+        }
+        if latencies:
+            cuts = (
+                statistics.quantiles(latencies, n=100, method="inclusive")
+                if len(latencies) > 1
+                else []
+            )
+            pick = lambda p: (cuts[p - 1] if cuts else latencies[0]) * 1e3
+            ret["latency_ms"] = {
+                "mean": statistics.fmean(latencies) * 1e3,
+                "p50": pick(50),
+                "p90": pick(90),
+                "p99": pick(99),
+                "max": latencies[-1] * 1e3,
+            }
+        return ret
+
+
+async def serve(server: LoxServer, path: str, host: str, port: int):
+    listener = await server.start(path, host, port)
+    where = path or ", ".join(str(s.getsockname()) for s in listener.sockets)
+    print(f"pylox server listening on {where}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(prog="pylox serve")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="default: any free port")
+    parser.add_argument("--workers", type=int, help="default: one per CPU")
+    parser.add_argument("--engine", choices=list(ENGINES), default="tree")
+    parser.add_argument("--opt-level", type=int, choices=list(OPT_LEVELS), default=0)
+    parser.add_argument(
+        "--timeout", type=float, default=TIMEOUT, help="default per-request seconds"
+    )
+    args = parser.parse_args(argv)
+    server = LoxServer(args.workers, args.engine, args.opt_level, args.timeout)
+    try:
+        asyncio.run(serve(server, args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,84 @@
+from __future__ import annotations
+from typing import Iterable, TextIO
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.output import HeldSink, OutputSink, as_sink
+from pylox.optimizer.optimizer import Optimizer
+from pylox.parser.stmt import Stmt
+from pylox.parser.stream_parser import StreamParser
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.stream_scanner import StreamScanner
+
+
+class StreamRunner:
+    """Runs a script while it is still being read.
+
+    The source is scanned chunk by chunk, and each top-level declaration
+    is resolved and run as soon as it is parsed, so output starts right
+    away. A declaration holds nothing once it has run: globals are kept
+    by name, and the engine's side tables are released. Memory therefore
+    stays flat however long the script is.
+
+    Unlike `Lox.run`, errors are only found as they are reached. The run
+    stops at the first one, after everything before it has run. A scan
+    error stops it at the first declaration that fails to parse or ends on
+    or after the error's line.
+    """
+
+    def __init__(
+        self,
+        engine: str = "tree",
+        opt_level: int = 0,
+        stdout: TextIO | OutputSink = None,
+    ) -> None:
+        self._out = as_sink(stdout)
+        # Flushed once at the end rather than after every declaration
+        self.interpreter = ENGINES[engine](HeldSink(self._out))
+        self._optimizer = Optimizer.for_level(opt_level) if opt_level else None
+        self._globals: set[str] = set()
+        self.errors: list[Exception] = []
+
+    def run(self, chunks: Iterable[str]) -> bool:
+        """Runs the script `chunks` make up, returning whether it ran cleanly."""
+        scanner = StreamScanner(chunks)
+        parser = StreamParser(scanner.scan_stream())
+        self.errors = []
+        try:
+            for stmt in parser.declarations():
+                errors = scanner.errors
+                if not parser.errors:
+                    errors = [e for e in errors if e.line <= parser.line]
+                self.errors = errors + parser.errors
+                if self.errors or not self._run(stmt):
+                    return False
+            self.errors = list(scanner.errors)
+            return not self.errors
+        finally:
+            self._out.flush()
+
+    def _run(self, stmt: Stmt) -> bool:
+        resolver = Resolver(self._globals)
+        resolver.resolve([stmt])
+        if resolver.errors:
+            self.errors = list(resolver.errors)
+            return False
+
+        stmts = [stmt]
+        if self._optimizer is not None:
+            stmts = self._optimizer.optimize(stmts, resolver)
+        interpreter = self.interpreter
+        if not isinstance(interpreter, Interpreter):
+            return self._interpret(stmts)
+        interpreter.resolve(resolver)
+        try:
+            return self._interpret(stmts)
+        finally:
+            interpreter.release()
+
+    def _interpret(self, stmts: list[Stmt]) -> bool:
+        try:
+            self.interpreter.interpret(stmts)
+        except RuntimeError as e:
+            self.errors = [e]
+            return False
+        return True
@@ -0,0 +1,417 @@
+from __future__ import annotations
+import hashlib
+import math
+import re
+import threading
+import traceback
+from collections import OrderedDict
+from types import CodeType
+from typing import Callable, Hashable, TextIO
+from pylox.interpreter.closure import ClosureCompiler
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.interpreter import Interpreter, RuntimeError, is_truthy
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.rope import flatten, never_strings, seal
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from pylox.scanner.scanner import Token, TokenType
+
+ENTRY_POINT = "__lox_main__"
+HEADER = (
+    f"def {ENTRY_POINT}(_raise=_raise, _truthy=_truthy, _seal=_seal, "
+    "isinstance=isinstance, float=float, print=print):"
+)
+CODE_CACHE_SIZE = 256
+PROGRAM_CACHE_SIZE = 256
+
+# Operators whose result is always a bool, so conditions can skip _truthy
+BOOLEAN_OPERATORS = {
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+    TokenType.EQUAL_EQUAL: "==",
+    TokenType.BANG_EQUAL: "!=",
+}
+
+NUMERIC_OPERATORS = {
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.SLASH: "/",
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+}
+
+
+class LRUCache:
+    """Thread-safe LRU mapping that builds missing entries on demand.
+
+    Two threads missing the same key may both build it; the last one is
+    kept. Building raises without caching anything.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], object]) -> object:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+
+
+# Generated source digest -> code object
+_code_cache = LRUCache(CODE_CACHE_SIZE)
+# Statements -> their program, so rerunning a tree skips transpiling. Nodes
+# hash by identity and are never modified once resolved.
+_program_cache = LRUCache(PROGRAM_CACHE_SIZE)
+
+
+class TranspiledProgram:
+    def __init__(self, source: str, line_map: list[int], tokens: list[Token]):
+        self.source = source
+        self.line_map = line_map
+        self.tokens = tokens
+        self.digest = hashlib.sha256(source.encode()).hexdigest()
+        self.filename = f"<lox {self.digest[:12]}>"
+
+    def code(self) -> CodeType:
+        return _code_cache.get(
+            self.digest, lambda: compile(self.source, self.filename, "exec")
+        )
+
+    def lox_line(self, exc: BaseException) -> int:
+        frames = [
+            frame
+            for frame in traceback.extract_tb(exc.__traceback__)
+            if frame.filename == self.filename
+        ]
+        if not frames:
+            return 0
+        return self.line_map[frames[-1].lineno - 1]
+
+    def raiser(self):
+        tokens = self.tokens
+
+        def raise_(index: int, msg: str):
+            raise RuntimeError(tokens[index], msg)
+
+        return raise_
+
+
+class Transpiler(ExprVisitor, StmtVisitor):
+    """Translates a resolved statement list into the source of one function.
+
+    Lox locals become Python locals (one name per declaration, so shadowing
+    needs no scope objects) and Lox globals become module globals. Every
+    generated line ends with the Lox line it came from.
+    """
+
+    def __init__(self, locals: dict[object, tuple[int, int]]) -> None:
+        self._locals = locals
+        self._scopes: list[list[str]] = []
+        self._globals: set[str] = set()
+        self._body: list[str] = []
+        self._body_lines: list[int] = []
+        self._tokens: list[Token] = []
+        self._indent = 1
+        self._line = 1
+        self._names = 0
+
+    def transpile(self, stmts: list[Stmt]) -> TranspiledProgram:
+        self._suite(stmts)
+        lines = [HEADER]
+        line_map = [0]
+        if self._globals:
+            lines.append(f"    global {', '.join(sorted(self._globals))}")
+            line_map.append(0)
+        for text, line in zip(self._body, self._body_lines):
+            lines.append(f"{text}  # line {line}")
+            line_map.append(line)
+        return TranspiledProgram("\n".join(lines) + "\n", line_map, self._tokens)
+
+    def _emit(self, text: str):
+        self._body.append("    " * self._indent + text)
+        self._body_lines.append(self._line)
+
+    def _suite(self, stmts: list[Stmt]):
+        start = len(self._body)
+        for stmt in stmts:
+            stmt.accept(self)
+        if len(self._body) == start:
+            self._emit("pass")
+
+    def _nested(self, stmt: Stmt):
+        self._indent += 1
+        self._suite([stmt])
+        self._indent -= 1
+
+    def _mark(self, token: Token):
+        self._line = token.line
+
+    def _temp(self) -> str:
+        self._names += 1
+        return f"_t{self._names}"
+
+    def _global(self, name: str) -> str:
+        name = f"g_{name}"
+        self._globals.add(name)
+        return name
+
+    def _name(self, expr: object, name: Token) -> str:
+        self._mark(name)
+        loc = self._locals.get(expr)
+        if loc is None:
+            return self._global(name.lexeme)
+        depth, slot = loc
+        return self._scopes[-1 - depth][slot]
+
+    def _raise(self, token: Token, msg: str) -> str:
+        self._tokens.append(token)
+        return f"_raise({len(self._tokens) - 1}, {msg!r})"
+
+    def _condition(self, expr: Expr) -> str:
+        code = expr.accept(self)
+        if isinstance(expr, Binary) and expr.operator.type in BOOLEAN_OPERATORS:
+            return code
+        return f"_truthy({code})"
+
+    def _discard(self, expr: Expr):
+        if isinstance(expr, Assign):
+            value = self._stored(expr.expr, expr.expr.accept(self))
+            self._emit(f"{self._name(expr, expr.name)} = {value}")
+            return
+        self._emit(expr.accept(self))
+
+    def visit_expression(self, stmt: Expression):
+        self._discard(stmt.expression)
+
+    def visit_print(self, stmt: Print):
+        self._emit(f"print({stmt.expression.accept(self)})")
+
+    def visit_var(self, stmt: Var):
+        value = stmt.init.accept(self) if stmt.init is not None else "None"
+        self._mark(stmt.name)
+        loc = self._locals.get(stmt)
+        if loc is None:
+            name = self._global(stmt.name.lexeme)
+        else:
+            scope = self._scopes[-1]
+            if loc[1] == len(scope):
+                self._names += 1
+                scope.append(f"l{self._names}_{stmt.name.lexeme}")
+            name = scope[loc[1]]
+        self._emit(f"{name} = {self._stored(stmt.init, value)}")
+
+    def visit_block(self, stmt: Block):
+        self._scopes.append([])
+        for inner in stmt.statements:
+            inner.accept(self)
+        self._scopes.pop()
+
+    def visit_if(self, stmt: If):
+        self._emit(f"if {self._condition(stmt.condition)}:")
+        self._nested(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self._emit("else:")
+            self._nested(stmt.else_branch)
+
+    def visit_while(self, stmt: While):
+        self._emit(f"while {self._condition(stmt.condition)}:")
+        self._nested(stmt.stmt)
+
+    def visit_for(self, stmt: For):
+        self._scopes.append([])
+        if stmt.init is not None:
+            stmt.init.accept(self)
+        self._emit(f"while {self._condition(stmt.condition)}:")
+        self._indent += 1
+        stmt.body.accept(self)
+        if stmt.increment is not None:
+            self._discard(stmt.increment)
+        self._indent -= 1
+        self._scopes.pop()
+
+    def visit_assign(self, expr: Assign):
+        value = self._stored(expr.expr, expr.expr.accept(self))
+        return f"({self._name(expr, expr.name)} := {value})"
+
+    def visit_variable(self, expr: Variable):
+        return self._name(expr, expr.name)
+
+    def _stored(self, expr: Expr, value: str) -> str:
+        """`value`, turned into a rope if it is a long string built by `+`.
+
+        Unlike the other engines, which check every `+`, generated code
+        only checks where a concatenation is stored. That is enough to keep
+        accumulating loops linear without slowing down arithmetic.
+        """
+        if expr is None or not self._may_concat(expr):
+            return value
+        t = self._temp()
+        return f"({t} if ({t} := {value}).__class__ is not str else _seal({t}))"
+
+    def _may_concat(self, expr: Expr) -> bool:
+        if isinstance(expr, Grouping):
+            return self._may_concat(expr.expression)
+        if isinstance(expr, Conditional):
+            return self._may_concat(expr.then_branch) or self._may_concat(
+                expr.else_branch
+            )
+        if isinstance(expr, Logical):
+            return self._may_concat(expr.left) or self._may_concat(expr.right)
+        if not isinstance(expr, Binary):
+            return False
+        return expr.operator.type == TokenType.PLUS and not never_strings(expr)
+
+    def visit_grouping(self, expr: Grouping):
+        return expr.expression.accept(self)
+
+    def visit_literal(self, expr: Literal):
+        if isinstance(expr.value, float) and not math.isfinite(expr.value):
+            return f"float({str(expr.value)!r})"
+        return repr(expr.value)
+
+    def visit_unary(self, expr: Unary):
+        right = expr.right.accept(self)
+        self._mark(expr.operator)
+        t = self._temp()
+        value = f"-{t}" if expr.operator.type == TokenType.MINUS else f"{t} == 0"
+        error = self._raise(expr.operator, "Operand must be a number.")
+        return f"({value} if isinstance({t} := {right}, float) else {error})"
+
+    def visit_conditional(self, expr: Conditional):
+        cond = self._condition(expr.condition)
+        first = expr.then_branch.accept(self)
+        second = expr.else_branch.accept(self)
+        return f"({first} if {cond} else {second})"
+
+    def visit_logical(self, expr: Logical):
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        self._mark(expr.operator)
+        t = self._temp()
+        if expr.operator.type == TokenType.OR:
+            return f"({t} if _truthy({t} := {left}) else {right})"
+        return f"({right} if _truthy({t} := {left}) else {t})"
+
+    def visit_binary(self, expr: Binary):
+        type = expr.operator.type
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        self._mark(expr.operator)
+        if type == TokenType.PLUS:
+            return f"({left} + {right})"
+        if type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            return f"({left} {BOOLEAN_OPERATORS[type]} {right})"
+
+        a, b = self._temp(), self._temp()
+        # `&` rather than `and`, so both operands are evaluated before the check
+        check = f"isinstance({a} := {left}, float) & isinstance({b} := {right}, float)"
+        error = self._raise(expr.operator, "Operands must be numbers.")
+        return f"({a} {NUMERIC_OPERATORS[type]} {b} if {check} else {error})"
+
+
+class TranspiledInterpreter(Interpreter):
+    """Runs programs as generated Python functions; globals persist per instance."""
+
+    def __init__(self, stdout: TextIO | OutputSink = None) -> None:
+        super().__init__(stdout)
+        # The sink's `print` is bound as the generated function's `print` default
+        self._namespace: dict[str, object] = {
+            "_truthy": is_truthy,
+            "_seal": seal,
+            "print": self._out.print,
+        }
+
+    def define_global(self, name: str, value: object):
+        self._namespace[f"g_{name}"] = value
+
+    def global_values(self) -> dict[str, object]:
+        return {
+            name[2:]: flatten(value)
+            for name, value in self._namespace.items()
+            if name.startswith("g_")
+        }
+
+    def _program(self, stmts: list[Stmt]) -> TranspiledProgram:
+        def build():
+            program = Transpiler(self._locals).transpile(stmts)
+            program.code()
+            return program
+
+        return _program_cache.get(tuple(stmts), build)
+
+    def interpret(self, stmts: list[Stmt]):
+        try:
+            program = self._program(stmts)
+        except (SyntaxError, RecursionError, MemoryError):
+            # Nested deeper than CPython compiles (about 200 parentheses or
+            # 20 blocks)
+            self._interpret_closures(stmts)
+            return
+        self._namespace["_raise"] = program.raiser()
+        exec(program.code(), self._namespace)
+        try:
+            self._namespace[ENTRY_POINT]()
+        except NameError as e:
+            # Only reachable for unresolved programs: a global read too early
+            match = re.search(r"'g_(\w+)'", str(e))
+            if match is None:
+                raise
+            name = match.group(1)
+            token = Token(TokenType.IDENTIFIER, name, None, program.lox_line(e))
+            raise RuntimeError(token, f"Undefined variable '{name}'.") from None
+        finally:
+            self._out.flush()
+
+    def _interpret_closures(self, stmts: list[Stmt]):
+        """Runs `stmts` like `ClosureInterpreter`, on this instance's globals."""
+        namespace = self._namespace
+        globals = Environment()
+        for name, value in namespace.items():
+            if name.startswith("g_"):
+                globals.define(name[2:], value)
+        compiler = ClosureCompiler(
+            globals, self._locals, self._scope_sizes, self._out, self._unchecked
+        )
+        try:
+            for run in compiler.compile(stmts):
+                run(globals)
+        finally:
+            for name, value in globals._values.items():
+                namespace[f"g_{name}"] = value
+            self._out.flush()
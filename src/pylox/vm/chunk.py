@@ -0,0 +1,119 @@
+from __future__ import annotations
+import enum
+import math
+from array import array
+from bisect import bisect_right
+
+
+class OpCode(enum.IntEnum):
+    CONSTANT = enum.auto()
+    NIL = enum.auto()
+    TRUE = enum.auto()
+    FALSE = enum.auto()
+    POP = enum.auto()
+    POP_N = enum.auto()
+
+    GET_LOCAL = enum.auto()
+    SET_LOCAL = enum.auto()
+    DEFINE_GLOBAL = enum.auto()
+    GET_GLOBAL = enum.auto()
+    SET_GLOBAL = enum.auto()
+
+    EQUAL = enum.auto()
+    NOT_EQUAL = enum.auto()
+    GREATER = enum.auto()
+    GREATER_EQUAL = enum.auto()
+    LESS = enum.auto()
+    LESS_EQUAL = enum.auto()
+    ADD = enum.auto()
+    SUBTRACT = enum.auto()
+    MULTIPLY = enum.auto()
+    DIVIDE = enum.auto()
+    NOT = enum.auto()
+    NEGATE = enum.auto()
+
+    PRINT = enum.auto()
+    JUMP = enum.auto()
+    JUMP_IF_FALSE = enum.auto()
+    RETURN = enum.auto()
+    # Short-circuit jumps: jump keeping the operand, or pop it and go on
+    JUMP_IF_FALSE_OR_POP = enum.auto()
+    JUMP_IF_TRUE_OR_POP = enum.auto()
+
+
+# Opcodes followed by a single operand word
+WITH_OPERAND = frozenset(
+    (
+        OpCode.CONSTANT,
+        OpCode.POP_N,
+        OpCode.GET_LOCAL,
+        OpCode.SET_LOCAL,
+        OpCode.DEFINE_GLOBAL,
+        OpCode.GET_GLOBAL,
+        OpCode.SET_GLOBAL,
+        OpCode.JUMP,
+        OpCode.JUMP_IF_FALSE,
+        OpCode.JUMP_IF_FALSE_OR_POP,
+        OpCode.JUMP_IF_TRUE_OR_POP,
+    )
+)
+
+
+class Chunk:
+    """A flat instruction stream with its constant pool and line table.
+
+    Instructions are stored one word per opcode or operand. The line table is
+    run-length encoded: `_line_starts[i]` is the first offset emitted for
+    `_line_numbers[i]`.
+    """
+
+    def __init__(self) -> None:
+        self.code = array("i")
+        self.constants: list[object] = []
+        self._constant_index: dict[tuple, int] = {}
+        self._line_starts = array("I")
+        self._line_numbers = array("I")
+
+    def write(self, word: int, line: int) -> int:
+        offset = len(self.code)
+        self.code.append(word)
+        if not self._line_numbers or self._line_numbers[-1] != line:
+            self._line_starts.append(offset)
+            self._line_numbers.append(line)
+        return offset
+
+    def add_constant(self, value: object) -> int:
+        # Keyed on type too, so that 1.0, True and "1" never share a slot
+        key = (type(value), value)
+        if type(value) is float:
+            # And on the sign: -0.0 == 0.0, but they print differently
+            key += (math.copysign(1.0, value),)
+        if key not in self._constant_index:
+            self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return self._constant_index[key]
+
+    def line_at(self, offset: int) -> int:
+        return self._line_numbers[bisect_right(self._line_starts, offset) - 1]
+
+    def disassemble(self) -> str:
+        ret = []
+        offset = 0
+        while offset < len(self.code):
+            op = OpCode(self.code[offset])
+            line = f"{offset:04d} {self.line_at(offset):4d} {op.name}"
+            if op in WITH_OPERAND:
+                operand = self.code[offset + 1]
+                line += f" {operand}"
+                if op in (
+                    OpCode.CONSTANT,
+                    OpCode.DEFINE_GLOBAL,
+                    OpCode.GET_GLOBAL,
+                    OpCode.SET_GLOBAL,
+                ):
+                    line += f" ({self.constants[operand]!r})"
+                offset += 2
+            else:
+                offset += 1
+            ret.append(line)
+        return "\n".join(ret)
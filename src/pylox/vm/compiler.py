@@ -0,0 +1,228 @@
+from __future__ import annotations
+from pylox.parser.expr import (
+    Assign,
+    Binary,
+    Conditional,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from pylox.parser.stmt import (
+    Block,
+    Expression,
+    For,
+    If,
+    Print,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from pylox.scanner.scanner import Token, TokenType
+from .chunk import Chunk, OpCode
+
+BINARY_OPS = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+}
+
+UNARY_OPS = {
+    TokenType.MINUS: OpCode.NEGATE,
+    TokenType.BANG: OpCode.NOT,
+}
+
+
+class Compiler(ExprVisitor, StmtVisitor):
+    """Compiles a parsed statement list into a single `Chunk`.
+
+    Locals live in value stack slots, so every block scope is resolved to
+    slot indexes here and never looked up by name at run time. Globals stay
+    name-based, matching the tree-walker's late binding.
+    """
+
+    def __init__(self) -> None:
+        self._chunk = Chunk()
+        self._locals: list[tuple[str, int]] = []
+        self._scope_depth = 0
+        self._line = 1
+
+    def compile(self, stmts: list[Stmt]) -> Chunk:
+        for stmt in stmts:
+            stmt.accept(self)
+        self._emit(OpCode.RETURN)
+        return self._chunk
+
+    def _emit(self, op: OpCode, operand: int = None) -> int:
+        offset = self._chunk.write(op, self._line)
+        if operand is not None:
+            self._chunk.write(operand, self._line)
+        return offset
+
+    def _emit_jump(self, op: OpCode) -> int:
+        return self._emit(op, 0) + 1
+
+    def _patch_jump(self, operand_offset: int):
+        self._chunk.code[operand_offset] = len(self._chunk.code)
+
+    def _mark(self, token: Token):
+        self._line = token.line
+
+    def _resolve_local(self, name: str) -> int:
+        for slot in range(len(self._locals) - 1, -1, -1):
+            if self._locals[slot][0] == name:
+                return slot
+        return -1
+
+    def _identifier(self, name: str) -> int:
+        return self._chunk.add_constant(name)
+
+    def visit_expression(self, stmt: Expression):
+        stmt.expression.accept(self)
+        self._emit(OpCode.POP)
+
+    def visit_print(self, stmt: Print):
+        stmt.expression.accept(self)
+        self._emit(OpCode.PRINT)
+
+    def visit_var(self, stmt: Var):
+        if stmt.init is not None:
+            stmt.init.accept(self)
+        else:
+            self._emit(OpCode.NIL)
+        self._mark(stmt.name)
+        name = stmt.name.lexeme
+        if self._scope_depth == 0:
+            self._emit(OpCode.DEFINE_GLOBAL, self._identifier(name))
+            return
+
+        slot = self._resolve_local(name)
+        if slot != -1 and self._locals[slot][1] == self._scope_depth:
+            # Redeclaring in the same block rebinds the existing slot
+            self._emit(OpCode.SET_LOCAL, slot)
+            self._emit(OpCode.POP)
+            return
+        self._locals.append((name, self._scope_depth))
+
+    def visit_block(self, stmt: Block):
+        self._scope_depth += 1
+        for inner in stmt.statements:
+            inner.accept(self)
+        self._end_scope()
+
+    def _end_scope(self):
+        self._scope_depth -= 1
+        count = 0
+        while self._locals and self._locals[-1][1] > self._scope_depth:
+            self._locals.pop()
+            count += 1
+        if count == 1:
+            self._emit(OpCode.POP)
+        elif count > 1:
+            self._emit(OpCode.POP_N, count)
+
+    def visit_if(self, stmt: If):
+        stmt.condition.accept(self)
+        else_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is None:
+            self._patch_jump(else_jump)
+            return
+        end_jump = self._emit_jump(OpCode.JUMP)
+        self._patch_jump(else_jump)
+        stmt.else_branch.accept(self)
+        self._patch_jump(end_jump)
+
+    def visit_while(self, stmt: While):
+        loop_start = len(self._chunk.code)
+        stmt.condition.accept(self)
+        exit_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        stmt.stmt.accept(self)
+        self._emit(OpCode.JUMP, loop_start)
+        self._patch_jump(exit_jump)
+
+    def visit_for(self, stmt: For):
+        self._scope_depth += 1
+        if stmt.init is not None:
+            stmt.init.accept(self)
+        loop_start = len(self._chunk.code)
+        stmt.condition.accept(self)
+        exit_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        stmt.body.accept(self)
+        if stmt.increment is not None:
+            stmt.increment.accept(self)
+            self._emit(OpCode.POP)
+        self._emit(OpCode.JUMP, loop_start)
+        self._patch_jump(exit_jump)
+        self._end_scope()
+
+    def visit_assign(self, expr: Assign):
+        expr.expr.accept(self)
+        self._mark(expr.name)
+        slot = self._resolve_local(expr.name.lexeme)
+        if slot != -1:
+            self._emit(OpCode.SET_LOCAL, slot)
+        else:
+            self._emit(OpCode.SET_GLOBAL, self._identifier(expr.name.lexeme))
+
+    def visit_variable(self, expr: Variable):
+        self._mark(expr.name)
+        slot = self._resolve_local(expr.name.lexeme)
+        if slot != -1:
+            self._emit(OpCode.GET_LOCAL, slot)
+        else:
+            self._emit(OpCode.GET_GLOBAL, self._identifier(expr.name.lexeme))
+
+    def visit_binary(self, expr: Binary):
+        expr.left.accept(self)
+        expr.right.accept(self)
+        self._mark(expr.operator)
+        self._emit(BINARY_OPS[expr.operator.type])
+
+    def visit_conditional(self, expr: Conditional):
+        expr.condition.accept(self)
+        else_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        expr.then_branch.accept(self)
+        end_jump = self._emit_jump(OpCode.JUMP)
+        self._patch_jump(else_jump)
+        expr.else_branch.accept(self)
+        self._patch_jump(end_jump)
+
+    def visit_logical(self, expr: Logical):
+        expr.left.accept(self)
+        self._mark(expr.operator)
+        if expr.operator.type == TokenType.OR:
+            end_jump = self._emit_jump(OpCode.JUMP_IF_TRUE_OR_POP)
+        else:
+            end_jump = self._emit_jump(OpCode.JUMP_IF_FALSE_OR_POP)
+        expr.right.accept(self)
+        self._patch_jump(end_jump)
+
+    def visit_unary(self, expr: Unary):
+        expr.right.accept(self)
+        self._mark(expr.operator)
+        self._emit(UNARY_OPS[expr.operator.type])
+
+    def visit_grouping(self, expr: Grouping):
+        expr.expression.accept(self)
+
+    def visit_literal(self, expr: Literal):
+        if expr.value is None:
+            self._emit(OpCode.NIL)
+        elif expr.value is True:
+            self._emit(OpCode.TRUE)
+        elif expr.value is False:
+            self._emit(OpCode.FALSE)
+        else:
+            self._emit(OpCode.CONSTANT, self._chunk.add_constant(expr.value))
@@ -0,0 +1,202 @@
+from __future__ import annotations
+from typing import TextIO
+from pylox.interpreter.interpreter import RuntimeError, is_truthy
+from pylox.interpreter.output import OutputSink, as_sink
+from pylox.interpreter.rope import STRING_TYPES, add, flatten
+from pylox.parser.stmt import Stmt
+from pylox.scanner.scanner import Token, TokenType
+from .chunk import Chunk, OpCode
+from .compiler import Compiler
+
+# Plain ints, so the dispatch loop compares without enum attribute lookups
+CONSTANT = int(OpCode.CONSTANT)
+NIL = int(OpCode.NIL)
+TRUE = int(OpCode.TRUE)
+FALSE = int(OpCode.FALSE)
+POP = int(OpCode.POP)
+POP_N = int(OpCode.POP_N)
+GET_LOCAL = int(OpCode.GET_LOCAL)
+SET_LOCAL = int(OpCode.SET_LOCAL)
+DEFINE_GLOBAL = int(OpCode.DEFINE_GLOBAL)
+GET_GLOBAL = int(OpCode.GET_GLOBAL)
+SET_GLOBAL = int(OpCode.SET_GLOBAL)
+EQUAL = int(OpCode.EQUAL)
+NOT_EQUAL = int(OpCode.NOT_EQUAL)
+GREATER = int(OpCode.GREATER)
+GREATER_EQUAL = int(OpCode.GREATER_EQUAL)
+LESS = int(OpCode.LESS)
+LESS_EQUAL = int(OpCode.LESS_EQUAL)
+ADD = int(OpCode.ADD)
+SUBTRACT = int(OpCode.SUBTRACT)
+MULTIPLY = int(OpCode.MULTIPLY)
+DIVIDE = int(OpCode.DIVIDE)
+NOT = int(OpCode.NOT)
+NEGATE = int(OpCode.NEGATE)
+PRINT = int(OpCode.PRINT)
+JUMP = int(OpCode.JUMP)
+JUMP_IF_FALSE = int(OpCode.JUMP_IF_FALSE)
+JUMP_IF_FALSE_OR_POP = int(OpCode.JUMP_IF_FALSE_OR_POP)
+JUMP_IF_TRUE_OR_POP = int(OpCode.JUMP_IF_TRUE_OR_POP)
+RETURN = int(OpCode.RETURN)
+
+# Operator tokens rebuilt for error reporting, mirroring the tree-walker
+OPERATORS = {
+    SUBTRACT: (TokenType.MINUS, "-"),
+    MULTIPLY: (TokenType.STAR, "*"),
+    DIVIDE: (TokenType.SLASH, "/"),
+    GREATER: (TokenType.GREATER, ">"),
+    GREATER_EQUAL: (TokenType.GREATER_EQUAL, ">="),
+    LESS: (TokenType.LESS, "<"),
+    LESS_EQUAL: (TokenType.LESS_EQUAL, "<="),
+    NEGATE: (TokenType.MINUS, "-"),
+    NOT: (TokenType.BANG, "!"),
+}
+
+
+class VM:
+    def __init__(self, stdout: TextIO | OutputSink = None) -> None:
+        self._out = as_sink(stdout)
+        self._globals: dict[str, object] = {}
+
+    def define_global(self, name: str, value: object):
+        self._globals[name] = value
+
+    def global_values(self) -> dict[str, object]:
+        return {name: flatten(value) for name, value in self._globals.items()}
+
+    def interpret(self, stmts: list[Stmt]):
+        try:
+            self.run(Compiler().compile(stmts))
+        finally:
+            self._out.flush()
+
+    def _operator_error(self, chunk: Chunk, ip: int, msg: str) -> RuntimeError:
+        type, lexeme = OPERATORS[chunk.code[ip]]
+        return RuntimeError(Token(type, lexeme, None, chunk.line_at(ip)), msg)
+
+    def _undefined(self, chunk: Chunk, ip: int, name: str) -> RuntimeError:
+        token = Token(TokenType.IDENTIFIER, name, None, chunk.line_at(ip))
+        return RuntimeError(token, f"Undefined variable '{name}'.")
+
+    def run(self, chunk: Chunk):
+        code = chunk.code.tolist()
+        constants = chunk.constants
+        globals_ = self._globals
+        emit = self._out.print
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        ip = 0
+
+        while True:
+            op = code[ip]
+            if op == GET_LOCAL:
+                push(stack[code[ip + 1]])
+                ip += 2
+            elif op == CONSTANT:
+                push(constants[code[ip + 1]])
+                ip += 2
+            elif op == SET_LOCAL:
+                stack[code[ip + 1]] = stack[-1]
+                ip += 2
+            elif op == JUMP_IF_FALSE:
+                val = pop()
+                if val is True or (val is not False and is_truthy(val)):
+                    ip += 2
+                else:
+                    ip = code[ip + 1]
+            elif op == JUMP:
+                ip = code[ip + 1]
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if is_truthy(stack[-1]):
+                    pop()
+                    ip += 2
+                else:
+                    ip = code[ip + 1]
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if is_truthy(stack[-1]):
+                    ip = code[ip + 1]
+                else:
+                    pop()
+                    ip += 2
+            elif op == POP:
+                pop()
+                ip += 1
+            elif op == GET_GLOBAL:
+                name = constants[code[ip + 1]]
+                if name not in globals_:
+                    raise self._undefined(chunk, ip, name)
+                push(globals_[name])
+                ip += 2
+            elif op == SET_GLOBAL:
+                name = constants[code[ip + 1]]
+                if name not in globals_:
+                    raise self._undefined(chunk, ip, name)
+                globals_[name] = stack[-1]
+                ip += 2
+            elif op == ADD:
+                right = pop()
+                left = stack[-1]
+                if left.__class__ in STRING_TYPES or right.__class__ in STRING_TYPES:
+                    stack[-1] = add(left, right)
+                else:
+                    stack[-1] = left + right
+                ip += 1
+            elif op <= LESS_EQUAL and op >= EQUAL:
+                right = pop()
+                left = stack[-1]
+                if op == EQUAL:
+                    stack[-1] = left == right
+                elif op == NOT_EQUAL:
+                    stack[-1] = left != right
+                elif not (isinstance(left, float) and isinstance(right, float)):
+                    raise self._operator_error(chunk, ip, "Operands must be numbers.")
+                elif op == LESS:
+                    stack[-1] = left < right
+                elif op == LESS_EQUAL:
+                    stack[-1] = left <= right
+                elif op == GREATER:
+                    stack[-1] = left > right
+                else:
+                    stack[-1] = left >= right
+                ip += 1
+            elif op <= DIVIDE and op >= SUBTRACT:
+                right = pop()
+                left = stack[-1]
+                if not (isinstance(left, float) and isinstance(right, float)):
+                    raise self._operator_error(chunk, ip, "Operands must be numbers.")
+                if op == SUBTRACT:
+                    stack[-1] = left - right
+                elif op == MULTIPLY:
+                    stack[-1] = left * right
+                else:
+                    stack[-1] = left / right
+                ip += 1
+            elif op == PRINT:
+                emit(pop())
+                ip += 1
+            elif op == NIL:
+                push(None)
+                ip += 1
+            elif op == TRUE:
+                push(True)
+                ip += 1
+            elif op == FALSE:
+                push(False)
+                ip += 1
+            elif op == POP_N:
+                del stack[-code[ip + 1] :]
+                ip += 2
+            elif op == DEFINE_GLOBAL:
+                globals_[constants[code[ip + 1]]] = pop()
+                ip += 2
+            elif op == NEGATE or op == NOT:
+                val = stack[-1]
+                if not isinstance(val, float):
+                    raise self._operator_error(chunk, ip, "Operand must be a number.")
+                stack[-1] = -val if op == NEGATE else not is_truthy(val)
+                ip += 1
+            elif op == RETURN:
+                return
+            else:
+                raise ValueError(f"Unknown opcode {op} at {ip}")
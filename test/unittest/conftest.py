@@ -0,0 +1,26 @@
+import pytest
+from pylox.parser.stack_parser import StackParser
+from pylox.parser.stmt import Stmt
+from pylox.resolver.resolver import Resolver
+from pylox.scanner.fast_scanner import FastScanner
+
+
+def _analyze(source: str, check: bool = True) -> tuple[list[Stmt], Resolver]:
+    scanner = FastScanner(source)
+    parser = StackParser(scanner.scan_buffer())
+    stmts = parser.parse()
+    assert scanner.errors == [] and parser.errors == []
+    resolver = Resolver()
+    resolver.resolve(stmts)
+    assert not check or resolver.errors == []
+    return stmts, resolver
+
+
+@pytest.fixture
+def analyze():
+    """Scans, parses and resolves a source string like `Lox.analyze`.
+
+    Returns the statements and the resolver. Scan and parse errors fail
+    the test, and so do resolve errors unless `check` is false.
+    """
+    return _analyze
@@ -0,0 +1,43 @@
+from pylox.batch.runner import BatchRunner, collect, run_script
+
+SCRIPTS = {
+    "ok.lox": "var a = 1; print a + 1;",
+    "static.lox": "print ;",
+    "runtime.lox": 'print -"a";',
+}
+
+
+def write_scripts(tmp_path) -> dict:
+    paths = {}
+    for name, source in SCRIPTS.items():
+        path = tmp_path / name
+        path.write_text(source)
+        paths[name] = str(path)
+    return paths
+
+
+def test_run_script_exit_codes(tmp_path):
+    paths = write_scripts(tmp_path)
+    ok = run_script(paths["ok.lox"], {})
+    assert (ok.exit_code, ok.stdout.splitlines()[-1]) == (0, "2.0")
+    assert run_script(paths["static.lox"], {}).exit_code == 65
+    runtime = run_script(paths["runtime.lox"], {})
+    assert runtime.exit_code == 70
+    assert runtime.stderr == "Operand must be a number.\n[line 1]\n"
+    # A failing script leaves no error state behind for the next one
+    assert run_script(paths["ok.lox"], {}).exit_code == 0
+    assert run_script(str(tmp_path / "missing.lox"), {}).exit_code == 1
+
+
+def test_collect_manifest(tmp_path):
+    paths = write_scripts(tmp_path)
+    manifest = tmp_path / "scripts.txt"
+    manifest.write_text("# smoke tests\nok.lox\n\nruntime.lox\n")
+    assert collect(str(manifest)) == [paths["ok.lox"], paths["runtime.lox"]]
+    assert collect(str(tmp_path)) == sorted(paths.values())
+
+
+def test_batch_runner(tmp_path):
+    paths = write_scripts(tmp_path)
+    results = BatchRunner(2, engine="vm").run(sorted(paths.values()))
+    assert [result.exit_code for result in results] == [0, 70, 65]
@@ -0,0 +1,59 @@
+import os
+from pylox.cache.cache import SUFFIX, Artifact, ArtifactCache, cache_key
+from pylox.interpreter.interpreter import Interpreter
+
+# fmt: off
+SOURCE = \
+"""\
+var a = 1;
+{ var b = a + 1; for (var i = 0; i < 3; i = i + 1) b = b * 2; print b; }
+print a > 0 ? "yes" : "no";
+"""\
+# fmt: on
+
+
+def run(artifact: Artifact):
+    interpreter = Interpreter()
+    interpreter.resolve(artifact.resolver)
+    interpreter.interpret(artifact.stmts)
+
+
+def test_round_trip(analyze, tmp_path, capsys):
+    cache = ArtifactCache(str(tmp_path))
+    assert cache.load(SOURCE) is None
+    assert cache.store(SOURCE, Artifact(*analyze(SOURCE)))
+    assert [name for name in os.listdir(tmp_path) if not name.endswith(SUFFIX)] == []
+
+    artifact = cache.load(SOURCE)
+    assert artifact is not None
+    run(artifact)
+    assert capsys.readouterr().out == "16.0\nyes\n"
+    assert cache.load(SOURCE + " ") is None
+
+
+def test_corrupt_entry_is_a_miss(analyze, tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    cache.store(SOURCE, Artifact(*analyze(SOURCE)))
+    (path,) = tmp_path.iterdir()
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert cache.load(SOURCE) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_evicts_least_recently_used(analyze, tmp_path):
+    sources = [f"print {i};" for i in range(3)]
+    cache = ArtifactCache(str(tmp_path))
+    for age, source in enumerate(sources):
+        cache.store(source, Artifact(*analyze(source)))
+        os.utime(cache._path(cache_key(source)), (age, age))
+    assert cache.load(sources[0]) is not None
+    entry_size = cache.entries()[0][1]
+
+    cache.max_size = entry_size * 2
+    cache.evict()
+    assert cache.load(sources[1]) is None
+    assert cache.load(sources[0]) is not None
+    assert cache.load(sources[2]) is not None
@@ -0,0 +1,64 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pylox.embed.engine import CompileError, LoxEngine, LoxError
+from pylox.engines import ENGINES
+
+# fmt: off
+SOURCE = \
+"""\
+var total = start;
+for (var i = 0; i < count; i = i + 1) total = total + i;
+print label + ":";
+print total;
+"""\
+# fmt: on
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_run_with_globals(engine):
+    program = LoxEngine(engine).compile(SOURCE, ["start", "count", "label"])
+    result = program.run({"start": 10, "count": 4, "label": "sum"})
+    assert result.ok
+    assert result.output == "sum:\n16.0\n"
+    assert result.globals["total"] == 16.0
+
+
+def test_runs_are_isolated():
+    program = LoxEngine().compile(SOURCE, ["start", "count", "label"])
+
+    def run(n):
+        return program.run({"start": n, "count": 200, "label": str(n)})
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run, range(32)))
+    for n, result in enumerate(results):
+        assert result.output == f"{n}:\n{n + 19900.0}\n"
+
+    stream = io.StringIO()
+    assert program.run({"start": 0, "count": 1, "label": "x"}, stream).output is None
+    assert stream.getvalue() == "x:\n0.0\n"
+
+
+def test_structured_errors():
+    engine = LoxEngine()
+    with pytest.raises(CompileError) as info:
+        engine.compile("print ;\nprint @;")
+    assert [e.kind for e in info.value.errors] == ["scan", "parse", "parse"]
+
+    result = engine.run("print missing;")
+    assert result.errors == [LoxError("resolve", "Undefined variable 'missing'.", 1)]
+
+    result = engine.run('var a = 1;\nprint -"a";\nvar b = 2;')
+    assert result.errors == [LoxError("runtime", "Operand must be a number.", 2)]
+    assert result.globals == {"a": 1.0}
+
+
+def test_program_cache():
+    engine = LoxEngine(cache_size=2)
+    first = engine.compile("print 1;")
+    assert engine.compile("print 1;") is first
+    engine.compile("print 2;")
+    engine.compile("print 3;")
+    assert engine.compile("print 1;") is not first
+    assert (engine.hits, engine.misses) == (1, 4)
@@ -0,0 +1,78 @@
+import operator
+import pytest
+from pylox.embed.engine import LoxEngine
+from pylox.engines import ENGINES
+from pylox.inference.inference import LoxType, TypeInference
+from pylox.parser.stmt import Print
+
+# fmt: off
+SOURCE = \
+"""\
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) {
+  var half = i / 2;
+  total = total + half * -half;
+}
+var s = "a";
+var n = 1;
+s = s + "b";
+n = n > 0 ? n : "x";
+print total;
+print s + s;
+print n - 1;
+print !total;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def infer(analyze):
+    def infer(source: str) -> tuple[list, TypeInference]:
+        stmts, _ = analyze(source, check=False)
+        inference = TypeInference()
+        inference.infer(stmts)
+        return stmts, inference
+
+    return infer
+
+
+def test_numeric_operators_are_proven(infer):
+    stmts, inference = infer(SOURCE)
+    printed = [stmt.expression for stmt in stmts if isinstance(stmt, Print)]
+    types = [inference.types[expr] for expr in printed]
+    assert types == [LoxType.NUMBER, LoxType.STRING, LoxType.NUMBER, LoxType.BOOL]
+    unchecked = {expr.operator.lexeme: fn for expr, fn in inference.unchecked.items()}
+    assert unchecked.keys() == {"<", "+", "/", "*", "-", "!"}
+    assert (unchecked["<"], unchecked["-"]) == (operator.lt, operator.neg)
+    # `s + s` needs a rope and `n` may be a string
+    assert printed[1] not in inference.unchecked
+    assert printed[2] not in inference.unchecked
+    assert inference.errors == []
+
+
+def test_globals_are_unknown_before_their_declaration(infer):
+    stmts, inference = infer("print x - 1;\nvar x = 1;\nprint x - 1;")
+    first, second = (stmt.expression for stmt in stmts if isinstance(stmt, Print))
+    assert inference.types[first.left] == LoxType.ANY
+    assert first not in inference.unchecked and second in inference.unchecked
+
+
+def test_operators_that_can_only_fail_are_reported(infer):
+    _, inference = infer('var s = "a"; print s * 2; print -nil; print s < 1 or 2;')
+    assert [(e.token.lexeme, e.msg) for e in inference.errors] == [
+        ("*", "Operands must be numbers."),
+        ("-", "Operand must be a number."),
+        ("<", "Operands must be numbers."),
+    ]
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_engines_agree_with_inferred_types(engine):
+    result = LoxEngine(engine, infer_types=True).run(SOURCE)
+    assert result.output == "-71.25\nabab\n0.0\nFalse\n"
+    failing = LoxEngine(engine, infer_types=True).run(
+        'var x = 1; if (x > 0) x = "s"; print x - 1;'
+    )
+    assert [(e.kind, e.message) for e in failing.errors] == [
+        ("runtime", "Operands must be numbers.")
+    ]
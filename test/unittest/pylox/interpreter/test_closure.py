@@ -0,0 +1,58 @@
+import pytest
+from pylox.interpreter.closure import ClosureInterpreter
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+
+# fmt: off
+SOURCE = \
+"""\
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) {
+  if (i == 5) total = total + 100; else total = total + i;
+}
+print total;
+{ var a = "outer"; { print a; var a = a + " inner"; print a; } }
+print total > 100 ? "big" : "small";
+print !0;
+print nil;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def run(analyze):
+    def run(engine, source: str):
+        stmts, resolver = analyze(source)
+        interpreter = engine()
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+
+    return run
+
+
+def test_closure_engine_matches_tree_walker(run, capsys):
+    run(Interpreter, SOURCE)
+    expected = capsys.readouterr().out
+    run(ClosureInterpreter, SOURCE)
+    assert capsys.readouterr().out == expected
+
+
+@pytest.mark.parametrize(
+    "source, line, lexeme, msg",
+    [
+        ('print 1;\nprint 2 * "x";', 2, "*", "Operands must be numbers."),
+        ("{\n  var a = nil;\n  print -a;\n}", 3, "-", "Operand must be a number."),
+        (
+            "var a = 1;\nwhile (a < 3) {\n  a = a + 1;\n  print a > nil;\n}",
+            4,
+            ">",
+            "Operands must be numbers.",
+        ),
+    ],
+)
+def test_closure_engine_runtime_errors(run, source, line, lexeme, msg):
+    for engine in (Interpreter, ClosureInterpreter):
+        with pytest.raises(RuntimeError) as e:
+            run(engine, source)
+        assert e.value.token.line == line
+        assert e.value.token.lexeme == lexeme
+        assert e.value.msg == msg
@@ -0,0 +1,36 @@
+import pytest
+from pylox.embed.engine import LoxEngine
+from pylox.engines import ENGINES
+
+# fmt: off
+SOURCE = \
+"""\
+var calls = 0;
+var a = nil;
+print 1 or (calls = calls + 1);
+print 0 or "right";
+print "" and (calls = calls + 1);
+print 2 and 3;
+print nil or false or "last";
+print 1 and nil or "fallback";
+print 1 < 2 ? "yes" : (calls = calls + 1);
+print 0 ? (calls = calls + 1) : "no";
+a = calls == 0 and "none";
+for (var i = 0; i < 3 and calls == 0; i = i + 1) calls = calls or i;
+"""\
+# fmt: on
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_only_needed_operands_are_evaluated(engine):
+    result = LoxEngine(engine).run(SOURCE)
+    assert result.output == "1.0\nright\n\n3.0\nlast\nfallback\nyes\nno\n"
+    assert result.globals["a"] == "none"
+    assert result.globals["calls"] == 1.0
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_operands_use_lox_truthiness(engine):
+    # Unchecked `+` turns two booleans into the int 0, which Lox counts as true
+    result = LoxEngine(engine).run('print (false + false) or "x";')
+    assert result.output == "0\n"
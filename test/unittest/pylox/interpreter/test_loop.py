@@ -0,0 +1,84 @@
+import pytest
+from pylox.interpreter import interpreter as tree
+from pylox.interpreter.closure import ClosureInterpreter
+from pylox.interpreter.environment import SlotEnvironment
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.loop import LoopPlan
+from pylox.parser.stmt import For
+
+# fmt: off
+SOURCE = \
+"""\
+var n = 3;
+var total = 0;
+for (var i = 0; i < n * 2; i = i + 1) {
+  var sq = i * i;
+  for (var j = 0; j < n + 1; j = j + 1) total = total + sq * (n - 1) + j;
+}
+print total;
+var k = 0;
+for (; k < 3;) k = k + 1;
+print k;
+for (k = 0; k < 2; k = k + 1) { var k = "shadow"; print k; }
+print k;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def run(analyze):
+    def run(engine, source: str):
+        stmts, resolver = analyze(source)
+        interpreter = engine()
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+
+    return run
+
+
+def test_parse_for(analyze):
+    stmts, _ = analyze("for (;;) print 1;")
+    assert isinstance(stmts[0], For)
+    assert stmts[0].init is None and stmts[0].increment is None
+    assert stmts[0].condition.value is True
+
+
+@pytest.mark.parametrize("engine", [Interpreter, ClosureInterpreter])
+def test_for_loops(run, engine, capsys):
+    run(engine, SOURCE)
+    assert capsys.readouterr().out == "476.0\n3.0\nshadow\nshadow\n2.0\n"
+
+
+def test_hoist_invariants(analyze):
+    stmts, resolver = analyze(
+        "var n = 2; for (var i = 0; i < n * 2; i = i + 1) print (n + 1) * i;"
+    )
+    loop = stmts[1]
+    plan = LoopPlan(loop, dict(resolver.locals), dict(resolver.scope_sizes))
+    times_two = loop.condition.right
+    plus_one = loop.body.expression.left
+    assert [h.expression for h in plan.hoisted] == [times_two, plus_one]
+    assert plan.condition.right is plan.hoisted[0]
+    # The original tree is left untouched
+    assert loop.condition.right is times_two
+    assert plan.condition is not loop.condition
+
+
+def test_hoisted_errors_stay_lazy(run, capsys):
+    source = 'var x = "s"; for (var i = 0; i < 2; i = i + 1) { print i; print -x; }'
+    with pytest.raises(RuntimeError):
+        run(Interpreter, source)
+    assert capsys.readouterr().out == "0.0\n"
+
+
+def test_no_environment_per_iteration(run, monkeypatch):
+    created = []
+
+    class Counting(SlotEnvironment):
+        def __init__(self, size, enclosing):
+            created.append(size)
+            super().__init__(size, enclosing)
+
+    monkeypatch.setattr(tree, "SlotEnvironment", Counting)
+    run(Interpreter, "for (var i = 0; i < 100; i = i + 1) { var j = i; }")
+    assert created == [1, 1]
@@ -0,0 +1,60 @@
+import json
+import pytest
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.metrics import MeteredInterpreter
+
+# fmt: off
+SOURCE = \
+"""\
+var g = 0;
+{
+  var a = 1;
+  for (var i = 0; i < 3; i = i + 1) {
+    g = g + a;
+  }
+}
+print g;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def run(analyze):
+    def run(source: str) -> MeteredInterpreter:
+        stmts, resolver = analyze(source)
+        interpreter = MeteredInterpreter()
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+        return interpreter
+
+    return run
+
+
+def test_counters(run, capsys):
+    metrics = run(SOURCE).metrics
+    assert capsys.readouterr().out == "3.0\n"
+    # globals, the block, the loop scope and the reused body scope
+    assert metrics.environments == 4
+    # i in the condition and increment, g and a in the body, g in print
+    assert metrics.variable_gets == 4 + 3 + 6 + 1
+    assert metrics.variable_assigns == 3 + 3
+    assert metrics.lookup_depths == {"0": 10, "2": 3, "global": 7}
+    assert metrics.evaluations["For"] == 1
+    assert metrics.evaluations["Binary"] == 4 + 3 + 3
+    assert metrics.runtime_errors == 0
+
+    dumped = json.loads(metrics.to_json())
+    assert list(dumped["lookup_depths"]) == ["0", "2", "global"]
+
+
+def test_runtime_errors_counted(analyze):
+    stmts, _ = analyze("print -nil;")
+    interpreter = MeteredInterpreter()
+    with pytest.raises(RuntimeError):
+        interpreter.interpret(stmts)
+    assert interpreter.metrics.runtime_errors == 1
+
+
+def test_plain_interpreter_is_untouched():
+    assert Interpreter.visit_variable is not MeteredInterpreter.visit_variable
+    assert "metrics" not in vars(Interpreter())
@@ -0,0 +1,66 @@
+import io
+import pytest
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.interpreter.output import (
+    BlockBufferedSink,
+    LineBufferedSink,
+    MemorySink,
+    as_sink,
+)
+
+# fmt: off
+SOURCE = \
+"""\
+for (var i = 0; i < 5; i = i + 1) print i;
+print "done";
+print -"boom";
+"""\
+# fmt: on
+
+
+class CountingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+@pytest.fixture
+def run(analyze):
+    def run(engine: str, sink) -> None:
+        stmts, resolver = analyze(SOURCE)
+        interpreter = ENGINES[engine](sink)
+        if isinstance(interpreter, Interpreter):
+            interpreter.resolve(resolver)
+        with pytest.raises(RuntimeError):
+            interpreter.interpret(stmts)
+
+    return run
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_block_sink_flushed_on_runtime_error(run, engine):
+    stream = CountingStream()
+    run(engine, BlockBufferedSink(stream, lines=4))
+    assert stream.getvalue() == "0.0\n1.0\n2.0\n3.0\n4.0\ndone\n"
+    # One write for the first four lines, one for the rest at the error
+    assert stream.writes == 2
+
+
+def test_line_and_memory_sinks(run):
+    stream = CountingStream()
+    run("tree", LineBufferedSink(stream))
+    assert stream.writes == 6
+    sink = MemorySink()
+    run("tree", sink)
+    assert sink.getvalue() == stream.getvalue()
+
+
+def test_as_sink():
+    sink = MemorySink()
+    assert as_sink(sink) is sink
+    assert isinstance(as_sink(io.StringIO()), BlockBufferedSink)
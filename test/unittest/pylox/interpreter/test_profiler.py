@@ -0,0 +1,58 @@
+import pytest
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.profiler import ProfilingInterpreter
+
+# fmt: off
+SOURCE = \
+"""\
+var total = 0;
+for (var i = 0; i < 3; i = i + 1)
+  total = total + i;
+print total;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def profile(analyze):
+    def profile(source: str) -> ProfilingInterpreter:
+        stmts, resolver = analyze(source)
+        interpreter = ProfilingInterpreter()
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+        return interpreter
+
+    return profile
+
+
+def test_profile_counts(profile, capsys):
+    interpreter = profile(SOURCE)
+    assert capsys.readouterr().out == "3.0\n"
+
+    hits = {stats.label: stats.hits for stats in interpreter.profile.nodes.values()}
+    assert hits["For:2"] == 1
+    assert hits["Binary <:2"] == 4
+    assert hits["Binary +:3"] == 3
+    assert hits["Print:4"] == 1
+    # Nodes without tokens of their own take the line of their subtree
+    assert hits["Literal:1"] == 1
+
+    lines = interpreter.profile.lines()
+    assert sorted(lines) == [1, 2, 3, 4]
+    # Expression, Assign, Binary and two Variables per iteration
+    assert lines[3][0] == 3 * 5
+
+
+def test_collapsed_stacks(profile):
+    interpreter = profile(SOURCE)
+    stacks = interpreter.profile.stacks
+    assert ("For:2", "Expression:3", "Assign:3", "Binary +:3") in stacks
+    for line in interpreter.profile.collapsed_stacks().splitlines():
+        path, count = line.rsplit(" ", 1)
+        assert path.split(";")[0] in ("Var:1", "For:2", "Print:4")
+        assert int(count) > 0
+
+
+def test_plain_interpreter_is_untouched():
+    assert Interpreter.visit_binary is not ProfilingInterpreter.visit_binary
+    assert "profile" not in vars(Interpreter())
@@ -0,0 +1,83 @@
+import operator
+import pytest
+from pylox.interpreter.interpreter import RuntimeError
+from pylox.interpreter.quickening import MAX_DEOPTS, QuickeningInterpreter
+from pylox.interpreter.output import MemorySink
+from pylox.interpreter.rope import add
+
+# fmt: off
+SOURCE = \
+"""\
+var x = 1;
+var y = 2;
+var r;
+for (var i = 0; i < 40; i = i + 1) {
+  if (i == 20) { x = "a"; y = "b"; }
+  r = x + y;
+}
+print r;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def run(analyze):
+    def run(source: str, threshold: int = 4):
+        stmts, resolver = analyze(source)
+        sink = MemorySink()
+        interpreter = QuickeningInterpreter(sink, threshold=threshold)
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+        return interpreter, sink.getvalue()
+
+    return run
+
+
+def forms(interpreter: QuickeningInterpreter) -> set[tuple[str, object]]:
+    return {
+        (expr.operator.lexeme, fast) for expr, fast in interpreter.quickened().items()
+    }
+
+
+def test_hot_nodes_specialize_and_respecialize_after_a_failed_guard(run):
+    interpreter, output = run(SOURCE)
+    assert output == "ab\n"
+    assert forms(interpreter) == {
+        ("<", operator.lt),
+        ("==", operator.eq),
+        ("+", operator.add),
+        ("+", add),
+    }
+    plus = next(e for e, fast in interpreter.quickened().items() if fast is add)
+    site = interpreter._sites[plus]
+    assert (site.left, site.right, site.deopts) == (str, str, 1)
+
+
+def test_failed_guard_raises_the_generic_error(run):
+    source = SOURCE.replace("r = x + y", "r = x - y")
+    with pytest.raises(RuntimeError) as error:
+        run(source)
+    assert error.value.msg == "Operands must be numbers."
+    assert error.value.token.lexeme == "-"
+
+
+def test_unstable_nodes_give_up_and_stay_generic(run):
+    interpreter, output = run(
+        "var k = 0; var v = 1; var r;\n"
+        "for (var i = 0; i < 100; i = i + 1) {\n"
+        "  k = k + 1;\n"
+        '  if (k == 5) { k = 0; v = v == 1 ? "s" : 1; }\n'
+        "  r = v + v;\n"
+        "}\n"
+        "print r;",
+        threshold=2,
+    )
+    assert output == "2.0\n"
+    site = next(
+        site
+        for expr, site in interpreter._sites.items()
+        if getattr(expr.left, "name", None)
+        and expr.left.name.lexeme == "v"
+        and expr.operator.lexeme == "+"
+    )
+    assert (site.fast, site.deopts) == (None, MAX_DEOPTS)
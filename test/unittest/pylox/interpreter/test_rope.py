@@ -0,0 +1,60 @@
+import pytest
+from pylox.embed.engine import LoxEngine
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import is_truthy
+from pylox.interpreter.rope import MIN_ROPE, Rope, add
+
+# fmt: off
+SOURCE = \
+"""\
+var s = "";
+for (var i = 0; i < 2000; i = i + 1) s = s + "ab";
+var t = s;
+t = t + "!";
+s = s + "?";
+print s == t;
+print ("x" + s) == ("x" + s);
+print s + "" == s;
+var short = "a" + "b";
+print short;
+"""\
+# fmt: on
+
+
+def test_add_makes_ropes_for_long_strings_only():
+    assert add("a", "b") == "ab" and type(add("a", "b")) is str
+    assert add(1.0, 2.0) == 3.0
+    rope = add("x" * MIN_ROPE, "y")
+    assert type(rope) is Rope and len(rope) == MIN_ROPE + 1
+    with pytest.raises(TypeError):
+        add(rope, 1.0)
+
+
+def test_rope_behaves_like_its_string():
+    base = add("a" * MIN_ROPE, "b")
+    left, right = base + "c", base + "d"
+    # Growing `base` twice must not let the two results share a suffix
+    assert (str(left), str(right)) == ("a" * MIN_ROPE + "bc", "a" * MIN_ROPE + "bd")
+    assert left == "a" * MIN_ROPE + "bc" and "a" * MIN_ROPE + "bc" == left
+    assert left != right and left != 1.0 and not (left == None)
+    assert hash(left) == hash(str(left))
+    assert f"{left}" == str(left)
+    assert str("z" + left) == "z" + str(left)
+    assert is_truthy(left)
+
+
+def test_appending_shares_one_piece_list():
+    s = ""
+    for _ in range(1000):
+        s = add(s, "ab")
+    assert type(s) is Rope
+    # Linear growth: every append extended the same list in place
+    assert len(s._parts) == s._count == 1000 - MIN_ROPE // 2 + 2
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_engines_print_and_return_flat_strings(engine):
+    result = LoxEngine(engine).run(SOURCE)
+    assert result.output == "False\nTrue\nTrue\nab\n"
+    assert result.globals["t"] == "ab" * 2000 + "!"
+    assert type(result.globals["s"]) is str
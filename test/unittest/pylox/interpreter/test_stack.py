@@ -0,0 +1,60 @@
+import pytest
+from pylox.interpreter.interpreter import RuntimeError
+from pylox.interpreter.output import MemorySink
+from pylox.interpreter.stack import StackInterpreter
+
+DEPTH = 10000
+
+
+@pytest.fixture
+def run(analyze):
+    def run(source: str, interpreter: StackInterpreter = None) -> str:
+        stmts, resolver = analyze(source)
+        sink = MemorySink()
+        interpreter = interpreter or StackInterpreter()
+        interpreter._out = sink
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+        return sink.getvalue()
+
+    return run
+
+
+def test_deep_expressions_need_no_recursion(run):
+    source = (
+        "var x = 1;\n"
+        "{ var y = 2; x = " + "(y - " * DEPTH + "x" + ")" * DEPTH + "; }\n"
+        "print " + "-" * DEPTH + "(x > 0 and x < 3 ? x : nil);"
+    )
+    assert run(source) == "1.0\n"
+
+
+def test_deep_statements_need_no_recursion(run):
+    source = (
+        "var a = 0;\n"
+        + "{ var b = a; " * DEPTH
+        + "a = a + 1;"
+        + " }" * DEPTH
+        + "\n"
+        + "if (a > 0) " * DEPTH
+        + "while (a < 3) for (; a < 3;) a = a + 1;\n"
+        "print a;"
+    )
+    assert run(source) == "3.0\n"
+
+
+def test_loops_and_scopes(run):
+    source = (
+        "var s = 0;\n"
+        "for (var i = 0; i < 5; i = i + 1) { var j = i; while (j > 0) { s = s + j; j = j - 1; } }\n"
+        'if (s == 20) print "yes"; else print "no";\n'
+        "print s;"
+    )
+    assert run(source) == "yes\n20.0\n"
+
+
+def test_environment_is_restored_after_an_error(run):
+    interpreter = StackInterpreter()
+    with pytest.raises(RuntimeError):
+        run('{ var a = 1; { print a - "x"; } }', interpreter)
+    assert interpreter._env is interpreter._globals
@@ -0,0 +1,98 @@
+import pytest
+from pylox.interpreter.interpreter import Interpreter
+from pylox.optimizer.optimizer import Optimizer, count_nodes
+from pylox.parser.ast_printer import AstPrinter
+from pylox.parser.expr import Literal, Variable
+from pylox.parser.stmt import Block, Expression, Print, Var, While
+
+
+@pytest.fixture
+def optimize(analyze):
+    def optimize(source: str, passes=None, level=2):
+        stmts, resolver = analyze(source)
+        if passes is not None:
+            optimizer = Optimizer(passes)
+        else:
+            optimizer = Optimizer.for_level(level)
+        return optimizer.optimize(stmts, resolver), optimizer, resolver
+
+    return optimize
+
+
+def test_fold_constants(optimize):
+    stmts, optimizer, _ = optimize(
+        'print (2 * 3 + 4) - -1; print "a" + "b"; print !0; print 1 < 2 ? 3 : 4;',
+        passes=("fold-constants",),
+    )
+    assert [stmt.expression.value for stmt in stmts] == [11.0, "ab", True, 3.0]
+    assert optimizer.report == [("fold-constants", 16)]
+
+
+def test_fold_logical_operators(optimize):
+    stmts, _, _ = optimize(
+        "var a = 1; print nil or a; print 2 or a; print 0 and a; print 1 and a;",
+        passes=("fold-constants",),
+    )
+    folded = [stmt.expression for stmt in stmts[1:]]
+    assert [type(expr) for expr in folded] == [Variable, Literal, Literal, Variable]
+    assert [folded[1].value, folded[2].value] == [2.0, 0.0]
+
+
+def test_fold_constants_keeps_runtime_errors(optimize):
+    stmts, _, _ = optimize('print 1 - "a"; print 1 / 0; print -nil;', level=1)
+    printer = AstPrinter()
+    assert [printer.print(stmt.expression) for stmt in stmts] == [
+        "(- 1.0 a)",
+        "(/ 1.0 0.0)",
+        "(- nil)",
+    ]
+
+
+def test_dead_code_elimination(optimize):
+    stmts, optimizer, _ = optimize(
+        "var a = 1;\n"
+        'if (false) print "off"; else print "on";\n'
+        "if (1 > 2) print 1;\n"
+        "while (false) a = a + 1;\n"
+        "while (a < 3) if (false) a = 0;\n"
+        "{ var b = a; b; (b == 1); a; }"
+    )
+    assert [type(stmt) for stmt in stmts] == [type(stmts[0]), Print, While, Block]
+    # Reading a global may still fail: it is not pure
+    assert [type(stmt) for stmt in stmts[3].statements] == [Var, Expression]
+    loop = stmts[2]
+    assert isinstance(loop.stmt, Expression)
+    assert isinstance(loop.stmt.expression, Literal)
+    removed = dict(optimizer.report)
+    assert removed["dead-branches"] == 11
+    assert removed["dead-loops"] == 7
+    assert removed["pure-statements"] == 6
+    assert count_nodes(stmts) == 15
+
+
+def test_optimized_program_runs(optimize, capsys):
+    stmts, _, resolver = optimize(
+        "var t = 0;\n"
+        "for (var i = 0; i < 4; i = i + 1) {\n"
+        "  if (true) t = t + (2 * 3);\n"
+        "  i;\n"
+        "}\n"
+        "print t;"
+    )
+    interpreter = Interpreter()
+    interpreter.resolve(resolver)
+    interpreter.interpret(stmts)
+    assert capsys.readouterr().out == "24.0\n"
+
+
+def test_passes_leave_the_input_tree_alone(analyze, capsys):
+    source = "var a = 1;\n{ var b = a + (2 * 3); if (true) print b; b; }\nprint a;"
+    stmts, resolver = analyze(source)
+    nodes = count_nodes(stmts)
+    optimized = Optimizer.for_level(2).optimize(stmts, resolver)
+    assert count_nodes(stmts) == nodes and count_nodes(optimized) < nodes
+    for tree in (optimized, stmts):
+        interpreter = Interpreter()
+        interpreter.resolve(resolver)
+        interpreter.interpret(tree)
+    assert capsys.readouterr().out == "7.0\n1.0\n" * 2
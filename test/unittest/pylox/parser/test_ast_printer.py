@@ -27,3 +27,10 @@ def test_ast_printer():
         )
     )
     assert ret == "(* (- 123) (group 45.67))"
+
+
+def test_ast_printer_handles_deep_nesting():
+    expr = Literal(1)
+    for _ in range(10000):
+        expr = Grouping(Unary(Token(TokenType.MINUS, "-", None, 1), expr))
+    assert AstPrinter().print(expr) == "(group (- " * 10000 + "1" + "))" * 10000
@@ -0,0 +1,60 @@
+from pylox.parser.buffer_parser import BufferParser
+from pylox.parser.parser import Parser
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.scanner import Token, TokenType
+
+# fmt: off
+SOURCE = \
+"""\
+var a = 1;
+var b = "two";
+for (var i = 0; i < 10; i = i + 1) {
+  if (a >= 3) print -a * (b == nil ? 2 : 3); else a = a + i / 2;
+}
+while (true) { print !a != false; }
+"""\
+# fmt: on
+
+
+def assert_nodes_equal(first: object, second: object):
+    if isinstance(first, Token):
+        assert (first.type, first.lexeme, first.literal, first.line) == (
+            second.type,
+            second.lexeme,
+            second.literal,
+            second.line,
+        )
+    elif isinstance(first, list):
+        assert len(first) == len(second)
+        for f, s in zip(first, second):
+            assert_nodes_equal(f, s)
+    elif hasattr(first, "accept"):
+        assert type(first) is type(second)
+        for key in type(first).__slots__:
+            assert_nodes_equal(getattr(first, key), getattr(second, key))
+    else:
+        assert first == second
+
+
+def test_token_buffer_materializes_tokens():
+    buffer = FastScanner('var s = "a\nb";\nprint s + 1.5;').scan_buffer()
+    tokens = FastScanner('var s = "a\nb";\nprint s + 1.5;').scan_tokens()
+    assert len(buffer) == len(tokens)
+    for token, expected in zip(buffer, tokens):
+        assert_nodes_equal(token, expected)
+    assert buffer.type(len(buffer) - 1) == TokenType.EOF
+
+
+def test_buffer_parser_matches_parser():
+    expected = Parser(FastScanner(SOURCE).scan_tokens()).parse()
+    stmts = BufferParser(FastScanner(SOURCE).scan_buffer()).parse()
+    assert_nodes_equal(stmts, expected)
+
+
+def test_buffer_parser_reports_errors():
+    parser = BufferParser(FastScanner("var = 1;\nprint (2;").scan_buffer())
+    parser.parse()
+    assert [(e.token.line, e.token.lexeme, e.msg) for e in parser.errors] == [
+        (1, "=", "Expect variable name."),
+        (2, ";", "Expect ')' after an expression"),
+    ]
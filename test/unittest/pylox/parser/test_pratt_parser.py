@@ -0,0 +1,62 @@
+import pytest
+from pylox.parser.parser import Parser
+from pylox.parser.pratt_parser import INFIX_RULES, PREFIX_RULES, PrattParser
+from pylox.scanner.fast_scanner import FastScanner
+from test_buffer_parser import SOURCE, assert_nodes_equal
+
+# fmt: off
+EXPRESSIONS = \
+"""\
+var x = a = b = 1 + 2 * 3 - 4 / 5;
+print -!-a * (b + c) / d - e;
+print a < b == c >= d != e;
+print a ? b + 1 : c ? d : e;
+print (a = b) ? c == d : (e);
+x = a == b ? c : d;
+print a or b and c or !d == e;
+print a and b ? c or d : e and f;
+"""\
+# fmt: on
+
+ERRORS = [
+    "print a + ;",
+    "print (a + b;",
+    "a + b = c;",
+    "print a ? b : c = d;",
+    "print a ? b = c : d;",
+    "print a ? b ? c : d : e;",
+    "print a or ;",
+    "a and b = c;",
+    "var = 1;\nprint 2;",
+    "print ) ;\nprint * 3;",
+]
+
+
+def parse_both(source: str):
+    expected = Parser(FastScanner(source).scan_tokens())
+    parser = PrattParser(FastScanner(source).scan_buffer())
+    return expected.parse(), expected.errors, parser.parse(), parser.errors
+
+
+@pytest.mark.parametrize("source", [SOURCE, EXPRESSIONS])
+def test_pratt_parser_matches_parser(source):
+    expected, errors, stmts, pratt_errors = parse_both(source)
+    assert errors == pratt_errors == []
+    assert_nodes_equal(stmts, expected)
+
+
+@pytest.mark.parametrize("source", ERRORS)
+def test_pratt_parser_reports_the_same_errors(source):
+    expected, errors, stmts, pratt_errors = parse_both(source)
+    assert [(e.token.line, e.token.lexeme, e.msg) for e in pratt_errors] == [
+        (e.token.line, e.token.lexeme, e.msg) for e in errors
+    ]
+    assert errors
+    assert_nodes_equal(stmts, expected)
+
+
+def test_rule_tables_name_parser_methods():
+    for name in PREFIX_RULES.values():
+        assert callable(getattr(PrattParser, name))
+    for _, name in INFIX_RULES.values():
+        assert callable(getattr(PrattParser, name))
@@ -0,0 +1,65 @@
+import pytest
+from pylox.parser.expr import Unary
+from pylox.parser.stmt import Block, If
+from pylox.parser.pratt_parser import PrattParser
+from pylox.parser.stack_parser import StackParser
+from pylox.scanner.fast_scanner import FastScanner
+from test_buffer_parser import SOURCE, assert_nodes_equal
+from test_pratt_parser import ERRORS, EXPRESSIONS
+
+DEPTH = 10000
+
+
+def parse_both(source: str):
+    expected = PrattParser(FastScanner(source).scan_buffer())
+    parser = StackParser(FastScanner(source).scan_buffer())
+    return expected.parse(), expected.errors, parser.parse(), parser.errors
+
+
+# Statement nesting, and errors inside and around nested statements
+STATEMENTS = [
+    "if (a) print 1; else if (b) print 2; else { print 3; }",
+    "while (x) for (var i = 0; i < 1; i = i + 1) if (i) { } else print i;",
+    "for (;;) print 1;",
+    "{ print 1 print 2; var = 3; } print 4;",
+    "{ if (a) var x = 1; print 2; }",
+    "{ { print 1; } ",
+    "if (a) { print 1; else print 2;",
+    "while ( ) print 1; print 2;",
+    "{ while (a) { print ; } print 3; } print 4;",
+    "if (a) print 1; else",
+    "{ } } print 1;",
+    "print (1;\n{ var a = 1\n print a; }\nprint 3;",
+]
+
+
+@pytest.mark.parametrize("source", [SOURCE, EXPRESSIONS, *ERRORS, *STATEMENTS])
+def test_stack_parser_matches_pratt_parser(source):
+    expected, errors, stmts, stack_errors = parse_both(source)
+    assert [(e.token.line, e.token.lexeme, e.msg) for e in stack_errors] == [
+        (e.token.line, e.token.lexeme, e.msg) for e in errors
+    ]
+    assert_nodes_equal(stmts, expected)
+
+
+def test_nesting_is_not_limited_by_recursion():
+    source = "print " + "-(" * DEPTH + "1" + " + 2)" * DEPTH + ";"
+    parser = StackParser(FastScanner(source).scan_buffer())
+    (stmt,) = parser.parse()
+    expr, depth = stmt.expression, 0
+    while isinstance(expr, Unary):
+        # -(inner + 2)
+        depth += 1
+        expr = expr.right.expression.left
+    assert parser.errors == [] and depth == DEPTH
+
+
+def test_statement_nesting_is_not_limited_by_recursion():
+    source = "if (a) " * DEPTH + "{" * DEPTH + "print 1;" + "}" * DEPTH
+    parser = StackParser(FastScanner(source).scan_buffer())
+    (stmt,) = parser.parse()
+    depth = 0
+    while isinstance(stmt, (If, Block)):
+        depth += 1
+        stmt = stmt.then_branch if isinstance(stmt, If) else stmt.statements[0]
+    assert parser.errors == [] and depth == 2 * DEPTH
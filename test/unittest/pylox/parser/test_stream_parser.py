@@ -0,0 +1,31 @@
+import pytest
+import pylox.parser.stream_parser as stream_parser
+from pylox.parser.stack_parser import StackParser
+from pylox.parser.stream_parser import StreamParser
+from pylox.scanner.fast_scanner import FastScanner
+from test_buffer_parser import SOURCE, assert_nodes_equal
+from test_pratt_parser import ERRORS, EXPRESSIONS
+
+
+@pytest.mark.parametrize("source", [SOURCE, EXPRESSIONS, *ERRORS])
+@pytest.mark.parametrize("window", [2, 5, stream_parser.WINDOW_SIZE])
+def test_stream_parser_matches_stack_parser(source, window, monkeypatch):
+    monkeypatch.setattr(stream_parser, "WINDOW_SIZE", window)
+    expected = StackParser(FastScanner(source).scan_buffer())
+    expected_stmts = expected.parse()
+    parser = StreamParser(iter(FastScanner(source).scan_tokens()))
+    stmts = list(parser.declarations())
+    assert [(e.token.line, e.token.lexeme, e.msg) for e in parser.errors] == [
+        (e.token.line, e.token.lexeme, e.msg) for e in expected.errors
+    ]
+    assert_nodes_equal(stmts, expected_stmts)
+
+
+def test_window_only_holds_unparsed_tokens(monkeypatch):
+    monkeypatch.setattr(stream_parser, "WINDOW_SIZE", 8)
+    source = "var a = 1;\n" * 100 + "{ " + "a = a + 1; " * 20 + "}"
+    parser = StreamParser(iter(FastScanner(source).scan_tokens()))
+    sizes = [len(parser.tokens) for _ in parser.declarations()]
+    assert len(sizes) == 101 and parser.errors == []
+    # One block needs more than the window, nothing else grows it
+    assert max(sizes[:100]) <= 8 + 4 and sizes[100] > 20 * 6
@@ -0,0 +1,70 @@
+import io
+import pytest
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import RuntimeError
+from pylox.interpreter.output import BlockBufferedSink
+from pylox.repl.session import Session
+from pylox.resolver.resolver import ResolvingError
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_globals_persist(engine, capsys):
+    session = Session(engine)
+    errors = session.run_all(
+        [
+            "var a = 1;",
+            "var b = a + 1;",
+            "a = b * 10; print a;",
+            "{ var a = 3; print a + b; }",
+        ]
+    )
+    assert errors == [[], [], [], []]
+    assert capsys.readouterr().out == "20.0\n5.0\n"
+
+
+def test_feed_multiline(capsys):
+    session = Session()
+    assert session.feed("var a = 0;") is False
+    assert session.feed("for (var i = 0; i < 3; i = i + 1) {") is True
+    assert session.feed("  a = a + i;") is True
+    assert session.feed("}") is False
+    assert session.feed('print "x') is True
+    assert session.feed('y";') is False
+    assert session.feed("print a;") is False
+    assert capsys.readouterr().out == "x\ny\n3.0\n"
+    assert session.pending == ""
+
+
+def test_failed_snippet_declares_nothing():
+    session = Session()
+    assert session.run("var a = 1; print b;") is False
+    assert isinstance(session.errors[0], ResolvingError)
+    assert session.run("print a;") is False
+    assert session.errors[0].token.line == 2
+
+    assert session.run("var c = 1; print -nil;") is False
+    assert isinstance(session.errors[0], RuntimeError)
+    assert session.run("print c;") is True
+
+
+def test_optimizer_keeps_reads_of_failed_globals():
+    session = Session(opt_level=2)
+    assert session.run("var x = -nil;") is False
+    assert session.run("x;") is False
+    assert str(session.errors[0]) == "Undefined variable 'x'."
+
+
+@pytest.mark.parametrize("engine", ["tree", "quick"])
+def test_snippets_are_released_after_running(engine):
+    session = Session(engine)
+    assert session.run("var a = 0; { var b = 1; while (a < 3) a = a + b; }")
+    assert session.interpreter._locals == {}
+    assert session.interpreter._scope_sizes == {}
+    assert session.run("{ var c = a; print c; }") is True
+
+
+def test_output_goes_to_the_given_sink():
+    stream = io.StringIO()
+    session = Session(stdout=BlockBufferedSink(stream, lines=100))
+    assert session.run("print 1; print 2;")
+    assert stream.getvalue() == "1.0\n2.0\n"
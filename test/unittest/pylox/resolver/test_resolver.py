@@ -0,0 +1,76 @@
+import pytest
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import Interpreter
+from pylox.parser.stmt import Block, Print
+from pylox.resolver.resolver import Resolver, copy_bound
+
+
+def test_resolver_binds_depth_and_slot(analyze):
+    stmts, resolver = analyze("var g = 0; { var a = 1; var b = 2; { print b; } }")
+    outer = stmts[1]
+    inner = outer.statements[2]
+    assert isinstance(inner, Block)
+    assert isinstance(inner.statements[0], Print)
+    assert resolver.locals[inner.statements[0].expression] == (1, 1)
+    assert resolver.scope_sizes[outer] == 2
+    assert resolver.scope_sizes[inner] == 0
+    assert not resolver.errors
+
+
+def test_resolver_redeclaration_reuses_slot(analyze):
+    stmts, resolver = analyze("{ var a = 1; var a = a + 1; print a; }")
+    block = stmts[0]
+    assert resolver.scope_sizes[block] == 1
+    assert resolver.locals[block.statements[1]] == (0, 0)
+    assert resolver.locals[block.statements[1].init.left] == (0, 0)
+
+
+def test_resolver_reports_undefined_variables(analyze):
+    _, resolver = analyze("print a;\nvar a = a;\n{ var b = 1; }\nb = 2;", check=False)
+    assert [(e.token.line, e.msg) for e in resolver.errors] == [
+        (1, "Undefined variable 'a'."),
+        (2, "Undefined variable 'a'."),
+        (4, "Undefined variable 'b'."),
+    ]
+
+
+def test_interpreter_uses_slots(analyze, capsys):
+    stmts, resolver = analyze(
+        'var a = "global";\n'
+        '{ var a = "outer"; { print a; var a = "inner"; print a; } print a; }\n'
+        "print a;"
+    )
+    interpreter = Interpreter()
+    interpreter.resolve(resolver)
+    interpreter.interpret(stmts)
+    assert capsys.readouterr().out == "outer\ninner\nouter\nglobal\n"
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure", "quick", "stack"])
+def test_unresolved_program_is_rejected(analyze, engine):
+    stmts, _ = analyze("{ var a = 1; print a; }")
+    with pytest.raises(ValueError, match="must be resolved"):
+        ENGINES[engine]().interpret(stmts)
+
+
+def test_resolver_needs_no_recursion():
+    depth = 10000
+    stmts = [Block([])]
+    inner = stmts[0]
+    for _ in range(depth):
+        block = Block([])
+        inner.statements.append(block)
+        inner = block
+    resolver = Resolver()
+    resolver.resolve(stmts)
+    assert resolver.errors == [] and len(resolver.scope_sizes) == depth + 1
+
+
+def test_copy_bound_shares_bindings(analyze):
+    stmts, resolver = analyze("{ var a = 1; print a; }")
+    block = stmts[0]
+    tables = (resolver.locals, resolver.scope_sizes)
+    assert copy_bound(block, tables, statements=block.statements) is block
+    new = copy_bound(block, tables, statements=block.statements[1:])
+    assert new is not block and len(block.statements) == 2
+    assert resolver.scope_sizes[new] == resolver.scope_sizes[block]
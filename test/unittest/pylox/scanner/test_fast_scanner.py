@@ -0,0 +1,40 @@
+import pytest
+import pylox.scanner.scanner as s
+from pylox.scanner.fast_scanner import FastScanner
+
+
+def scan(scanner_cls, source: str, tolerant=True):
+    scanner = scanner_cls(source, tolerant=tolerant)
+    tokens = scanner.scan_tokens()
+    return (
+        [(t.type, t.lexeme, t.literal, t.line) for t in tokens],
+        [(e.msg, e.line) for e in scanner.errors],
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "(){},.-+*;:?! != = == > >= < <= /",
+        'var a_1 = "multi\nline" + 12.5 / 3.; // trailing\nprint a_1;',
+        "/* block\n comment */ while (x) {}\n\n  and or nil",
+        "1.5.2 abc123 _x 0.",
+        "@ [ ] \\ é",
+        'a = "abcd',
+        "a = 5;\n/* a block comment\nthis cant span line\n",
+        "x /*",
+        "/*/",
+    ],
+)
+def test_fast_scanner_matches_scanner(source):
+    assert scan(FastScanner, source) == scan(s.Scanner, source)
+
+
+def test_fast_scanner_raises_like_scanner():
+    for source in ('a = "abcd', "/* open", "a # b"):
+        with pytest.raises(s.ScanningError) as fast:
+            FastScanner(source, tolerant=False).scan_tokens()
+        with pytest.raises(s.ScanningError) as slow:
+            s.Scanner(source, tolerant=False).scan_tokens()
+        assert (fast.value.msg, fast.value.line) == (slow.value.msg, slow.value.line)
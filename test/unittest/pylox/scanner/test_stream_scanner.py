@@ -0,0 +1,44 @@
+import pytest
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.stream_scanner import StreamScanner
+
+SOURCES = [
+    "",
+    "(){},.-+*;:?! != = == > >= < <= /",
+    'var a_1 = "multi\nline" + 12.5 / 3.; // trailing\nprint a_1;',
+    "/* block\n comment */ while (x) {}\n\n  and or nil",
+    "1.5.2 abc123 _x 0.\n12.\n34 a\n/\n/b",
+    "@ [ ] \\ é\n#",
+    'a = "abcd\n\nefg',
+    "a = 5;\n/* a block comment\nthis cant span line\n",
+    "x /*\n",
+    "/*/",
+]
+
+
+def chunked(source: str, size: int) -> list[str]:
+    return [source[i : i + size] for i in range(0, len(source), size)]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 1000])
+def test_stream_scanner_matches_fast_scanner(source, size):
+    expected = FastScanner(source)
+    tokens = expected.scan_tokens()
+    scanner = StreamScanner(chunked(source, size))
+    streamed = list(scanner.scan_stream())
+    assert [(t.type, t.lexeme, t.literal, t.line) for t in streamed] == [
+        (t.type, t.lexeme, t.literal, t.line) for t in tokens
+    ]
+    assert [(e.msg, e.line) for e in scanner.errors] == [
+        (e.msg, e.line) for e in expected.errors
+    ]
+
+
+def test_tokens_are_yielded_before_the_stream_ends():
+    def chunks():
+        yield "print 1;\nprint"
+        raise AssertionError("read too far")
+
+    tokens = StreamScanner(chunks()).scan_stream()
+    assert [next(tokens).lexeme for _ in range(3)] == ["print", "1", ";"]
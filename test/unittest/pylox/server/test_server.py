@@ -0,0 +1,94 @@
+import asyncio
+from pylox.server.client import LoxClient
+from pylox.server.server import LoxServer, script_hash
+
+
+async def session(tmp_path, scenario, **options):
+    server = LoxServer(**options)
+    path = str(tmp_path / "lox.sock")
+    listener = await server.start(path)
+    try:
+        client = await LoxClient().connect(path)
+        try:
+            return await scenario(client)
+        finally:
+            await client.close()
+    finally:
+        listener.close()
+        await listener.wait_closed()
+        server.close()
+
+
+def test_run_by_source_and_hash(tmp_path):
+    source = "var a = n + 1; print a;"
+
+    async def scenario(client):
+        first = await client.run(source, globals={"n": 1})
+        again = await client.run(hash=script_hash(source), globals={"n": 2})
+        unknown = await client.run(hash="0" * 64)
+        failed = await client.run('print -"a";')
+        return first, again, unknown, failed
+
+    first, again, unknown, failed = asyncio.run(session(tmp_path, scenario, workers=1))
+    assert (first["ok"], first["output"], first["hash"]) == (
+        True,
+        "2.0\n",
+        script_hash(source),
+    )
+    assert (again["output"], again["globals"]["a"]) == ("3.0\n", 3.0)
+    assert not unknown["ok"] and "unknown script hash" in unknown["error"]
+    assert failed["errors"] == [
+        {"kind": "runtime", "message": "Operand must be a number.", "line": 1}
+    ]
+
+
+def test_timeout_replaces_worker(tmp_path):
+    async def scenario(client):
+        hung = await client.run("while (true) {}", timeout=0.5)
+        after = await client.run("print 1;")
+        return hung, after, await client.stats()
+
+    hung, after, stats = asyncio.run(session(tmp_path, scenario, workers=1))
+    assert hung["errors"][0]["kind"] == "timeout"
+    assert after["output"] == "1.0\n"
+    assert (stats["timeouts"], stats["completed"]) == (1, 2)
+
+
+def test_pipelined_requests_and_stats(tmp_path):
+    async def scenario(client):
+        runs = [client.run(f"print {n};") for n in range(6)]
+        return await asyncio.gather(*runs), await client.stats()
+
+    responses, stats = asyncio.run(session(tmp_path, scenario, workers=2))
+    assert [r["output"] for r in responses] == [f"{n}.0\n" for n in range(6)]
+    assert (stats["workers"], stats["queue_depth"], stats["active"]) == (2, 0, 0)
+    assert stats["completed"] == 6
+    latency = stats["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p99"] <= latency["max"]
+
+
+def test_malformed_requests_get_errors(tmp_path):
+    async def scenario(client):
+        bad = [
+            await client.request({"source": "print 1;", "timeout": "x"}),
+            await client.request({"hash": ["unhashable"]}),
+            await client.request({"source": 1}),
+            await client.request({"source": "print 1;", "globals": [1]}),
+            await client.request({"op": "nope"}),
+        ]
+        return bad, await client.run("print 2;")
+
+    bad, after = asyncio.run(session(tmp_path, scenario, workers=1))
+    for response in bad:
+        assert not response["ok"] and response["error"].startswith("bad request")
+    assert after["output"] == "2.0\n"
+
+
+def test_large_script(tmp_path):
+    source = "var a = 0;\n" + "a = a + 1;\n" * 10000 + "print a;"
+
+    async def scenario(client):
+        return await client.run(source)
+
+    response = asyncio.run(session(tmp_path, scenario, workers=1))
+    assert len(source) > 64 * 1024 and response["output"] == "10000.0\n"
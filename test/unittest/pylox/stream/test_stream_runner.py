@@ -0,0 +1,70 @@
+import io
+import pytest
+from pylox.engines import ENGINES
+from pylox.interpreter.interpreter import RuntimeError
+from pylox.interpreter.output import LineBufferedSink
+import pylox.parser.stream_parser as stream_parser
+from pylox.parser.parser import ParsingError
+from pylox.resolver.resolver import ResolvingError
+from pylox.scanner.scanner import ScanningError
+from pylox.stream.runner import StreamRunner
+
+# fmt: off
+SOURCE = \
+"""\
+var a = 1;
+// a comment
+print "multi
+line";
+/* block
+comment */ for (var i = 0; i < 3; i = i + 1) { a = a * 2.5; }
+if (a > 2) print a; else print -a;
+{ var b = a; print b > 10 ? b + 1 : b; }
+"""\
+# fmt: on
+
+
+def run(source: str, engine: str = "tree", size: int = 3):
+    out = io.StringIO()
+    runner = StreamRunner(engine, stdout=out)
+    ok = runner.run([source[i : i + size] for i in range(0, len(source), size)])
+    return ok, out.getvalue(), runner.errors
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+@pytest.mark.parametrize("size", [1, 4, 1000])
+def test_streamed_script_runs_like_whole_script(engine, size):
+    assert run(SOURCE, engine, size) == (True, "multi\nline\n15.625\n16.625\n", [])
+
+
+@pytest.mark.parametrize(
+    "source, error",
+    [
+        ("print 1;\nprint 2 +;\nprint 3;", ParsingError),
+        ("print 1;\nprint b;\nprint 3;", ResolvingError),
+        ("print 1;\nprint -nil;\nprint 3;", RuntimeError),
+        ("print 1;\n@\nprint 3;", ScanningError),
+        ('print 1;\nprint "open;\nprint 3;', ScanningError),
+    ],
+)
+def test_errors_stop_the_run_where_they_occur(source, error):
+    ok, out, errors = run(source)
+    assert not ok and out == "1.0\n"
+    assert isinstance(errors[0], error)
+
+
+def test_declarations_run_as_they_are_read(monkeypatch):
+    monkeypatch.setattr(stream_parser, "WINDOW_SIZE", 2)
+    out = io.StringIO()
+    runner = StreamRunner(stdout=LineBufferedSink(out))
+    seen = []
+
+    def chunks():
+        for line in ("print 1;\n", "print 2;\n", "print 3;\n"):
+            seen.append(out.getvalue())
+            yield line
+
+    assert runner.run(chunks())
+    # Both declarations ran before the last line was read
+    assert seen == ["", "", "1.0\n2.0\n"]
+    assert out.getvalue() == "1.0\n2.0\n3.0\n"
@@ -0,0 +1,100 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pylox.interpreter.closure import ClosureInterpreter
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.transpiler.transpiler import LRUCache, TranspiledInterpreter, Transpiler
+
+# fmt: off
+SOURCE = \
+"""\
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) {
+  if (i == 5) total = total + 100; else total = total + i;
+}
+print total;
+{ var a = "outer"; { print a; var a = a + " inner"; print a; } }
+print total > 100 ? "big" : "small";
+while (false) {}
+print !0;
+print nil;
+"""\
+# fmt: on
+
+
+@pytest.fixture
+def run(analyze):
+    def run(engine, source: str, check: bool = True):
+        stmts, resolver = analyze(source, check)
+        interpreter = engine()
+        interpreter.resolve(resolver)
+        interpreter.interpret(stmts)
+
+    return run
+
+
+def test_transpiled_output_matches_tree_walker(run, capsys):
+    run(Interpreter, SOURCE)
+    expected = capsys.readouterr().out
+    run(TranspiledInterpreter, SOURCE)
+    assert capsys.readouterr().out == expected
+
+
+def test_transpiler_maps_lines_and_caches_code(analyze):
+    stmts, resolver = analyze("var a = 1;\n\n{\n  var b = a;\n  print b;\n}")
+    program = Transpiler(resolver.locals).transpile(stmts)
+    lines = program.source.splitlines()
+    printed = next(i for i, text in enumerate(lines) if "print(" in text)
+    assert program.line_map[printed] == 5
+    assert lines[printed].endswith("# line 5")
+    assert program.code() is Transpiler(resolver.locals).transpile(stmts).code()
+
+
+@pytest.mark.parametrize(
+    "source, line, msg",
+    [
+        ('print 1;\nprint 2 * "x";', 2, "Operands must be numbers."),
+        ("{\n  var a = nil;\n  print -a;\n}", 3, "Operand must be a number."),
+        ("print 1;\n\nprint b;", 3, "Undefined variable 'b'."),
+    ],
+)
+def test_transpiled_runtime_errors(run, source, line, msg):
+    for engine in (Interpreter, TranspiledInterpreter):
+        with pytest.raises(RuntimeError) as e:
+            run(engine, source, check=False)
+        assert e.value.token.line == line
+        assert e.value.msg == msg
+
+
+def test_rerunning_statements_skips_transpiling(analyze):
+    stmts, resolver = analyze("var a = 1;\n{ var b = a; print b; }")
+    first, second = TranspiledInterpreter(), TranspiledInterpreter()
+    first.resolve(resolver)
+    second.resolve(resolver)
+    assert first._program(stmts) is second._program(stmts)
+
+
+def test_lru_cache_is_thread_safe():
+    cache = LRUCache(8)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda n: cache.get(n % 32, lambda: n % 32), range(20000)))
+    assert len(cache._entries) == 8
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "var n = 1; print " + " + ".join(["n"] * 400) + ";",
+        "var n = 0;\n" + "while (n < 1) { " * 25 + "n = n + 1;" + " }" * 25,
+    ],
+)
+def test_nesting_too_deep_for_python_falls_back(analyze, source, capsys):
+    outputs = []
+    for engine in (ClosureInterpreter, TranspiledInterpreter):
+        interpreter = engine()
+        # Globals set by the fallback stay visible to later programs
+        for snippet in (source, "print n;"):
+            stmts, resolver = analyze(snippet, check=False)
+            interpreter.resolve(resolver)
+            interpreter.interpret(stmts)
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1] and outputs[1].endswith("\n")
@@ -0,0 +1,78 @@
+import pytest
+from pylox.interpreter.interpreter import Interpreter, RuntimeError
+from pylox.optimizer.optimizer import Optimizer
+from pylox.resolver.resolver import Resolver
+from pylox.vm.chunk import Chunk, OpCode
+from pylox.vm.compiler import Compiler
+from pylox.vm.vm import VM
+
+
+def tree_walker(resolver: Resolver) -> Interpreter:
+    interpreter = Interpreter()
+    interpreter.resolve(resolver)
+    return interpreter
+
+
+# fmt: off
+LOOP_SOURCE = \
+"""\
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) {
+  var sq = i * i;
+  total = total + sq;
+}
+print total;
+{ var a = 1; { var a = a + 1; print a; } var a = a + 5; print a; }
+if (total < 0) print "negative";
+print total > 100 ? "big" : "small";
+print "a" + "b";
+print nil;
+print !0;
+"""\
+# fmt: on
+
+
+def test_vm_matches_tree_walker(analyze, capsys):
+    stmts, resolver = analyze(LOOP_SOURCE)
+    tree_walker(resolver).interpret(stmts)
+    expected = capsys.readouterr().out
+
+    VM().interpret(analyze(LOOP_SOURCE)[0])
+    assert capsys.readouterr().out == expected
+    assert expected == "285.0\n2.0\n6.0\nbig\nab\nNone\nTrue\n"
+
+
+@pytest.mark.parametrize(
+    "source, line, msg",
+    [
+        ('var a = 1;\n\nprint a - "x";', 3, "Operands must be numbers."),
+        ('print 1;\nprint -"x";', 2, "Operand must be a number."),
+        ("{\n  print b;\n}", 2, "Undefined variable 'b'."),
+        ("var a;\nb = 2;", 2, "Undefined variable 'b'."),
+    ],
+)
+def test_vm_runtime_errors(analyze, source, line, msg):
+    for engine in (tree_walker, lambda _: VM()):
+        stmts, resolver = analyze(source, check=False)
+        with pytest.raises(RuntimeError) as e:
+            engine(resolver).interpret(stmts)
+        assert e.value.token.line == line
+        assert e.value.msg == msg
+
+
+def test_signed_zero_constants_stay_apart(analyze, capsys):
+    stmts, resolver = analyze("var a = 0; print -0; print 0;")
+    stmts = Optimizer.for_level(1).optimize(stmts, resolver)
+    VM().interpret(stmts)
+    assert capsys.readouterr().out == "-0.0\n0.0\n"
+    chunk = Chunk()
+    assert [chunk.add_constant(v) for v in (0.0, -0.0, 0.0, -0.0)] == [0, 1, 0, 1]
+
+
+def test_compiler_resolves_locals_to_slots(analyze):
+    stmts, _ = analyze("{ var a = 1; print a; }")
+    chunk = Compiler().compile(stmts)
+    ops = chunk.code.tolist()
+    assert OpCode.GET_LOCAL in ops
+    assert OpCode.GET_GLOBAL not in ops
+    assert chunk.line_at(len(ops) - 1) == 1